@@ -5,6 +5,7 @@ Asks user what they want and generates it
 """
 import os
 import sys
+import zipfile
 
 def clear_screen():
     os.system('clear' if os.name != 'nt' else 'cls')
@@ -361,8 +362,8 @@ Generate the outline now:"""
     print("\n" + "=" * 70)
     print("⚡ PARALLEL PROCESSING")
     print("=" * 70)
-    print(f"\nThis will generate {len(sections)} sections in parallel (2 at a time)")
-    print(f"Estimated time: ~{len(sections) * 20 // 2} minutes")
+    print(f"\nThis will generate {len(sections)} sections in parallel")
+    print(f"Concurrency adapts to the provider's rate limits")
     print("\n" + "=" * 70)
     
     confirm = input("\nStart generation? (y/n): ").strip().lower()
@@ -380,11 +381,14 @@ Generate the outline now:"""
     # Use the full system
     from src.syllabus_parser import parse_syllabus
     from src.master_command_generator import generate_master_command
-    from src.textbook_planner import expand_section_to_topics, expand_topic_to_subsections
+    from src.textbook_planner import format_planning_time
+    from src.plan_store import get_plan_store
+    from src.content_store import get_content_store
     from src.textbook_writer import write_section_introduction, write_subsection, write_section_summary
     from src.quality_control import check_quality, print_quality_report
     from src.cost_tracker import cost_tracker
-    from src.resume_manager import resume_manager
+    from src.resume_manager import get_resume_manager
+    from src.durable_io import commit_file
     from src.output_organizer import output_organizer
     from src.progress_tracker import progress_tracker
     from src.auto_notifier import AutoNotifier, load_notification_config
@@ -398,6 +402,11 @@ Generate the outline now:"""
     dirs = output_organizer.create_chapter_structure(topic)
     print(f"\n📁 Output directory: {dirs['chapter_dir']}")
     
+    # Resume state, plans and finished text live with this chapter's output
+    resume_manager = get_resume_manager(dirs['chapter_dir'])
+    plan_store = get_plan_store(dirs['chapter_dir'])
+    content_store = get_content_store(dirs['chapter_dir'])
+    
     # Generate master commands
     print("🔧 Generating master commands...")
     for section_info in parsed_sections:
@@ -432,7 +441,9 @@ Generate the outline now:"""
             return {'success': True, 'section_num': section_num, 'skipped': True}
         
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
+            # Written as .partial and renamed when complete, so an existing file is a finished one
+            partial = filename + ".partial"
+            with open(partial, 'w', encoding='utf-8') as f:
                 # Header
                 f.write(f"# {chapter}\n\n")
                 f.write(f"## Section {section_num}: {section_title}\n\n")
@@ -440,8 +451,9 @@ Generate the outline now:"""
                 f.write("---\n\n")
                 f.flush()
                 
-                # Expand to topics
-                topics = expand_section_to_topics(generator, section_title)
+                # Plan topics and subsections (reusing the stored plan on re-runs)
+                topics, timings = plan_store.plan(generator, section_num, section_title, chapter)
+                print(f"   🗺️  Section {section_num}: {format_planning_time(timings)}")
                 
                 # Mark as started in progress tracker
                 progress_tracker.start_section(section_num, section_title, len(topics) * 4)
@@ -449,14 +461,13 @@ Generate the outline now:"""
                 # Mark as started in resume manager
                 resume_manager.start_section(section_num, section_title, len(topics))
                 
-                # Expand topics to subsections
-                for topic in topics:
-                    subsections = expand_topic_to_subsections(generator, section_title, topic)
-                    topic.subsections = subsections
-                
                 # Write introduction
                 progress_tracker.update_subsection(section_num, "Introduction")
-                intro = write_section_introduction(generator, section_title, topics)
+                # Text finished by an earlier run is reused from the content store
+                intro = content_store.get(section_num, "introduction")
+                if intro is None:
+                    intro = write_section_introduction(generator, section_title, topics)
+                    content_store.put(section_num, "introduction", intro)
                 f.write(intro + "\n\n")
                 f.flush()
                 word_count = len(intro.split())
@@ -468,19 +479,23 @@ Generate the outline now:"""
                     f.flush()
                     
                     for subsection_idx, subsection in enumerate(topic.subsections, 1):
-                        if resume_manager.is_subsection_completed(section_num, topic_idx, subsection_idx):
-                            continue
-                        
-                        # Update progress tracker
-                        progress_tracker.update_subsection(section_num, subsection)
-                        
-                        subsection_content = write_subsection(
-                            generator,
-                            section_title,
-                            topic.title,
-                            subsection,
-                            target_words=1000
-                        )
+                        key = content_store.subsection_key(topic_idx, subsection_idx, topic.title, subsection)
+                        subsection_content = content_store.get(section_num, key)
+                        if subsection_content is None:
+                            if resume_manager.is_subsection_completed(section_num, topic_idx, subsection_idx):
+                                continue
+                            
+                            # Update progress tracker
+                            progress_tracker.update_subsection(section_num, subsection)
+                            
+                            subsection_content = write_subsection(
+                                generator,
+                                section_title,
+                                topic.title,
+                                subsection,
+                                target_words=1000
+                            )
+                            content_store.put(section_num, key, subsection_content)
                         
                         f.write(f"#### {section_num}.{topic_idx}.{subsection_idx} {subsection}\n\n")
                         f.write(subsection_content + "\n\n")
@@ -497,7 +512,10 @@ Generate the outline now:"""
                 
                 # Write summary
                 progress_tracker.update_subsection(section_num, "Summary and Reflection")
-                summary = write_section_summary(generator, section_title, topics)
+                summary = content_store.get(section_num, "summary")
+                if summary is None:
+                    summary = write_section_summary(generator, section_title, topics)
+                    content_store.put(section_num, "summary", summary)
                 f.write(f"### Summary and Reflection\n\n")
                 f.write(summary + "\n\n")
                 f.flush()
@@ -512,6 +530,7 @@ Generate the outline now:"""
                 f.flush()
             
             # Mark as completed
+            commit_file(partial, filename)
             resume_manager.complete_section(section_num)
             progress_tracker.complete_section(section_num, word_count)
             
@@ -544,9 +563,12 @@ Generate the outline now:"""
             return {'success': False, 'section_num': section_num, 'error': str(e)}
     
     # Run parallel generation
-    print("🚀 Starting parallel generation (2 workers)...\n")
+    # Sections write one subsection at a time, so one worker per limiter slot
+    from src.adaptive_limiter import limiter_for, feeder_workers
+    section_workers = feeder_workers(limiter_for(generator))
+    print(f"🚀 Starting parallel generation ({section_workers} workers, adaptive concurrency)...\n")
     
-    with ThreadPoolExecutor(max_workers=2) as executor:
+    with ThreadPoolExecutor(max_workers=section_workers) as executor:
         futures = {
             executor.submit(generate_single_section, section_info, idx, len(parsed_sections), topic): section_info
             for idx, section_info in enumerate(parsed_sections, 1)
@@ -584,6 +606,7 @@ Generate the outline now:"""
         outfile.write(f"*Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}*\n\n")
         outfile.write("---\n\n")
         
+        section_docx_files = []
         for section_info in parsed_sections:
             section_num = section_info['section_number']
             section_title = section_info['section_title']
@@ -595,21 +618,40 @@ Generate the outline now:"""
                     # Skip the first header line
                     content = '\n'.join(content.split('\n')[1:])
                     outfile.write(content + "\n\n")
+                section_docx_files.append((section_file, output_organizer.get_section_path(
+                    topic, f"Section_{section_num}_{section_title}", 'docx')))
     
     print(f"✅ Combined file: {combined_file}")
     
-    # Convert combined to DOCX
+    # Build the combined DOCX by merging the per-section DOCX files (converting any
+    # that are missing), so the whole book is never parsed into one document in memory
+    combined_docx = output_organizer.get_combined_path(topic, 'docx')
     try:
         from src.docx_generator import auto_convert_to_docx
-        combined_docx = output_organizer.get_combined_path(topic, 'docx')
-        auto_convert_to_docx(combined_file)
-        # Move DOCX to organized location
-        temp_docx = combined_file.replace('.md', '.docx')
-        if os.path.exists(temp_docx):
-            os.rename(temp_docx, combined_docx)
+        from src.docx_merger import merge_docx
+        try:
+            for section_file, docx_path in section_docx_files:
+                if not os.path.exists(docx_path):
+                    auto_convert_to_docx(section_file)
+                    temp_docx = section_file.replace('.md', '.docx')
+                    if os.path.exists(temp_docx):
+                        os.rename(temp_docx, docx_path)
+            missing = [docx_path for _, docx_path in section_docx_files if not os.path.exists(docx_path)]
+            if missing:
+                raise ValueError(f"{len(missing)} sections have no DOCX")
+            merge_docx([docx_path for _, docx_path in section_docx_files], combined_docx, title=topic)
             print(f"✅ Combined DOCX: {combined_docx}")
-    except:
-        pass
+        except (ValueError, zipfile.BadZipFile, KeyError, OSError) as e:
+            # Sections that can't be merged (or corrupt/unreadable section DOCX
+            # files): convert the combined markdown instead
+            print(f"⚠️  Merging section DOCX files failed ({e}); converting the combined file")
+            auto_convert_to_docx(combined_file)
+            temp_docx = combined_file.replace('.md', '.docx')
+            if os.path.exists(temp_docx):
+                os.rename(temp_docx, combined_docx)
+                print(f"✅ Combined DOCX: {combined_docx}")
+    except Exception as e:
+        print(f"⚠️  Combined DOCX failed: {e}")
     
     # Clean up
     if os.path.exists(temp_outline):
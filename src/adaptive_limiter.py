@@ -0,0 +1,246 @@
+"""
+Adaptive Limiter - AIMD concurrency control shared by every LLM call site
+
+Each provider gets one limiter. Calls take a slot before hitting the API;
+the limit grows by one slot per "round" of calls while latency stays flat,
+and is cut multiplicatively on throttling (429/503), timeouts, or
+connections that drop mid-response (e.g. a stream that stalls and is cut).
+"""
+import asyncio
+import functools
+import math
+import socket
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, List, Tuple
+try:
+    from src.config import Config
+except ImportError:  # src/config.py is per-checkout; thesis imports this module without it
+    Config = None
+
+@functools.lru_cache(maxsize=None)
+def _timeout_errors() -> Tuple[type, ...]:
+    """Exception types that mean the provider is overloaded (timed out or dropped the connection)."""
+    errors = [TimeoutError, asyncio.TimeoutError, socket.timeout, ConnectionError]
+    try:
+        import requests
+        errors += [requests.exceptions.Timeout, requests.exceptions.ConnectionError,
+                   requests.exceptions.ChunkedEncodingError]
+    except ImportError:
+        pass
+    try:
+        import httpx
+        errors += [httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError]
+    except ImportError:
+        pass
+    return tuple(errors)
+
+class AdaptiveLimiter:
+    def __init__(self, name: str, initial: int = 3, min_limit: int = 1, max_limit: int = 20,
+                 latency_tolerance: float = 1.5, backoff: float = 0.5):
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Provider name (for stats)
+            initial: Starting concurrency limit
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit (match the HTTP pool size)
+            latency_tolerance: Latency above baseline x tolerance counts as congestion
+            backoff: Multiplier applied to the limit on throttling or timeouts
+        """
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+
+        self.condition = threading.Condition()
+        self._limit = float(initial)
+        self.in_flight = 0
+        self.async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self.baselines: Dict[str, float] = {}
+        self.last_decrease = 0.0
+        self.stats = {'calls': 0, 'throttled': 0, 'timeouts': 0, 'slow': 0}
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        return max(self.min_limit, int(self._limit))
+
+    def acquire(self):
+        """Block until a slot is free."""
+        with self.condition:
+            while self.in_flight >= self.limit:
+                self.condition.wait()
+            self.in_flight += 1
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free, without waiting."""
+        with self.condition:
+            if self.in_flight >= self.limit:
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self):
+        """Free a slot."""
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+            self._wake_async()
+
+    def on_success(self, latency: float, kind: str = "default"):
+        """
+        Record a successful call.
+
+        Latency is compared with the fastest recent latency for the same kind
+        of call (e.g. planning vs. 4,000-token prose), so long prompts are not
+        mistaken for congestion.
+        """
+        with self.condition:
+            self.stats['calls'] += 1
+            baseline = self.baselines.get(kind)
+            if baseline is None or latency < baseline:
+                baseline = latency
+            else:
+                # Let the baseline drift up slowly so it tracks real provider speed
+                baseline = baseline * 0.95 + latency * 0.05
+            self.baselines[kind] = baseline
+
+            if latency > baseline * self.latency_tolerance:
+                self.stats['slow'] += 1
+                self._decrease(0.9, baseline)
+            else:
+                # Additive increase: +1 slot after `limit` successful calls
+                self._limit = min(self.max_limit, self._limit + 1.0 / max(self._limit, 1.0))
+            self.condition.notify_all()
+            self._wake_async()
+
+    def _wake_async(self):
+        # Caller holds the condition; every async waiter retries (a cancelled
+        # waiter can't swallow the wakeup another one needed)
+        for loop, waiter in self.async_waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, waiter)
+            except RuntimeError:
+                pass  # Waiter's loop is closed
+
+    def on_throttle(self, timeout: bool = False):
+        """Record a 429/503 response or a timeout."""
+        with self.condition:
+            self.stats['timeouts' if timeout else 'throttled'] += 1
+            self._decrease(self.backoff, max(self.baselines.values(), default=1.0))
+
+    def _decrease(self, factor: float, window: float):
+        # One burst of errors should only back off once per round trip
+        now = time.time()
+        if now - self.last_decrease < window:
+            return
+        self.last_decrease = now
+        self._limit = max(float(self.min_limit), self._limit * factor)
+
+    @contextmanager
+    def slot(self, kind: str = "default"):
+        """
+        Hold a slot for one API call and feed its outcome back into the limit.
+
+        Call observe(status_code) on the yielded slot once the response
+        arrives; timeouts and dropped connections (requests/httpx/asyncio)
+        count as timeouts.
+        """
+        self.acquire()
+        call = _Call(time.time())
+        try:
+            yield call
+        except Exception as e:
+            self._settle(call, kind, e)
+            raise
+        else:
+            self._settle(call, kind)
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def aslot(self, kind: str = "default"):
+        """Async version of slot (waits for a slot without blocking the event loop)."""
+        # Waiters are woken when a slot frees or the limit grows, then retry;
+        # the slot is only taken by try_acquire, so cancellation can't leak one
+        loop = asyncio.get_running_loop()
+        while not self.try_acquire():
+            entry = (loop, loop.create_future())
+            with self.condition:
+                self.async_waiters.append(entry)
+            try:
+                if self.try_acquire():
+                    break
+                await entry[1]
+            finally:
+                with self.condition:
+                    self.async_waiters.remove(entry)
+        call = _Call(time.time())
+        try:
+            yield call
+        except Exception as e:
+            self._settle(call, kind, e)
+            raise
+        else:
+            self._settle(call, kind)
+        finally:
+            self.release()
+
+    def _settle(self, call, kind: str, error: Exception = None):
+        if error is not None:
+            if isinstance(error, _timeout_errors()):
+                self.on_throttle(timeout=True)
+        elif call.status in (429, 503):
+            self.on_throttle()
+        elif call.status is None or call.status < 400:
+            self.on_success(time.time() - call.started, kind)
+
+    def get_stats(self) -> Dict:
+        """Get the current limit and counters."""
+        with self.condition:
+            return {
+                'provider': self.name,
+                'limit': self.limit,
+                'in_flight': self.in_flight,
+                **self.stats
+            }
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(True)
+
+class _Call:
+    def __init__(self, started: float):
+        self.started = started
+        self.status = None
+
+    def observe(self, status_code: int):
+        self.status = status_code
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(provider: str, initial: int = 3, max_limit: int = None) -> AdaptiveLimiter:
+    """Get the shared limiter for a provider (created on first use; max_limit defaults to Config.MAX_CONCURRENCY)."""
+    with _limiters_lock:
+        if provider not in _limiters:
+            max_limit = max_limit or getattr(Config, 'MAX_CONCURRENCY', 20)
+            _limiters[provider] = AdaptiveLimiter(provider, initial=initial, max_limit=max_limit)
+        return _limiters[provider]
+
+def feeder_workers(limiter: AdaptiveLimiter, calls_per_task: int = 1) -> int:
+    """
+    Number of outer workers needed to keep a limiter saturated.
+
+    Outer levels (outlines, sections) don't call the API themselves, so they
+    only need enough threads to keep max_limit calls queued.
+    """
+    return max(1, math.ceil(limiter.max_limit / max(1, calls_per_task)))
+
+def limiter_for(generator) -> AdaptiveLimiter:
+    """Get the limiter a generator's calls go through."""
+    return getattr(generator, 'limiter', None) or get_limiter(getattr(generator, 'provider', "unknown"))
@@ -1,8 +1,10 @@
+import asyncio
+import json
 import os
 import threading
 import time
-from fastapi import FastAPI, BackgroundTasks, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -10,9 +12,13 @@ from typing import List, Optional
 import uvicorn
 
 from src.config import Config
-from src.syllabus_parser import parse_syllabus
+from src.syllabus_parser import load_syllabus
+from src.manifest import get_manifest
 from src.progress_tracker import progress_tracker
-from src.interactive_main import generate_section, get_generator
+from src.event_bus import event_bus
+from src.interactive_main import get_generator
+from src.job_runner import JobSpec
+from src.job_queue import JobQueue, QueueFull
 
 app = FastAPI(title="Textbook Generator API")
 
@@ -33,11 +39,20 @@ class AppState:
     def __init__(self):
         self.config = Config()
         self.generator = get_generator(self.config)
-        self.is_generating = False
-        self.current_section = None
+        self.generator.warm_up(getattr(self.config, 'PREWARM_CONNECTIONS', 0))
+        self.jobs = JobQueue(generator=self.generator)
 
 state = AppState()
 
+# HTTP callers may only read outlines inside the project and write inside output/
+PROJECT_ROOT = os.path.realpath(os.getcwd())
+OUTPUT_ROOT = os.path.join(PROJECT_ROOT, "output")
+
+def _inside(path: str, root: str) -> bool:
+    """True if path resolves (following symlinks) to root or somewhere below it."""
+    resolved = os.path.realpath(path)
+    return os.path.commonpath([resolved, root]) == root
+
 # Models
 class Section(BaseModel):
     section_number: str
@@ -48,14 +63,26 @@ class Section(BaseModel):
 class GenerationRequest(BaseModel):
     section_number: str
 
+class JobRequest(BaseModel):
+    outline: str = "syllabus.md"
+    name: str = ""
+    output_dir: str = ""
+    sections: List[str] = []
+    concurrency: int = 0
+    resume: str = "resume"
+    export: List[str] = ["docx"]
+    priority: int = 0
+
 # Endpoints
 
 @app.get("/api/status")
 def get_status():
+    running = state.jobs.running()
     return {
-        "is_generating": state.is_generating,
-        "current_section": state.current_section,
-        "model": state.config.MODEL_NAME
+        "is_generating": bool(running),
+        "current_section": running[0].spec.sections[0] if running and running[0].spec.sections else None,
+        "model": state.config.MODEL_NAME,
+        "jobs": state.jobs.get_stats()
     }
 
 @app.get("/api/sections")
@@ -63,81 +90,137 @@ def get_sections():
     if not os.path.exists("syllabus.md"):
         return []
     
-    sections = parse_syllabus("syllabus.md")
+    sections = load_syllabus("syllabus.md")
+    manifest = get_manifest("output")
     result = []
     for s in sections:
-        # Check status
-        filename = f"output/Section_{s['section_number']}_{s['section_title'].replace(' ', '_')}.md"
-        status = "complete" if os.path.exists(filename) else "pending"
+        entry = manifest.get(s['section_number'], s['section_title'])
         
         result.append({
             "section_number": s['section_number'],
             "section_title": s['section_title'],
             "chapter": s['chapter'],
-            "status": status
+            "status": "complete" if entry else "pending",
+            "words": entry['words'] if entry else 0
         })
     return result
 
 @app.post("/api/generate/{section_number}")
-def start_generation(section_number: str, background_tasks: BackgroundTasks):
-    if state.is_generating:
-        raise HTTPException(status_code=400, detail="Already generating a section")
-    
-    sections = parse_syllabus("syllabus.md")
+def start_generation(section_number: str, priority: int = 0, regenerate: bool = False):
+    sections = load_syllabus("syllabus.md")
     target_section = next((s for s in sections if s['section_number'] == section_number), None)
     
     if not target_section:
         raise HTTPException(status_code=404, detail="Section not found")
     
-    # Start generation in background
-    background_tasks.add_task(run_generation, target_section)
+    # A finished section is only generated again when asked to (its old text is discarded);
+    # otherwise any interrupted progress is resumed
+    complete = get_manifest("output").is_complete(section_number, target_section['section_title'])
+    if complete and not regenerate:
+        return {"status": "complete", "job_id": None, "section": target_section['section_title']}
     
-    return {"status": "started", "section": target_section['section_title']}
-
-def run_generation(section_info):
-    state.is_generating = True
-    state.current_section = section_info['section_number']
+    # Queued as a one-section job writing into output/ (where downloads are served from)
+    spec = JobSpec(outline="syllabus.md", output_dir="output", sections=[section_number],
+                   resume="restart" if regenerate else "resume")
+    job = submit_job(spec, priority)
     
+    return {"status": job.status, "job_id": job.id, "section": target_section['section_title']}
+
+@app.post("/api/jobs")
+def create_job(request: JobRequest):
+    fields = request.dict()
+    priority = fields.pop('priority')
     try:
-        # We need to adapt generate_section to use progress_tracker if it doesn't already
-        # For now, we assume it prints to stdout, but we want to capture that or use progress_tracker
-        # Let's ensure progress_tracker is used in generate_section (we might need to patch it)
-        
-        # Find index
-        sections = parse_syllabus("syllabus.md")
-        idx = sections.index(section_info) + 1
-        
-        generate_section(state.generator, section_info, idx, len(sections))
-        
-    except Exception as e:
-        print(f"Generation failed: {e}")
-    finally:
-        state.is_generating = False
-        state.current_section = None
+        spec = JobSpec.from_dict(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Checked after the spec fills in defaults (output_dir is derived from name)
+    if not _inside(spec.outline, PROJECT_ROOT):
+        raise HTTPException(status_code=400, detail="Outline must be inside the project directory")
+    if not _inside(spec.output_dir, OUTPUT_ROOT):
+        raise HTTPException(status_code=400, detail="Output directory must be inside output/")
+    if not os.path.isfile(spec.outline):
+        raise HTTPException(status_code=404, detail="Outline not found")
+    job = submit_job(spec, priority)
+    return {"status": job.status, "job_id": job.id, "position": state.jobs.position(job.id)}
+
+def submit_job(spec: JobSpec, priority: int = 0):
+    try:
+        return state.jobs.submit(spec, priority)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+@app.get("/api/jobs")
+def list_jobs():
+    return state.jobs.list_jobs()
+
+@app.get("/api/jobs/{job_id}")
+def get_job(job_id: str):
+    job = state.jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {**job.to_dict(), "position": state.jobs.position(job_id)}
+
+@app.delete("/api/jobs/{job_id}")
+def cancel_job(job_id: str):
+    if not state.jobs.cancel(job_id):
+        raise HTTPException(status_code=404, detail="Job not found or already finished")
+    return {"status": "cancelling", "job_id": job_id}
 
 @app.get("/api/progress")
 def get_progress():
-    # Return data from progress_tracker
-    return progress_tracker.sections
+    return progress_tracker.snapshot()
+
+# Idle connections get a comment line this often so proxies don't close them
+SSE_KEEPALIVE_SECONDS = 15
+
+@app.get("/api/events")
+async def stream_events(request: Request):
+    """
+    Server-Sent Events: progress and job events as they happen.
+    
+    Reconnecting browsers send Last-Event-ID and get the events they missed
+    (or a 'resync' event telling them to re-fetch state).
+    """
+    last_id = request.headers.get("last-event-id")
+    subscription = event_bus.subscribe(
+        since=int(last_id) if last_id and last_id.isdigit() else None,
+        loop=asyncio.get_running_loop()
+    )
+    
+    async def events():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.aget(timeout=SSE_KEEPALIVE_SECONDS)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+        finally:
+            subscription.close()
+    
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 @app.get("/api/download/{section_number}")
 def download_section(section_number: str):
-    sections = parse_syllabus("syllabus.md")
+    sections = load_syllabus("syllabus.md")
     target_section = next((s for s in sections if s['section_number'] == section_number), None)
     
     if not target_section:
         raise HTTPException(status_code=404, detail="Section not found")
     
-    filename = f"output/Section_{section_number}_{target_section['section_title'].replace(' ', '_')}.md"
-    docx_filename = filename.replace('.md', '.docx')
+    manifest = get_manifest("output")
+    entry = manifest.get(section_number, target_section['section_title'])
+    if not entry:
+        raise HTTPException(status_code=404, detail="File not generated yet")
     
-    # Prefer DOCX if available
-    if os.path.exists(docx_filename):
+    # Prefer DOCX if it was exported from the current text
+    docx_filename = manifest.export_path(section_number, "docx")
+    if docx_filename:
         return FileResponse(docx_filename, filename=os.path.basename(docx_filename))
-    elif os.path.exists(filename):
-        return FileResponse(filename, filename=os.path.basename(filename))
-    else:
-        raise HTTPException(status_code=404, detail="File not generated yet")
+    return FileResponse(entry['path'], filename=os.path.basename(entry['path']))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,248 @@
+"""
+Async Pipeline - Generate sections on a single event loop
+
+Every LLM call of every section is an asyncio task, so hundreds of requests
+can wait without one OS thread each. Calls are admitted by the process-wide
+fair scheduler (and the provider's adaptive limiter), like threaded calls.
+Sections use the same per-output-root plan store, content store, resume
+state and manifest as generate_section, so an interrupted run resumes with
+its finished pieces and a section that is already complete is skipped.
+Job specs with pipeline="async" run here (see job_runner.run_job).
+"""
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, List
+from src.generator import LLMGenerator, find_wrapper
+from src.cost_tracker import cost_tracker
+from src.http_pool import aclose_all
+from src.scheduler import ScheduledGenerator
+from src.resume_manager import get_resume_manager
+from src.plan_store import get_plan_store
+from src.content_store import get_content_store
+from src.manifest import get_manifest, section_filename
+from src.textbook_planner import aexpand_section_to_topics, aexpand_topic_to_subsections
+from src.textbook_writer import awrite_section_introduction, awrite_subsection, awrite_section_summary
+from src.progress_tracker import progress_tracker
+from src.durable_io import commit_file
+
+async def agenerate_section(
+    generator: LLMGenerator,
+    section_info: Dict,
+    output_dir: str = "output",
+    resume_policy: str = "resume"
+) -> Dict:
+    """
+    Generate one section asynchronously.
+
+    Args:
+        generator: LLM generator (calls go through the scheduler)
+        section_info: Section dict from parse_syllabus
+        output_dir: Output root for the section file and its resume state
+        resume_policy: "resume" (keep finished work, skip complete sections),
+                       "restart" (discard it) or "skip" (leave started sections alone)
+
+    Returns:
+        Dict with section, status ('completed' or 'skipped'), filename, words, seconds
+    """
+    started = time.time()
+    chapter = section_info['chapter']
+    section_num = section_info['section_number']
+    section_title = section_info['section_title']
+    resume_manager = get_resume_manager(output_dir)
+    plan_store = get_plan_store(output_dir)
+    content_store = get_content_store(output_dir)
+    manifest = get_manifest(output_dir)
+    filename = section_filename(output_dir, section_num, section_title)
+
+    def result(status, words=0):
+        return {'section': section_num, 'status': status, 'filename': filename,
+                'words': words, 'seconds': round(time.time() - started, 1)}
+
+    entry = manifest.get(section_num, section_title)
+    resume_point = resume_manager.get_resume_point(section_num)
+    if resume_policy == "skip" and (entry is not None or resume_point):
+        return result('skipped', entry['words'] if entry else 0)
+    if resume_policy == "restart":
+        resume_manager.clear_section(section_num)
+        plan_store.invalidate(section_num)
+        content_store.clear(section_num)
+        manifest.remove(section_num)
+    elif entry is not None and not resume_point:
+        return result('skipped', entry['words'])
+
+    # API usage is attributed to this section (tasks created below inherit the label)
+    with cost_tracker.scope(section=section_num):
+        word_count = await _generate_pieces(generator, section_info, output_dir)
+
+    manifest.record_section(section_num, section_title, filename, word_count)
+    resume_manager.complete_section(section_num)
+    progress_tracker.complete_section(section_num, word_count)
+    return result('completed', word_count)
+
+async def _generate_pieces(generator: LLMGenerator, section_info: Dict, output_dir: str) -> int:
+    """Plan a section and write its pieces (reusing stored ones); returns the word count."""
+    chapter = section_info['chapter']
+    section_num = section_info['section_number']
+    section_title = section_info['section_title']
+    resume_manager = get_resume_manager(output_dir)
+    plan_store = get_plan_store(output_dir)
+    content_store = get_content_store(output_dir)
+
+    # A stored plan is reused so stored text keeps matching its subsections
+    topics = plan_store.get(section_num, section_title, chapter)
+    if not topics:
+        topics = await aexpand_section_to_topics(generator, section_title)
+        plan_store.save(section_num, section_title, topics, chapter)
+    missing = [(topic_idx, topic) for topic_idx, topic in enumerate(topics, 1) if not topic.subsections]
+    subsection_lists = await asyncio.gather(*[
+        aexpand_topic_to_subsections(generator, section_title, topic) for _, topic in missing
+    ])
+    for (topic_idx, topic), subsections in zip(missing, subsection_lists):
+        topic.subsections = subsections
+        plan_store.save_topic(section_num, section_title, topic_idx, subsections, chapter)
+
+    resume_manager.start_section(section_num, section_title, len(topics))
+    total_subsections = sum(len(t.subsections) for t in topics)
+    progress_tracker.start_section(section_num, section_title, total_subsections + 2)
+
+    async def piece(key, write):
+        # Finished text is reused; new text is stored as soon as it exists
+        text = content_store.get(section_num, key)
+        if text is None:
+            text = await write()
+            content_store.put(section_num, key, text)
+        return text
+
+    # Schedule every writing call up front; the scheduler decides how many run
+    intro_task = asyncio.create_task(piece("introduction", lambda: awrite_section_introduction(generator, section_title, topics)))
+    summary_task = asyncio.create_task(piece("summary", lambda: awrite_section_summary(generator, section_title, topics)))
+    subsection_tasks = [
+        [
+            asyncio.create_task(piece(
+                content_store.subsection_key(topic_idx, subsection_idx, topic.title, subsection),
+                lambda topic=topic, subsection=subsection: awrite_subsection(
+                    generator, section_title, topic.title, subsection, target_words=1000)
+            ))
+            for subsection_idx, subsection in enumerate(topic.subsections, 1)
+        ]
+        for topic_idx, topic in enumerate(topics, 1)
+    ]
+
+    all_tasks = [intro_task, summary_task] + [t for tasks in subsection_tasks for t in tasks]
+    try:
+        return await _write_in_order(
+            output_dir, section_info, topics, intro_task, subsection_tasks, summary_task
+        )
+    finally:
+        # Don't leave orphaned LLM calls running if any part failed (or was cancelled)
+        for task in all_tasks:
+            task.cancel()
+
+async def _write_in_order(output_dir, section_info, topics, intro_task, subsection_tasks, summary_task) -> int:
+    """Await tasks in document order so the file is always a valid prefix."""
+    chapter = section_info['chapter']
+    section_num = section_info['section_number']
+    section_title = section_info['section_title']
+    resume_manager = get_resume_manager(output_dir)
+
+    os.makedirs(output_dir, exist_ok=True)
+    filename = section_filename(output_dir, section_num, section_title)
+    partial = filename + ".partial"
+
+    with open(partial, 'w', encoding='utf-8') as f:
+        f.write(f"# {chapter}\n\n")
+        f.write(f"## Section {section_num}: {section_title}\n\n")
+        f.write(f"*Generation started: {time.strftime('%Y-%m-%d %H:%M:%S')}*\n\n")
+        f.write("---\n\n")
+        f.flush()
+
+        intro = await intro_task
+        f.write(intro + "\n\n")
+        f.flush()
+        word_count = len(intro.split())
+        progress_tracker.complete_subsection(section_num, word_count)
+
+        for topic_idx, (topic, tasks) in enumerate(zip(topics, subsection_tasks), 1):
+            f.write(f"### {section_num}.{topic_idx} {topic.title}\n\n")
+            for subsection_idx, (subsection, task) in enumerate(zip(topic.subsections, tasks), 1):
+                content = await task
+                f.write(f"#### {section_num}.{topic_idx}.{subsection_idx} {subsection}\n\n")
+                f.write(content + "\n\n")
+                f.flush()
+                words = len(content.split())
+                word_count += words
+                resume_manager.complete_subsection(section_num, topic_idx, subsection_idx)
+                progress_tracker.update_subsection(section_num, subsection)
+                progress_tracker.complete_subsection(section_num, words)
+            resume_manager.complete_topic(section_num, topic_idx)
+
+        summary = await summary_task
+        f.write(f"### Summary and Reflection\n\n")
+        f.write(summary + "\n\n")
+        word_count += len(summary.split())
+        progress_tracker.complete_subsection(section_num, len(summary.split()))
+
+        f.write("\n---\n\n")
+        f.write(f"*Generation completed: {time.strftime('%Y-%m-%d %H:%M:%S')}*\n")
+        f.write(f"*Total words: ~{word_count}*\n")
+
+    # The finished file replaces any previous version in one step
+    commit_file(partial, filename)
+    return word_count
+
+async def agenerate_sections(
+    generator: LLMGenerator,
+    sections: List[Dict],
+    output_dir: str = "output",
+    resume_policy: str = "resume",
+    cancel: threading.Event = None
+) -> Dict[str, Dict]:
+    """
+    Generate many sections concurrently on one event loop.
+
+    Args:
+        generator: LLM generator (wrapped in the scheduler if it isn't already)
+        sections: Section dicts from parse_syllabus
+        output_dir: Output root for the section files and their resume state
+        resume_policy: Passed on to agenerate_section
+        cancel: threading.Event; when set, unfinished sections stop at once
+                (finished pieces stay stored, so they resume later)
+
+    Returns:
+        Dict of section number -> result dict (status 'cancelled', or {'error': ...} on failure)
+    """
+    # In-flight calls are bounded by the scheduler, not by this pipeline
+    if find_wrapper(generator, ScheduledGenerator) is None:
+        generator = ScheduledGenerator(generator)
+    tasks = [asyncio.ensure_future(agenerate_section(generator, s, output_dir, resume_policy)) for s in sections]
+    watcher = asyncio.ensure_future(_cancel_when_set(cancel, tasks)) if cancel is not None else None
+    try:
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+        await aclose_all()
+
+    summary = {}
+    for section_info, result in zip(sections, results):
+        section_num = section_info['section_number']
+        if isinstance(result, asyncio.CancelledError):
+            summary[section_num] = {'section': section_num, 'status': 'cancelled', 'words': 0}
+        elif isinstance(result, BaseException):
+            summary[section_num] = {'error': str(result)}
+        else:
+            summary[section_num] = result
+    return summary
+
+async def _cancel_when_set(cancel: threading.Event, tasks: List[asyncio.Future]):
+    while not cancel.is_set():
+        await asyncio.sleep(0.5)
+    for task in tasks:
+        task.cancel()
+
+def run_sections_async(generator: LLMGenerator, sections: List[Dict], output_dir: str = "output",
+                       resume_policy: str = "resume", cancel: threading.Event = None) -> Dict[str, Dict]:
+    """Synchronous entry point for agenerate_sections."""
+    return asyncio.run(agenerate_sections(generator, sections, output_dir, resume_policy, cancel))
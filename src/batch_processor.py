@@ -8,9 +8,10 @@ from typing import List, Dict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from src.config import Config
 from src.generator import get_generator
-from src.syllabus_parser import parse_syllabus
-from src.master_command_generator import generate_master_command
-from src.interactive_main import generate_section
+from src.job_runner import JobSpec, run_job
+from src.adaptive_limiter import limiter_for, feeder_workers
+from src.scheduler import get_scheduler
+from src.manifest import get_manifest
 import time
 
 class BatchProcessor:
@@ -48,7 +49,8 @@ class BatchProcessor:
     
     def process_single_outline(self, outline_file: str, config: Config) -> Dict:
         """
-        Process a single outline file.
+        Process a single outline file (as an unattended job; sections with
+        partial progress are resumed, complete ones are skipped).
         
         Returns:
             Dict with status, sections_generated, errors
@@ -58,86 +60,42 @@ class BatchProcessor:
         print(f"{'='*70}\n")
         
         try:
-            # Parse outline
-            sections = parse_syllabus(outline_file)
+            base_name = os.path.splitext(os.path.basename(outline_file))[0]
+            output_dir = f"output/{base_name}"
+            print(f"📁 Output directory: {output_dir}")
+            
+            # Split enough section workers to feed the adaptive limiter across all outlines
+            generator = get_generator(config)
+            section_workers = max(1, feeder_workers(limiter_for(generator), calls_per_task=4) // self.max_workers)
+            spec = JobSpec(outline=outline_file, name=base_name, output_dir=output_dir,
+                           concurrency=section_workers, resume="resume")
+            job = run_job(spec, generator)
             
-            if not sections:
+            if job['status'] == 'error' and not job['sections']:
                 return {
                     'status': 'error',
-                    'error': 'No sections found in outline',
+                    'error': "; ".join(job['errors']),
                     'sections_generated': 0
                 }
             
-            # Create output directory for this outline
-            base_name = os.path.splitext(os.path.basename(outline_file))[0]
-            output_dir = f"output/{base_name}"
-            os.makedirs(output_dir, exist_ok=True)
-            os.makedirs(f"{output_dir}/master_commands", exist_ok=True)
-            
-            print(f"📁 Output directory: {output_dir}")
-            print(f"📊 Found {len(sections)} sections to generate\n")
-            
-            # Generate master commands
-            for section_info in sections:
-                section_num = section_info['section_number']
-                mc_filename = f"{output_dir}/master_commands/Section_{section_num}_Master_Command.md"
-                
-                if not os.path.exists(mc_filename):
-                    master_command = generate_master_command(section_info)
-                    with open(mc_filename, 'w', encoding='utf-8') as f:
-                        f.write(master_command)
+            for section in job['sections']:
+                if section['status'] == 'failed':
+                    print(f"❌ Section {section['section']} failed: {section['error']}")
+                elif section['status'] == 'skipped':
+                    print(f"⏭️  Skipping Section {section['section']} (already exists)")
+                else:
+                    print(f"✅ Section {section['section']} complete")
             
-            # Generate sections in parallel
-            generator = get_generator(config)
-            sections_generated = 0
-            section_errors = []
-            
-            # Use ThreadPoolExecutor for parallel generation
-            with ThreadPoolExecutor(max_workers=2) as executor:
-                futures = {}
-                
-                for idx, section_info in enumerate(sections, 1):
-                    section_num = section_info['section_number']
-                    section_title = section_info['section_title']
-                    filename = f"{output_dir}/Section_{section_num}_{section_title.replace(' ', '_')}.md"
-                    
-                    # Skip if already exists
-                    if os.path.exists(filename):
-                        print(f"⏭️  Skipping Section {section_num} (already exists)")
-                        sections_generated += 1
-                        continue
-                    
-                    # Submit for parallel processing
-                    future = executor.submit(
-                        self._generate_section_wrapper,
-                        generator,
-                        section_info,
-                        idx,
-                        len(sections),
-                        output_dir
-                    )
-                    futures[future] = section_num
-                
-                # Wait for completion
-                for future in as_completed(futures):
-                    section_num = futures[future]
-                    try:
-                        result = future.result()
-                        if result['success']:
-                            sections_generated += 1
-                            print(f"✅ Section {section_num} complete")
-                        else:
-                            section_errors.append(f"Section {section_num}: {result['error']}")
-                            print(f"❌ Section {section_num} failed: {result['error']}")
-                    except Exception as e:
-                        section_errors.append(f"Section {section_num}: {str(e)}")
-                        print(f"❌ Section {section_num} exception: {e}")
+            # Totals for the whole outline (including sections from earlier runs) come from its manifest
+            indexed = get_manifest(output_dir).summary()
+            print(f"📝 {output_dir}: {indexed['sections']} sections, ~{indexed['words']:,} words")
             
             return {
-                'status': 'success' if not section_errors else 'partial',
-                'sections_generated': sections_generated,
-                'total_sections': len(sections),
-                'errors': section_errors,
+                'status': 'success' if not job['errors'] else 'partial',
+                'sections_generated': sum(1 for s in job['sections'] if s['status'] != 'failed'),
+                'total_sections': len(job['sections']),
+                'errors': job['errors'],
+                'words': indexed['words'],
                 'output_dir': output_dir
             }
         
@@ -148,29 +106,6 @@ class BatchProcessor:
                 'sections_generated': 0
             }
     
-    def _generate_section_wrapper(self, generator, section_info, idx, total, output_dir):
-        """Wrapper for section generation with error handling."""
-        try:
-            # Temporarily change output directory
-            original_output = "output"
-            
-            # Generate section (this will create the file)
-            generate_section(generator, section_info, idx, total)
-            
-            # Move file to correct output directory
-            section_num = section_info['section_number']
-            section_title = section_info['section_title']
-            original_file = f"output/Section_{section_num}_{section_title.replace(' ', '_')}.md"
-            new_file = f"{output_dir}/Section_{section_num}_{section_title.replace(' ', '_')}.md"
-            
-            if os.path.exists(original_file):
-                os.rename(original_file, new_file)
-            
-            return {'success': True}
-        
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
-    
     def process_batch(self, outline_files: List[str], config: Config) -> Dict:
         """
         Process multiple outline files in parallel.
@@ -267,6 +202,7 @@ def batch_generate():
     print(f"✅ Sections generated: {summary['total_sections']}")
     print(f"❌ Errors: {summary['total_errors']}")
     print(f"⏱️  Time: {summary['elapsed_time']/60:.1f} minutes")
+    get_scheduler().print_summary()
     print(f"\nResults:")
     
     for outline_file, result in summary['results'].items():
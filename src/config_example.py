@@ -26,5 +26,50 @@ class Config:
     API_KEY: str = "YOUR_API_KEY_HERE"
     MODEL_NAME: str = "deepseek-chat" 
     
+    # Connection Settings
+    PREWARM_CONNECTIONS: int = 2  # Keep-alive sockets opened at startup (0 = off)
+    STREAM_STALL_TIMEOUT: int = 60  # Abort a streaming response after this many silent seconds
+    
+    # Response Cache (re-used answers for identical prompts)
+    RESPONSE_CACHE: bool = False
+    RESPONSE_CACHE_FILE: str = "output/.llm_cache.sqlite3"
+    RESPONSE_CACHE_MAX_MB: int = 200
+    RESPONSE_CACHE_TTL_DAYS: int = 30
+    
+    # Section planning: "per_topic" (1 + one call per topic) or "structured" (one JSON call per section)
+    PLANNER_MODE: str = "per_topic"
+    
+    # Model routing per call site ("planning", "introduction", "subsection", "summary"), e.g.
+    # {"planning": {"provider": LLMProvider.GEMINI_FLASH, "api_key": "...", "model": "gemini-1.5-flash"}}
+    # Unlisted call sites (and missing keys) use PROVIDER / API_KEY / MODEL_NAME above
+    ROUTES: dict = None
+    
+    # Hedged Requests (duplicate calls that run past the learned latency percentile)
+    HEDGING: bool = False
+    HEDGE_PERCENTILE: float = 0.95
+    HEDGE_PROVIDER: LLMProvider = None  # None = hedge on the same provider
+    HEDGE_API_KEY: str = ""
+    HEDGE_MODEL_NAME: str = ""
+    
+    # Shared rate limits (token buckets across all processes on this machine), e.g.
+    # {"deepseek_requests": {"per_minute": 300, "burst": 20}, "deepseek_tokens": {"per_minute": 1000000}}
+    RATE_LIMITS: dict = None
+    
+    # Global cap on in-flight LLM calls across all outlines/sections (None = follow the adaptive limit)
+    MAX_IN_FLIGHT: int = None
+    
+    # Upper bound of each provider's adaptive concurrency limit (also sizes its HTTP connection pool)
+    MAX_CONCURRENCY: int = 20
+    
+    # fsync state and section files before renaming them into place (survives power loss; slower)
+    DURABLE_FSYNC: bool = False
+    
+    # API job queue: jobs generated at once, and jobs allowed to wait before submits get HTTP 429
+    API_MAX_RUNNING_JOBS: int = 2
+    API_MAX_QUEUED_JOBS: int = 100
+    
+    # Processes converting sections to DOCX/PDF in the background
+    EXPORT_WORKERS: int = 2
+    
     # Context Settings
     MAX_CONTEXT_WORDS: int = 4000 # DeepSeek has larger context
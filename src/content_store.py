@@ -0,0 +1,69 @@
+"""
+Content Store - Durable per-section store of generated text
+
+Every introduction, subsection and summary is saved the moment it is
+generated, one file per piece under a per-section directory. Subsection
+files are keyed by their position and a hash of their topic/subsection
+titles, so stored text only matches the plan it was written for. Section
+markdown is assembled from the store, so a resumed section keeps its
+finished text and only pays for the pieces that are missing.
+"""
+import hashlib
+import os
+import shutil
+import threading
+from typing import Dict, Optional
+from src.durable_io import atomic_write
+
+class ContentStore:
+    def __init__(self, root: str = "output/.content"):
+        self.root = root
+
+    @staticmethod
+    def subsection_key(topic_idx: int, subsection_idx: int, topic_title: str, subsection: str) -> str:
+        """Key of one subsection's text (1-based indexes)."""
+        digest = hashlib.sha256(f"{topic_title}\n{subsection}".encode('utf-8')).hexdigest()[:12]
+        return f"{topic_idx}.{subsection_idx}_{digest}"
+
+    def _path(self, section_num: str, key: str) -> str:
+        return os.path.join(self.root, section_num, f"{key}.md")
+
+    def get(self, section_num: str, key: str) -> Optional[str]:
+        """Stored text for a key, or None if it hasn't been generated."""
+        try:
+            with open(self._path(section_num, key), 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def has(self, section_num: str, key: str) -> bool:
+        return os.path.exists(self._path(section_num, key))
+
+    def put(self, section_num: str, key: str, text: str):
+        """
+        Store text for a key (atomically, so a crash never leaves half a file).
+
+        Raises:
+            ValueError: If the text is empty or an error message (a failed call),
+                        so the piece is generated again instead of counting as finished
+        """
+        if not text or not text.strip() or text.startswith("Error:"):
+            raise ValueError(f"Section {section_num}: no text generated for {key}")
+        atomic_write(self._path(section_num, key), text)
+
+    def clear(self, section_num: str):
+        """Delete all stored text of a section."""
+        shutil.rmtree(os.path.join(self.root, section_num), ignore_errors=True)
+
+_stores: Dict[str, ContentStore] = {}
+_stores_lock = threading.Lock()
+
+def get_content_store(output_dir: str = "output") -> ContentStore:
+    """Get the content store of one output root (kept next to its resume state)."""
+    with _stores_lock:
+        if output_dir not in _stores:
+            _stores[output_dir] = ContentStore(os.path.join(output_dir, ".content"))
+        return _stores[output_dir]
+
+# Global instance
+content_store = get_content_store()
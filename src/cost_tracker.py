@@ -1,56 +1,224 @@
 """
 Cost Tracker - Track API usage and costs
+
+Generators report the real `usage` returned by each provider (including
+cached-prefix tokens). Every call is priced from a per-model table,
+aggregated per provider, job, section and call site, and appended to a
+JSON-lines log so cost-per-word and tokens-per-second survive the run.
 """
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+# USD per 1M tokens: (input, cached input, output)
+PRICES = {
+    "deepseek-chat": (0.14, 0.014, 0.28),
+    "deepseek-reasoner": (0.55, 0.14, 2.19),
+    "gemini-1.5-pro": (1.25, 0.3125, 5.00),
+    "gemini-1.5-flash": (0.075, 0.01875, 0.30),
+}
+
+# Fallback when a model isn't in PRICES
+PROVIDER_PRICES = {
+    "deepseek": PRICES["deepseek-chat"],
+    "gemini": PRICES["gemini-1.5-pro"],
+    "mock": (0.0, 0.0, 0.0),
+}
+
+# Labels (job, section, call_site) for calls made in the current context
+_scope = contextvars.ContextVar("cost_scope", default={})
+
+def _new_bucket() -> Dict:
+    return {
+        'calls': 0,
+        'input_tokens': 0,
+        'cached_tokens': 0,
+        'output_tokens': 0,
+        'words': 0,
+        'seconds': 0.0,
+        'cost_usd': 0.0
+    }
 
 class CostTracker:
-    def __init__(self):
-        self.total_input_tokens = 0
-        self.total_output_tokens = 0
-        
-        # DeepSeek pricing (per 1M tokens)
-        self.input_cost_per_1m = 0.14
-        self.output_cost_per_1m = 0.28
-    
+    def __init__(self, log_file: str = "output/.cost_log.jsonl"):
+        self.lock = threading.Lock()
+        self.log_file = log_file
+        self.run_id = time.strftime('%Y%m%d-%H%M%S')
+        self.total = _new_bucket()
+        self.breakdown: Dict[str, Dict[str, Dict]] = {
+            'provider': {}, 'model': {}, 'job': {}, 'section': {}, 'call_site': {}
+        }
+
+    @property
+    def total_input_tokens(self) -> int:
+        return self.total['input_tokens']
+
+    @property
+    def total_output_tokens(self) -> int:
+        return self.total['output_tokens']
+
+    @contextmanager
+    def scope(self, **labels):
+        """
+        Label every call made inside the block (nests; inner labels win).
+
+        Example:
+            with cost_tracker.scope(section="1.2", call_site="planning"):
+                ...
+        """
+        token = _scope.set({**_scope.get(), **labels})
+        try:
+            yield
+        finally:
+            _scope.reset(token)
+
+    def current_scope(self) -> Dict:
+        """Labels in effect for calls made from the current context."""
+        return _scope.get()
+
+    def price(self, provider: str, model: str, input_tokens: int, cached_tokens: int, output_tokens: int) -> float:
+        """Cost in USD of one call."""
+        input_price, cached_price, output_price = PRICES.get(model) or PROVIDER_PRICES.get(provider, PRICES["deepseek-chat"])
+        uncached = max(0, input_tokens - cached_tokens)
+        return (uncached * input_price + cached_tokens * cached_price + output_tokens * output_price) / 1_000_000
+
+    def record(self, provider: str, model: str, input_tokens: int, output_tokens: int,
+               cached_tokens: int = 0, seconds: float = 0.0, words: int = 0):
+        """
+        Record the usage of one API call.
+
+        Args:
+            provider: Provider name (e.g. 'deepseek')
+            model: Model name used for pricing
+            input_tokens: Prompt tokens (including cached ones)
+            output_tokens: Completion tokens
+            cached_tokens: Prompt tokens served from the provider's prefix cache
+            seconds: Call latency
+            words: Words of text produced
+        """
+        cost = self.price(provider, model, input_tokens, cached_tokens, output_tokens)
+        labels = dict(_scope.get())
+        labels['provider'] = provider
+        labels['model'] = model or provider
+        entry = {
+            'run': self.run_id,
+            'time': time.time(),
+            **labels,
+            'input_tokens': input_tokens,
+            'cached_tokens': cached_tokens,
+            'output_tokens': output_tokens,
+            'words': words,
+            'seconds': round(seconds, 3),
+            'cost_usd': cost
+        }
+
+        with self.lock:
+            buckets = [self.total] + [
+                self.breakdown[dimension].setdefault(str(labels[dimension]), _new_bucket())
+                for dimension in self.breakdown if labels.get(dimension) is not None
+            ]
+            for bucket in buckets:
+                bucket['calls'] += 1
+                bucket['input_tokens'] += input_tokens
+                bucket['cached_tokens'] += cached_tokens
+                bucket['output_tokens'] += output_tokens
+                bucket['words'] += words
+                bucket['seconds'] += seconds
+                bucket['cost_usd'] += cost
+            self._append(entry)
+
+    def _append(self, entry: Dict):
+        if not self.log_file:
+            return
+        try:
+            log_dir = os.path.dirname(self.log_file)
+            if log_dir:
+                os.makedirs(log_dir, exist_ok=True)
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"⚠️  Could not write cost log: {e}")
+
     def add_tokens(self, input_tokens: int, output_tokens: int):
-        """Add tokens to the tracker."""
-        self.total_input_tokens += input_tokens
-        self.total_output_tokens += output_tokens
-    
+        """Add tokens to the tracker (priced at DeepSeek rates)."""
+        self.record("deepseek", "", input_tokens, output_tokens)
+
     def estimate_tokens(self, text: str, is_input: bool = True):
-        """Estimate tokens from text (rough: 1 token ≈ 0.75 words)."""
+        """Estimate tokens from text (rough: 1 token ≈ 0.75 words). Prefer record() with real usage."""
         words = len(text.split())
         tokens = int(words / 0.75)
-        
+
         if is_input:
-            self.total_input_tokens += tokens
+            self.add_tokens(tokens, 0)
         else:
-            self.total_output_tokens += tokens
-        
+            self.add_tokens(0, tokens)
+
         return tokens
-    
+
     def get_cost(self) -> float:
         """Calculate total cost in USD."""
-        input_cost = (self.total_input_tokens / 1_000_000) * self.input_cost_per_1m
-        output_cost = (self.total_output_tokens / 1_000_000) * self.output_cost_per_1m
-        return input_cost + output_cost
-    
+        with self.lock:
+            return self.total['cost_usd']
+
     def get_summary(self) -> dict:
         """Get summary of usage and cost."""
-        return {
-            'input_tokens': self.total_input_tokens,
-            'output_tokens': self.total_output_tokens,
-            'total_tokens': self.total_input_tokens + self.total_output_tokens,
-            'cost_usd': self.get_cost()
-        }
-    
+        with self.lock:
+            return _summarize(self.total)
+
+    def get_breakdown(self, dimension: str) -> Dict[str, Dict]:
+        """Get usage per provider, job, section or call_site."""
+        with self.lock:
+            return {name: _summarize(bucket) for name, bucket in self.breakdown[dimension].items()}
+
     def print_summary(self):
         """Print cost summary."""
         summary = self.get_summary()
         print(f"\n💰 Cost Summary:")
-        print(f"   Input tokens:  {summary['input_tokens']:,}")
+        print(f"   Input tokens:  {summary['input_tokens']:,} ({summary['cached_tokens']:,} cached)")
         print(f"   Output tokens: {summary['output_tokens']:,}")
         print(f"   Total tokens:  {summary['total_tokens']:,}")
-        print(f"   Estimated cost: ${summary['cost_usd']:.4f}")
+        print(f"   Cost: ${summary['cost_usd']:.4f}")
+        if summary['words']:
+            print(f"   Cost per 1k words: ${summary['cost_per_1k_words']:.4f}")
+        if summary['seconds']:
+            print(f"   Output speed: {summary['tokens_per_sec']:.1f} tokens/sec per call")
+
+        for dimension in ('model', 'call_site', 'section'):
+            breakdown = self.get_breakdown(dimension)
+            if breakdown:
+                print(f"\n   By {dimension.replace('_', ' ')}:")
+                for name, stats in sorted(breakdown.items()):
+                    print(f"     {name}: ${stats['cost_usd']:.4f} | {stats['total_tokens']:,} tokens | "
+                          f"{stats['words']:,} words | {stats['avg_latency']:.1f}s/call")
+
+def _summarize(bucket: Dict) -> Dict:
+    summary = dict(bucket)
+    summary['total_tokens'] = bucket['input_tokens'] + bucket['output_tokens']
+    summary['cost_per_1k_words'] = bucket['cost_usd'] / bucket['words'] * 1000 if bucket['words'] else 0.0
+    summary['tokens_per_sec'] = bucket['output_tokens'] / bucket['seconds'] if bucket['seconds'] else 0.0
+    summary['avg_latency'] = bucket['seconds'] / bucket['calls'] if bucket['calls'] else 0.0
+    return summary
+
+def load_runs(log_file: str = "output/.cost_log.jsonl") -> Dict[str, Dict]:
+    """Summarize every run recorded in a cost log (run id -> totals)."""
+    runs: Dict[str, Dict] = {}
+    if not os.path.exists(log_file):
+        return runs
+    with open(log_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            bucket = runs.setdefault(entry.get('run', 'unknown'), _new_bucket())
+            bucket['calls'] += 1
+            for field in ('input_tokens', 'cached_tokens', 'output_tokens', 'words', 'seconds', 'cost_usd'):
+                bucket[field] += entry.get(field, 0)
+    return {run: _summarize(bucket) for run, bucket in runs.items()}
 
 # Global tracker instance
 cost_tracker = CostTracker()
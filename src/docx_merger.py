@@ -0,0 +1,106 @@
+"""
+DOCX Merger - Build a book DOCX from already-converted section DOCX files
+
+Instead of re-parsing the combined markdown into one python-docx object
+graph, the body of each section document is streamed into the output
+package one section at a time. Memory stays bounded by the largest single
+section, however long the book is. Styles, page setup and the other package
+parts come from the first section, so every section must come from the
+same converter (ProfessionalDocxGenerator). Sections that reference other
+package parts (images, hyperlinks) can't be merged this way and are
+rejected.
+"""
+import os
+import re
+import tempfile
+import zipfile
+from typing import List, Optional
+from xml.sax.saxutils import escape
+from src.durable_io import commit_file
+
+DOCUMENT_PART = "word/document.xml"
+PAGE_BREAK = b'<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+
+_BODY_START = re.compile(rb"<w:body>")
+_FIRST_PARAGRAPH = re.compile(rb"\s*<w:p[ >].*?</w:p>", re.S)
+_RELATIONSHIP_REF = re.compile(rb'\br:(id|embed|link)="')
+
+def _split_document(xml: bytes, name: str):
+    """Split document.xml into (prefix up to <w:body>, body content, sectPr + closing tags)."""
+    # The body's own section properties are its last child
+    start = _BODY_START.search(xml)
+    end = xml.rfind(b"<w:sectPr")
+    if not start or end < start.end() or not re.match(rb"<w:sectPr[ >].*</w:sectPr>\s*</w:body>", xml[end:], re.S):
+        raise ValueError(f"{name}: unexpected document structure")
+    return xml[:start.end()], xml[start.end():end], xml[end:]
+
+def _heading(text: str, style: str = "Heading1") -> bytes:
+    return (f'<w:p><w:pPr><w:pStyle w:val="{style}"/></w:pPr>'
+            f'<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>').encode('utf-8')
+
+def _read_document(docx_file: str) -> bytes:
+    with zipfile.ZipFile(docx_file) as package:
+        return package.read(DOCUMENT_PART)
+
+def merge_docx(section_files: List[str], output_file: str, title: Optional[str] = None,
+               page_breaks: bool = True, drop_first_heading: bool = True) -> str:
+    """
+    Merge section DOCX files into one document.
+
+    Args:
+        section_files: Section DOCX files, in book order
+        output_file: Merged DOCX path (written atomically)
+        title: Optional heading placed before the first section
+        page_breaks: Start each section on a new page
+        drop_first_heading: Drop each section's first paragraph if it is a
+                            top-level heading (the repeated chapter title)
+
+    Returns:
+        output_file
+    """
+    if not section_files:
+        raise ValueError("No section documents to merge")
+
+    first = _read_document(section_files[0])
+    prefix, _, suffix = _split_document(first, section_files[0])
+    root_tag = prefix[:prefix.index(b">", prefix.index(b"<w:document")) + 1]
+    del first
+
+    directory = os.path.dirname(output_file) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp = tempfile.mkstemp(prefix=f".{os.path.basename(output_file)}.", suffix=".tmp", dir=directory)
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(temp, 'w', zipfile.ZIP_DEFLATED) as out:
+            # Every part except the body comes from the first section
+            with zipfile.ZipFile(section_files[0]) as template:
+                for item in template.infolist():
+                    if item.filename != DOCUMENT_PART:
+                        out.writestr(item, template.read(item.filename))
+
+            with out.open(DOCUMENT_PART, 'w') as document:
+                document.write(prefix)
+                if title:
+                    document.write(_heading(title))
+                for idx, section_file in enumerate(section_files):
+                    xml = _read_document(section_file)
+                    section_prefix, body, _ = _split_document(xml, section_file)
+                    del xml
+                    if section_prefix[:len(root_tag)] != root_tag:
+                        raise ValueError(f"{section_file}: made by a different converter, can't be merged")
+                    if _RELATIONSHIP_REF.search(body):
+                        raise ValueError(f"{section_file}: contains images or links, can't be merged")
+                    if drop_first_heading:
+                        paragraph = _FIRST_PARAGRAPH.match(body)
+                        if paragraph and b'<w:pStyle w:val="Heading1"/>' in paragraph.group(0):
+                            body = body[paragraph.end():]
+                    if page_breaks and (idx or title):
+                        document.write(PAGE_BREAK)
+                    document.write(body)
+                document.write(suffix)
+        commit_file(temp, output_file)
+    except BaseException:
+        if os.path.exists(temp):
+            os.unlink(temp)
+        raise
+    return output_file
@@ -0,0 +1,176 @@
+"""
+Durable I/O - Crash-safe file writes
+
+Files are written to a temp file in the same directory and renamed over
+the target, so a reader (or a restart after a kill) sees either the old or
+the new content, never half a file. fsync is optional (Config.DURABLE_FSYNC)
+because it only matters for power loss, not for a killed process.
+
+GroupCommit coalesces many small state updates (e.g. one per finished
+subsection) into one write per short window.
+"""
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+import weakref
+from typing import Any, Callable, Optional, Union
+try:
+    from src.config import Config
+except ImportError:  # src/config.py is per-checkout; thesis imports this module without it
+    Config = None
+
+def _fsync_default() -> bool:
+    return bool(getattr(Config, 'DURABLE_FSYNC', False))
+
+def atomic_write(path: str, data: Union[str, bytes], fsync: Optional[bool] = None):
+    """
+    Replace a file's content atomically.
+
+    Args:
+        path: Target file (parent directories are created)
+        data: Text or bytes to write
+        fsync: Flush to disk before renaming (default: Config.DURABLE_FSYNC)
+    """
+    fsync = _fsync_default() if fsync is None else fsync
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data.encode('utf-8') if isinstance(data, str) else data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp, path)
+    except BaseException:
+        try:
+            os.unlink(temp)
+        except OSError:
+            pass
+        raise
+    if fsync:
+        _fsync_directory(directory)
+
+def _fsync_directory(directory: str):
+    # Makes the rename itself durable (not supported on every platform)
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def commit_file(temp: str, path: str, fsync: Optional[bool] = None):
+    """
+    Atomically move a fully written file into place.
+
+    Args:
+        temp: Finished file (e.g. a live-written .partial file)
+        path: Final path
+        fsync: Flush to disk before renaming (default: Config.DURABLE_FSYNC)
+    """
+    fsync = _fsync_default() if fsync is None else fsync
+    if fsync:
+        with open(temp, 'rb+') as f:
+            os.fsync(f.fileno())
+    os.replace(temp, path)
+    if fsync:
+        _fsync_directory(os.path.dirname(path) or ".")
+
+def atomic_write_json(path: str, obj: Any, fsync: Optional[bool] = None):
+    """Serialize obj as indented JSON and write it atomically."""
+    atomic_write(path, json.dumps(obj, indent=2, ensure_ascii=False), fsync)
+
+def read_json(path: str, default: Any = None) -> Any:
+    """
+    Read a JSON file.
+
+    A missing file returns default. An unreadable one is moved aside to
+    <path>.corrupt-<time> (so it can be inspected) instead of being silently
+    overwritten, and default is returned.
+    """
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        quarantine = f"{path}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}"
+        try:
+            os.replace(path, quarantine)
+            print(f"⚠️  Could not read {path} ({e}); moved it to {quarantine}")
+        except OSError:
+            print(f"⚠️  Could not read {path} ({e})")
+        return default
+
+class GroupCommit:
+    def __init__(self, path: str, snapshot: Callable[[], Any], delay: float = 0.5, fsync: Optional[bool] = None):
+        """
+        Initialize a group committer for one JSON file.
+
+        Args:
+            path: File to write
+            snapshot: Returns the object to save (called on the commit thread;
+                      must be safe to call while other threads update the state)
+            delay: Longest time an update waits before it is written
+            fsync: fsync policy for each write (default: Config.DURABLE_FSYNC)
+        """
+        self.path = path
+        self.snapshot = snapshot
+        self.delay = delay
+        self.fsync = fsync
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.dirty = False
+        self.timer: Optional[threading.Timer] = None
+        self.stats = {'updates': 0, 'writes': 0}
+        _committers.add(self)
+
+    def request(self):
+        """Note that the state changed; it is written within `delay` seconds."""
+        with self.lock:
+            self.stats['updates'] += 1
+            self.dirty = True
+            timer = None
+            if self.delay > 0:
+                if self.timer is not None:
+                    return
+                timer = self.timer = threading.Timer(self.delay, self.flush)
+                timer.daemon = True
+        if timer is None:
+            self.flush()
+        else:
+            timer.start()
+
+    def flush(self):
+        """Write pending updates now (no-op if nothing changed)."""
+        with self.write_lock:
+            with self.lock:
+                if self.timer is not None:
+                    self.timer.cancel()
+                    self.timer = None
+                if not self.dirty:
+                    return
+                self.dirty = False
+            atomic_write_json(self.path, self.snapshot(), self.fsync)
+            with self.lock:
+                self.stats['writes'] += 1
+
+# Pending group commits are written on a normal interpreter exit
+_committers = weakref.WeakSet()
+
+@atexit.register
+def flush_all():
+    """Write every pending group commit."""
+    for committer in list(_committers):
+        try:
+            committer.flush()
+        except OSError as e:
+            print(f"⚠️  Could not save {committer.path}: {e}")
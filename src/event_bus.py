@@ -0,0 +1,129 @@
+"""
+Event Bus - Push progress events to any number of listeners
+
+Producers (progress tracker, job queue) publish small structured events;
+subscribers (e.g. one per Server-Sent-Events connection) each get their own
+bounded buffer, so a slow client can't hold up generation. A client that
+falls too far behind gets a single 'resync' event and should re-fetch full
+state. Recent events are kept so a reconnecting client can replay what it
+missed (Last-Event-ID).
+"""
+import asyncio
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+class Subscription:
+    def __init__(self, bus: 'EventBus', maxlen: int, loop: asyncio.AbstractEventLoop = None):
+        self.bus = bus
+        self.events = deque()
+        self.maxlen = maxlen
+        self.overflowed = False
+        self.condition = threading.Condition(bus.lock)
+        self.loop = loop
+        self.ready = asyncio.Event() if loop else None
+
+    def _push(self, event: Dict):
+        # Caller holds the bus lock
+        if len(self.events) >= self.maxlen:
+            self.events.clear()
+            self.overflowed = True
+        else:
+            self.events.append(event)
+        self.condition.notify()
+        if self.loop:
+            try:
+                self.loop.call_soon_threadsafe(self.ready.set)
+            except RuntimeError:
+                pass  # Consumer's loop is closed; it will be unsubscribed
+
+    def _pop(self) -> Optional[Dict]:
+        # Caller holds the bus lock
+        if self.overflowed:
+            self.overflowed = False
+            return {'id': self.bus.last_id, 'type': 'resync', 'time': time.time(), 'data': {}}
+        return self.events.popleft() if self.events else None
+
+    def get(self, timeout: float = None) -> Optional[Dict]:
+        """Next event, or None if none arrives within timeout."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.overflowed or self.events, timeout)
+            return self._pop()
+
+    async def aget(self, timeout: float = None) -> Optional[Dict]:
+        """Async counterpart of get() (subscription must be created with a loop)."""
+        while True:
+            with self.bus.lock:
+                event = self._pop()
+                if event is None:
+                    self.ready.clear()
+            if event is not None:
+                return event
+            try:
+                await asyncio.wait_for(self.ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+class EventBus:
+    def __init__(self, history: int = 500, buffer: int = 1000):
+        """
+        Initialize the bus.
+
+        Args:
+            history: Recent events kept for replay
+            buffer: Events a subscriber may fall behind before it is told to resync
+        """
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.last_id = 0
+        self.history = deque(maxlen=history)
+        self.buffer = buffer
+        self.subscribers: List[Subscription] = []
+
+    def publish(self, event_type: str, **data) -> Dict:
+        """Send an event to every subscriber."""
+        with self.lock:
+            self.last_id = next(self.ids)
+            event = {'id': self.last_id, 'type': event_type, 'time': time.time(), 'data': data}
+            self.history.append(event)
+            for subscriber in self.subscribers:
+                subscriber._push(event)
+        return event
+
+    def subscribe(self, since: int = None, loop: asyncio.AbstractEventLoop = None) -> Subscription:
+        """
+        Start receiving events.
+
+        Args:
+            since: Replay kept events with a higher id first (e.g. Last-Event-ID);
+                   if some were already dropped (or the id is from an earlier
+                   server run), the first event is 'resync'
+            loop: Event loop of an async consumer (enables aget())
+        """
+        subscription = Subscription(self, self.buffer, loop)
+        with self.lock:
+            if since is not None and since != self.last_id:
+                missed = [event for event in self.history if event['id'] > since]
+                if not missed or missed[0]['id'] != since + 1 or len(missed) > self.buffer:
+                    subscription.overflowed = True
+                else:
+                    subscription.events.extend(missed)
+            self.subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self.lock:
+            if subscription in self.subscribers:
+                self.subscribers.remove(subscription)
+
+    def subscriber_count(self) -> int:
+        with self.lock:
+            return len(self.subscribers)
+
+# Global instance
+event_bus = EventBus()
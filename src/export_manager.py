@@ -3,6 +3,7 @@ Export Manager - Convert markdown to DOCX and PDF
 """
 import os
 import subprocess
+from src.export_service import get_export_service
 
 def export_to_docx(md_file: str, output_file: str = None) -> bool:
     """
@@ -80,6 +81,9 @@ def export_to_pdf(md_file: str, output_file: str = None) -> bool:
 def auto_export_all(output_dir: str = "output"):
     """
     Automatically export all markdown files to DOCX and PDF.
+    
+    Files are converted in parallel by the export service; files whose
+    exports were already made from their current text are not converted again.
     """
     print("\n📦 Auto-exporting all sections...")
     
@@ -93,14 +97,15 @@ def auto_export_all(output_dir: str = "output"):
     if os.path.exists(complete_file):
         md_files.append(complete_file)
     
-    success_count = 0
-    for md_file in md_files:
-        if export_to_docx(md_file):
-            success_count += 1
+    service = get_export_service()
+    skipped_before = service.get_stats()['skipped']
+    results = service.export_all(md_files, ("docx",), output_dir, engine="pandoc")
+    success_count = sum(1 for exports in results.values() if exports['docx'])
+    up_to_date = service.get_stats()['skipped'] - skipped_before
     
-    print(f"\n✅ Exported {success_count}/{len(md_files)} files to DOCX")
+    print(f"\n✅ Exported {success_count}/{len(md_files)} files to DOCX ({up_to_date} unchanged, not reconverted)")
     
     # Try PDF (optional, may fail if LaTeX not installed)
     print("\n📄 Attempting PDF export...")
     if os.path.exists(complete_file):
-        export_to_pdf(complete_file)
+        service.submit(complete_file, "pdf", output_dir).result()
@@ -0,0 +1,168 @@
+"""
+Export Service - DOCX/PDF conversion off the generation path
+
+Conversions are queued and run in a small process pool, so a generation
+worker hands its finished section over and moves straight on to the next
+one, and a whole book converts in parallel. Each conversion is keyed by the
+SHA-256 of the markdown it reads and the converter used: if the output
+manifest already has an export of exactly that content by the same
+converter, the conversion is skipped. Conversion
+times are recorded in the manifest and in the service's stats.
+"""
+import atexit
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional
+from src.config import Config
+from src.manifest import get_manifest
+
+ENGINES = ("professional", "pandoc")
+
+def _convert(md_file: str, kind: str, engine: str):
+    """Run one conversion (in a pool process). Returns (output path or None, seconds)."""
+    started = time.time()
+    if kind == "pdf":
+        from src.export_manager import export_to_pdf
+        output = md_file.replace('.md', '.pdf') if export_to_pdf(md_file) else None
+    elif engine == "pandoc":
+        from src.export_manager import export_to_docx
+        output = md_file.replace('.md', '.docx') if export_to_docx(md_file) else None
+    else:
+        from src.docx_generator import auto_convert_to_docx
+        output = auto_convert_to_docx(md_file)
+    return output, time.time() - started
+
+def _sha256(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+class ExportService:
+    def __init__(self, max_workers: int = None):
+        """
+        Initialize the service (the pool starts on the first conversion).
+
+        Args:
+            max_workers: Conversion processes (default: Config.EXPORT_WORKERS)
+        """
+        self.max_workers = max_workers or getattr(Config, 'EXPORT_WORKERS', 2)
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.pending = 0
+        self.stats = {'queued': 0, 'converted': 0, 'skipped': 0, 'failed': 0, 'seconds': 0.0}
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Caller holds the lock. Spawned (not forked) workers, since the
+        # parent has many threads mid-request when the pool starts
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self.pool
+
+    def submit(self, md_file: str, kind: str = "docx", output_dir: str = None, engine: str = "professional") -> Future:
+        """
+        Queue one conversion.
+
+        Args:
+            md_file: Markdown file to convert
+            kind: "docx" or "pdf"
+            output_dir: Output root whose manifest records the export (default: md_file's directory)
+            engine: DOCX converter, "professional" (python-docx) or "pandoc"
+
+        Returns:
+            Future for the output path (None if the conversion failed)
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown export engine: {engine}")
+        # Both DOCX engines write the same path, so an export only counts for its own engine
+        converter = engine if kind == "docx" else "pandoc"
+        manifest = get_manifest(output_dir or os.path.dirname(md_file) or ".")
+        source_sha256 = _sha256(md_file)
+        existing = manifest.fresh_export(md_file, kind, source_sha256, converter)
+        if existing:
+            with self.lock:
+                self.stats['skipped'] += 1
+            future = Future()
+            future.set_result(existing)
+            return future
+
+        with self.lock:
+            self.stats['queued'] += 1
+            conversion = self._get_pool().submit(_convert, md_file, kind, engine)
+            self.pending += 1
+        result = Future()
+
+        def finished(done: Future):
+            output, seconds = None, 0.0
+            try:
+                output, seconds = done.result()
+                if output:
+                    # The recorded hash is that of the text that was converted
+                    manifest.record_export(md_file, kind, output, source_sha256, round(seconds, 2), converter)
+            except Exception as e:
+                print(f"⚠️  {kind.upper()} export of {md_file} failed: {e}")
+                output = None
+            with self.lock:
+                self.stats['converted' if output else 'failed'] += 1
+                self.stats['seconds'] += seconds
+                self.pending -= 1
+                self.idle.notify_all()
+            result.set_result(output)
+
+        conversion.add_done_callback(finished)
+        return result
+
+    def export_all(self, md_files: List[str], kinds=("docx",), output_dir: str = None,
+                   engine: str = "professional") -> Dict[str, Dict[str, Optional[str]]]:
+        """
+        Convert many files in parallel and wait for them.
+
+        Returns:
+            {md_file: {kind: output path or None}}
+        """
+        futures = {(md_file, kind): self.submit(md_file, kind, output_dir, engine)
+                   for md_file in md_files for kind in kinds}
+        results: Dict[str, Dict[str, Optional[str]]] = {}
+        for (md_file, kind), future in futures.items():
+            results.setdefault(md_file, {})[kind] = future.result()
+        return results
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until every queued conversion has finished (False on timeout)."""
+        with self.idle:
+            return self.idle.wait_for(lambda: self.pending == 0, timeout)
+
+    def shutdown(self):
+        """Finish queued conversions and stop the pool."""
+        with self.lock:
+            pool, self.pool = self.pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return {**self.stats, 'in_progress': self.pending}
+
+    def print_summary(self):
+        """Print export statistics."""
+        stats = self.get_stats()
+        avg = stats['seconds'] / stats['converted'] if stats['converted'] else 0.0
+        print(f"\n📦 Exports:")
+        print(f"   Converted: {stats['converted']} (avg {avg:.1f}s) | Unchanged, skipped: {stats['skipped']} | "
+              f"Failed: {stats['failed']} | In progress: {stats['in_progress']}")
+
+_service: Optional[ExportService] = None
+_service_lock = threading.Lock()
+
+def get_export_service() -> ExportService:
+    """Get the process-wide export service (created on first use)."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ExportService()
+            # Queued conversions finish before the interpreter exits
+            atexit.register(_service.shutdown)
+        return _service
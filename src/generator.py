@@ -1,17 +1,97 @@
+import asyncio
+import inspect
+import json
 import time
 from abc import ABC, abstractmethod
-from .config import Config, LLMProvider
+from typing import Iterator
+try:
+    from .config import Config, LLMProvider
+except ImportError:  # src/config.py is per-checkout; the shared wrappers are imported without it
+    Config = LLMProvider = None
+from .http_pool import get_session, get_async_client, prewarm
+from .adaptive_limiter import get_limiter, limiter_for
+from . import token_bucket
+from .cost_tracker import cost_tracker
 
 class LLMGenerator(ABC):
     @abstractmethod
     def generate(self, prompt: str, max_tokens: int = 2000) -> str:
         pass
 
+    # Abort a stream if no bytes arrive for this many seconds
+    stall_timeout = 60
+    
+    # Request identity (used as part of response cache keys)
+    provider = "unknown"
+    model_name = ""
+    system_prompt = ""
+    temperature = None
+
+    async def agenerate(self, prompt: str, max_tokens: int = 2000) -> str:
+        """Async counterpart of generate (runs generate in a worker thread by default)."""
+        return await asyncio.to_thread(self.generate, prompt, max_tokens)
+
+    def stream(self, prompt: str, max_tokens: int = 2000) -> Iterator[str]:
+        """
+        Yield the response in chunks as they arrive (one chunk by default).
+        
+        The generator's return value is False if the stream was cut short,
+        so wrappers can tell a complete response from a truncated one.
+        """
+        yield self.generate(prompt, max_tokens)
+
+    def warm_up(self, connections: int = 1):
+        """Open pooled connections before the first call (no-op by default)."""
+        pass
+
+    def _rate_costs(self, prompt: str) -> dict:
+        """Token-bucket reservation for one call (output tokens are charged afterwards)."""
+        return {
+            f"{self.provider}_requests": 1,
+            f"{self.provider}_tokens": token_bucket.estimate_tokens(self.system_prompt + prompt)
+        }
+
+    def _usage(self, result: dict):
+        """(input, cached input, output) tokens reported by the provider, or None."""
+        return None
+
+    def _finish(self, prompt: str, result: dict, started: float) -> str:
+        """Parse a response and record its real token usage."""
+        text = self._parse_result(result)
+        self._record_usage(prompt, self._usage(result), text, started)
+        return text
+
+    def _record_usage(self, prompt: str, usage, text: str, started: float):
+        if usage is None:
+            usage = (token_bucket.estimate_tokens(self.system_prompt + prompt), 0, token_bucket.estimate_tokens(text))
+        input_tokens, cached_tokens, output_tokens = usage
+        # Output tokens are only known once the response arrives
+        token_bucket.charge(f"{self.provider}_tokens", output_tokens)
+        cost_tracker.record(
+            self.provider, self.model_name, input_tokens, output_tokens,
+            cached_tokens, time.time() - started, len(text.split())
+        )
+
 class MockGenerator(LLMGenerator):
+    provider = "mock"
+
     def generate(self, prompt: str, max_tokens: int = 2000) -> str:
         print(f"[MockGenerator] Generating response for prompt: {prompt[:50]}...")
+        started = time.time()
         time.sleep(0.5) # Simulate latency
-        
+        text = self._mock_response(prompt)
+        self._record_usage(prompt, None, text, started)
+        return text
+
+    async def agenerate(self, prompt: str, max_tokens: int = 2000) -> str:
+        print(f"[MockGenerator] Generating response for prompt: {prompt[:50]}...")
+        started = time.time()
+        await asyncio.sleep(0.5) # Simulate latency
+        text = self._mock_response(prompt)
+        self._record_usage(prompt, None, text, started)
+        return text
+
+    def _mock_response(self, prompt: str) -> str:
         if "idea" in prompt.lower():
             return "A story about a space gardener who discovers a plant that eats time."
         elif "outline" in prompt.lower():
@@ -20,7 +100,7 @@ class MockGenerator(LLMGenerator):
             Chapter 1: The Discovery
             - Scene 1: Finding the seed
             - Scene 2: Planting it
-            
+
             Chapter 2: The Growth
             - Scene 1: First sprout
             - Scene 2: Time skips
@@ -30,14 +110,20 @@ class MockGenerator(LLMGenerator):
             return "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 50
 
 class GeminiGenerator(LLMGenerator):
+    provider = "gemini"
+
     def __init__(self, api_key: str, model_name: str):
         self.api_key = api_key
         self.model_name = model_name
-        import requests
-        self.requests = requests
+        self.session = get_session("gemini")
+        self.limiter = get_limiter("gemini")
         self.url = f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:generateContent?key={api_key}"
-        
-    def generate(self, prompt: str, max_tokens: int = 8192) -> str:
+        self.stream_url = f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:streamGenerateContent?alt=sse&key={api_key}"
+
+    def warm_up(self, connections: int = 1):
+        prewarm("gemini", "https://generativelanguage.googleapis.com/", connections)
+
+    def _build_request(self, prompt: str, max_tokens: int):
         headers = {'Content-Type': 'application/json'}
         data = {
             "contents": [{
@@ -47,16 +133,36 @@ class GeminiGenerator(LLMGenerator):
                 "maxOutputTokens": max_tokens
             }
         }
-        
+        return headers, data
+
+    def _usage(self, result: dict):
+        meta = result.get('usageMetadata')
+        if not meta:
+            return None
+        return (
+            meta.get('promptTokenCount', 0),
+            meta.get('cachedContentTokenCount', 0),
+            meta.get('candidatesTokenCount', 0)
+        )
+
+    def _parse_result(self, result: dict) -> str:
+        if 'candidates' in result and result['candidates']:
+            return result['candidates'][0]['content']['parts'][0]['text']
+        else:
+            print(f"Unexpected response format: {result}")
+            return ""
+
+    def generate(self, prompt: str, max_tokens: int = 8192) -> str:
+        headers, data = self._build_request(prompt, max_tokens)
+
         try:
-            response = self.requests.post(self.url, headers=headers, json=data)
+            token_bucket.acquire(self._rate_costs(prompt))
+            started = time.time()
+            with self.limiter.slot(str(max_tokens)) as call:
+                response = self.session.post(self.url, headers=headers, json=data)
+                call.observe(response.status_code)
             response.raise_for_status()
-            result = response.json()
-            if 'candidates' in result and result['candidates']:
-                return result['candidates'][0]['content']['parts'][0]['text']
-            else:
-                print(f"Unexpected response format: {result}")
-                return ""
+            return self._finish(prompt, response.json(), started)
         except Exception as e:
             print(f"Error generating content: {e}")
             if 'response' in locals():
@@ -64,16 +170,60 @@ class GeminiGenerator(LLMGenerator):
                  print(f"Response Text: {response.text}")
             return ""
 
-class GeminiFlashGenerator(LLMGenerator):
+    async def agenerate(self, prompt: str, max_tokens: int = 8192) -> str:
+        headers, data = self._build_request(prompt, max_tokens)
+
+        try:
+            client = get_async_client("gemini")
+            await token_bucket.aacquire(self._rate_costs(prompt))
+            started = time.time()
+            async with self.limiter.aslot(str(max_tokens)) as call:
+                response = await client.post(self.url, headers=headers, json=data)
+                call.observe(response.status_code)
+            response.raise_for_status()
+            return self._finish(prompt, response.json(), started)
+        except Exception as e:
+            print(f"Error generating content: {e}")
+            if 'response' in locals():
+                 print(f"Response Status: {response.status_code}")
+                 print(f"Response Text: {response.text}")
+            return ""
+
+    def stream(self, prompt: str, max_tokens: int = 8192) -> Iterator[str]:
+        headers, data = self._build_request(prompt, max_tokens)
+
+        try:
+            token_bucket.acquire(self._rate_costs(prompt))
+            chunks, usage = [], None
+            started = time.time()
+            with self.limiter.slot(str(max_tokens)) as call:
+                response = self.session.post(
+                    self.stream_url, headers=headers, json=data,
+                    stream=True, timeout=(10, self.stall_timeout)
+                )
+                call.observe(response.status_code)
+                response.raise_for_status()
+                for payload in _iter_sse(response):
+                    # Each event carries the running usage; the last one is final
+                    usage = self._usage(payload) or usage
+                    for candidate in payload.get('candidates', [])[:1]:
+                        for part in candidate.get('content', {}).get('parts', []):
+                            if part.get('text'):
+                                chunks.append(part['text'])
+                                yield part['text']
+            self._record_usage(prompt, usage, "".join(chunks), started)
+        except Exception as e:
+            print(f"Error streaming content: {e}")
+            return False
+
+class GeminiFlashGenerator(GeminiGenerator):
     """Ultra-fast Gemini 1.5 Flash for production speed"""
+    temperature = 0.7
+
     def __init__(self, api_key: str):
-        self.api_key = api_key
-        self.model_name = "gemini-1.5-flash"
-        import requests
-        self.requests = requests
-        self.url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.model_name}:generateContent?key={api_key}"
-        
-    def generate(self, prompt: str, max_tokens: int = 8192) -> str:
+        super().__init__(api_key, "gemini-1.5-flash")
+
+    def _build_request(self, prompt: str, max_tokens: int):
         headers = {'Content-Type': 'application/json'}
         data = {
             "contents": [{
@@ -81,21 +231,24 @@ class GeminiFlashGenerator(LLMGenerator):
             }],
             "generationConfig": {
                 "maxOutputTokens": max_tokens,
-                "temperature": 0.7,
+                "temperature": self.temperature,
                 "topP": 0.95,
                 "topK": 40
             }
         }
-        
+        return headers, data
+
+    def generate(self, prompt: str, max_tokens: int = 8192) -> str:
+        headers, data = self._build_request(prompt, max_tokens)
+
         try:
-            response = self.requests.post(self.url, headers=headers, json=data, timeout=30)
+            token_bucket.acquire(self._rate_costs(prompt))
+            started = time.time()
+            with self.limiter.slot(str(max_tokens)) as call:
+                response = self.session.post(self.url, headers=headers, json=data, timeout=30)
+                call.observe(response.status_code)
             response.raise_for_status()
-            result = response.json()
-            if 'candidates' in result and result['candidates']:
-                return result['candidates'][0]['content']['parts'][0]['text']
-            else:
-                print(f"Unexpected response format: {result}")
-                return ""
+            return self._finish(prompt, response.json(), started)
         except Exception as e:
             print(f"Error generating content: {e}")
             if 'response' in locals():
@@ -105,14 +258,21 @@ class GeminiFlashGenerator(LLMGenerator):
 
 
 class DeepSeekGenerator(LLMGenerator):
+    provider = "deepseek"
+    system_prompt = "You are a helpful academic assistant."
+    temperature = 0.7
+
     def __init__(self, api_key: str, model_name: str):
         self.api_key = api_key
         self.model_name = model_name
-        import requests
-        self.requests = requests
+        self.session = get_session("deepseek")
+        self.limiter = get_limiter("deepseek")
         self.url = "https://api.deepseek.com/chat/completions"
-        
-    def generate(self, prompt: str, max_tokens: int = 4000) -> str:
+
+    def warm_up(self, connections: int = 1):
+        prewarm("deepseek", "https://api.deepseek.com/", connections)
+
+    def _build_request(self, prompt: str, max_tokens: int):
         headers = {
             'Content-Type': 'application/json',
             'Authorization': f'Bearer {self.api_key}'
@@ -120,18 +280,38 @@ class DeepSeekGenerator(LLMGenerator):
         data = {
             "model": self.model_name,
             "messages": [
-                {"role": "system", "content": "You are a helpful academic assistant."},
+                {"role": "system", "content": self.system_prompt},
                 {"role": "user", "content": prompt}
             ],
             "max_tokens": max_tokens,
-            "temperature": 0.7
+            "temperature": self.temperature
         }
-        
+        return headers, data
+
+    def _usage(self, result: dict):
+        usage = result.get('usage')
+        if not usage:
+            return None
+        return (
+            usage.get('prompt_tokens', 0),
+            usage.get('prompt_cache_hit_tokens', 0),
+            usage.get('completion_tokens', 0)
+        )
+
+    def _parse_result(self, result: dict) -> str:
+        return result['choices'][0]['message']['content']
+
+    def generate(self, prompt: str, max_tokens: int = 4000) -> str:
+        headers, data = self._build_request(prompt, max_tokens)
+
         try:
-            response = self.requests.post(self.url, headers=headers, json=data)
+            token_bucket.acquire(self._rate_costs(prompt))
+            started = time.time()
+            with self.limiter.slot(str(max_tokens)) as call:
+                response = self.session.post(self.url, headers=headers, json=data)
+                call.observe(response.status_code)
             response.raise_for_status()
-            result = response.json()
-            return result['choices'][0]['message']['content']
+            return self._finish(prompt, response.json(), started)
         except Exception as e:
             print(f"Error generating content: {e}")
             if 'response' in locals():
@@ -139,15 +319,177 @@ class DeepSeekGenerator(LLMGenerator):
                  print(f"Response Text: {response.text}")
             return ""
 
-def get_generator(config: Config) -> LLMGenerator:
-    if config.PROVIDER == LLMProvider.MOCK:
+    def stream(self, prompt: str, max_tokens: int = 4000) -> Iterator[str]:
+        headers, data = self._build_request(prompt, max_tokens)
+        data["stream"] = True
+        data["stream_options"] = {"include_usage": True}
+
+        try:
+            token_bucket.acquire(self._rate_costs(prompt))
+            chunks, usage = [], None
+            started = time.time()
+            with self.limiter.slot(str(max_tokens)) as call:
+                response = self.session.post(
+                    self.url, headers=headers, json=data,
+                    stream=True, timeout=(10, self.stall_timeout)
+                )
+                call.observe(response.status_code)
+                response.raise_for_status()
+                for payload in _iter_sse(response):
+                    # The final event (with no choices) carries the usage
+                    usage = self._usage(payload) or usage
+                    for choice in payload.get('choices', [])[:1]:
+                        text = choice.get('delta', {}).get('content')
+                        if text:
+                            chunks.append(text)
+                            yield text
+            self._record_usage(prompt, usage, "".join(chunks), started)
+        except Exception as e:
+            print(f"Error streaming content: {e}")
+            return False
+
+    async def agenerate(self, prompt: str, max_tokens: int = 4000) -> str:
+        headers, data = self._build_request(prompt, max_tokens)
+
+        try:
+            client = get_async_client("deepseek")
+            await token_bucket.aacquire(self._rate_costs(prompt))
+            started = time.time()
+            async with self.limiter.aslot(str(max_tokens)) as call:
+                response = await client.post(self.url, headers=headers, json=data)
+                call.observe(response.status_code)
+            response.raise_for_status()
+            return self._finish(prompt, response.json(), started)
+        except Exception as e:
+            print(f"Error generating content: {e}")
+            if 'response' in locals():
+                 print(f"Response Status: {response.status_code}")
+                 print(f"Response Text: {response.text}")
+            return ""
+
+class GeneratorWrapper(LLMGenerator):
+    """Base for generators that wrap another generator (caching, coalescing, ...)."""
+
+    def __init__(self, generator: LLMGenerator):
+        self.generator = generator
+
+    def __getattr__(self, name):
+        # Expose limiter, session, etc. of the wrapped generator
+        return getattr(self.generator, name)
+
+    # Class-level defaults on LLMGenerator would hide the wrapped values from __getattr__
+    provider = property(lambda self: self.generator.provider)
+    model_name = property(lambda self: self.generator.model_name)
+    system_prompt = property(lambda self: self.generator.system_prompt)
+    temperature = property(lambda self: self.generator.temperature)
+    stall_timeout = property(lambda self: self.generator.stall_timeout)
+
+    def generate(self, prompt: str, max_tokens: int = None) -> str:
+        return self.generator.generate(prompt, max_tokens or default_max_tokens(self.generator))
+
+    async def agenerate(self, prompt: str, max_tokens: int = None) -> str:
+        return await self.generator.agenerate(prompt, max_tokens or default_max_tokens(self.generator))
+
+    def stream(self, prompt: str, max_tokens: int = None) -> Iterator[str]:
+        return self.generator.stream(prompt, max_tokens or default_max_tokens(self.generator))
+
+    def warm_up(self, connections: int = 1):
+        self.generator.warm_up(connections)
+
+def default_max_tokens(generator: LLMGenerator) -> int:
+    """The max_tokens a generator uses when the caller doesn't pass one (for wrappers)."""
+    default = inspect.signature(generator.generate).parameters['max_tokens'].default
+    if default is None and 'generator' in vars(generator):
+        # Wrappers defer to the generator they wrap
+        return default_max_tokens(generator.generator)
+    return default
+
+def _iter_sse(response) -> Iterator[dict]:
+    """Parse a Server-Sent-Events response into JSON payloads.
+
+    The read timeout on the request applies to each socket read, so a
+    stream that stops sending raises instead of hanging until the end.
+    """
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith('data:'):
+            continue
+        payload = line[len('data:'):].strip()
+        if payload == '[DONE]':
+            break
+        try:
+            yield json.loads(payload)
+        except ValueError:
+            continue
+
+def _create_generator(provider: LLMProvider, api_key: str, model_name: str) -> LLMGenerator:
+    if provider == LLMProvider.MOCK:
         return MockGenerator()
-    elif config.PROVIDER == LLMProvider.GEMINI:
-        return GeminiGenerator(config.API_KEY, config.MODEL_NAME)
-    elif config.PROVIDER == LLMProvider.GEMINI_FLASH:
-        return GeminiFlashGenerator(config.API_KEY)
-    elif config.PROVIDER == LLMProvider.DEEPSEEK:
-        return DeepSeekGenerator(config.API_KEY, config.MODEL_NAME)
+    elif provider == LLMProvider.GEMINI:
+        return GeminiGenerator(api_key, model_name)
+    elif provider == LLMProvider.GEMINI_FLASH:
+        return GeminiFlashGenerator(api_key)
+    elif provider == LLMProvider.DEEPSEEK:
+        return DeepSeekGenerator(api_key, model_name)
     else:
-        raise ValueError(f"Unsupported provider: {config.PROVIDER}")
+        raise ValueError(f"Unsupported provider: {provider}")
 
+def find_wrapper(generator: LLMGenerator, wrapper_class):
+    """Return the wrapper of the given class in a generator chain, or None."""
+    while generator is not None:
+        if isinstance(generator, wrapper_class):
+            return generator
+        generator = vars(generator).get('generator')
+    return None
+
+def get_generator(config: Config) -> LLMGenerator:
+    generator = _create_generator(config.PROVIDER, config.API_KEY, config.MODEL_NAME)
+    
+    generator.stall_timeout = getattr(config, 'STREAM_STALL_TIMEOUT', LLMGenerator.stall_timeout)
+    token_bucket.configure(getattr(config, 'RATE_LIMITS', None) or {})
+    api_generators = [generator]  # Every generator that makes API calls, for the scheduler
+    
+    routes = getattr(config, 'ROUTES', None)
+    if routes:
+        from .model_router import RoutedGenerator
+        routed = {}
+        for call_site, spec in routes.items():
+            routed[call_site] = _create_generator(
+                spec.get('provider', config.PROVIDER),
+                spec.get('api_key', config.API_KEY),
+                spec.get('model', config.MODEL_NAME)
+            )
+            routed[call_site].stall_timeout = generator.stall_timeout
+            api_generators.append(routed[call_site])
+        generator = RoutedGenerator(generator, routed)
+    
+    if getattr(config, 'HEDGING', False):
+        from .hedging import HedgedGenerator
+        alternate = None
+        if getattr(config, 'HEDGE_PROVIDER', None):
+            alternate = _create_generator(config.HEDGE_PROVIDER, config.HEDGE_API_KEY, config.HEDGE_MODEL_NAME)
+            alternate.stall_timeout = generator.stall_timeout
+            api_generators.append(alternate)
+        generator = HedgedGenerator(generator, alternate, getattr(config, 'HEDGE_PERCENTILE', 0.95))
+    
+    # Every call waits for a fair slot in the process-wide scheduler; the global
+    # in-flight limit follows the adaptive limits of every provider in use
+    # (routed call sites and the hedge alternate included)
+    from .scheduler import ScheduledGenerator, get_scheduler
+    for api_generator in api_generators:
+        get_scheduler().add_limiter(limiter_for(api_generator))
+    generator = ScheduledGenerator(generator)
+    
+    # Concurrent identical prompts share one API call
+    from .single_flight import SingleFlightGenerator
+    generator = SingleFlightGenerator(generator)
+    
+    if getattr(config, 'RESPONSE_CACHE', False):
+        from .response_cache import CachedGenerator, get_response_cache
+        cache = get_response_cache(
+            getattr(config, 'RESPONSE_CACHE_FILE', "output/.llm_cache.sqlite3"),
+            getattr(config, 'RESPONSE_CACHE_MAX_MB', 200),
+            getattr(config, 'RESPONSE_CACHE_TTL_DAYS', 30)
+        )
+        generator = CachedGenerator(generator, cache)
+    
+    return generator
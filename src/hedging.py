@@ -0,0 +1,173 @@
+"""
+Hedging - Duplicate slow LLM calls to cut tail latency
+
+Latencies are learned per prompt class (max_tokens, so planning calls and
+long prose are tracked separately). Once a call runs past the learned
+percentile for its class, a duplicate is sent to the same or an alternate
+generator and whichever answers first wins. The losing async task is
+cancelled; a losing sync HTTP call cannot be interrupted, so its result is
+discarded when it arrives.
+"""
+import asyncio
+import contextvars
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Optional
+from src.config import Config
+from src.generator import LLMGenerator, GeneratorWrapper, default_max_tokens
+from src.token_bucket import estimate_tokens
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def get_hedge_executor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool shared by every HedgedGenerator (created on first use).
+
+    Calls are already bounded by the scheduler, so two threads per allowed
+    call (primary and hedge) is enough; abandoned calls finish in the background.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2 * getattr(Config, 'MAX_CONCURRENCY', 20),
+                                           thread_name_prefix="hedge")
+        return _executor
+
+class HedgedGenerator(GeneratorWrapper):
+    def __init__(self, generator: LLMGenerator, alternate: LLMGenerator = None,
+                 percentile: float = 0.95, min_samples: int = 20, window: int = 200):
+        """
+        Initialize the hedging wrapper.
+
+        Args:
+            generator: Primary generator
+            alternate: Generator for hedge calls (defaults to the primary)
+            percentile: Latency percentile after which a call is hedged
+            min_samples: Calls to observe per prompt class before hedging starts
+            window: Recent latencies kept per prompt class
+        """
+        super().__init__(generator)
+        self.alternate = alternate or generator
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.latencies: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self.lock = threading.Lock()
+        self.executor = get_hedge_executor()
+        self.stats = {
+            'calls': 0,
+            'hedged': 0,
+            'hedge_wins': 0,
+            'saved_seconds': 0.0,
+            'extra_tokens': 0
+        }
+
+    def _threshold(self, kind: str) -> Optional[float]:
+        """Learned latency percentile for a prompt class (None until enough samples)."""
+        with self.lock:
+            samples = sorted(self.latencies[kind])
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * self.percentile))]
+
+    def _observe(self, kind: str, latency: float):
+        with self.lock:
+            self.latencies[kind].append(latency)
+
+    def _count(self, **deltas):
+        with self.lock:
+            for name, delta in deltas.items():
+                self.stats[name] += delta
+
+    def generate(self, prompt: str, max_tokens: int = None) -> str:
+        max_tokens = max_tokens or default_max_tokens(self.generator)
+        kind = str(max_tokens)
+        threshold = self._threshold(kind)
+        self._count(calls=1)
+
+        if threshold is None:
+            started = time.time()
+            result = self.generator.generate(prompt, max_tokens)
+            self._observe(kind, time.time() - started)
+            return result
+
+        started = time.time()
+        # Copy the caller's context so usage keeps its cost labels
+        primary = self.executor.submit(contextvars.copy_context().run, self.generator.generate, prompt, max_tokens)
+        primary.add_done_callback(lambda f: self._observe(kind, time.time() - started))
+
+        done, _ = wait([primary], timeout=threshold)
+        if done:
+            return primary.result()
+
+        # Primary is in the tail: race a duplicate against it
+        self._count(hedged=1, extra_tokens=estimate_tokens(self.system_prompt + prompt))
+        hedge = self.executor.submit(contextvars.copy_context().run, self.alternate.generate, prompt, max_tokens)
+        done, _ = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        winner = primary if primary in done else hedge
+        loser = hedge if winner is primary else primary
+        won_at = time.time()
+
+        if winner is hedge:
+            self._count(hedge_wins=1)
+            # Saved time is known once the abandoned primary finally returns
+            loser.add_done_callback(lambda f: self._count(saved_seconds=time.time() - won_at))
+
+        # The loser's output tokens are paid for even though the text is thrown away
+        loser.add_done_callback(lambda f: self._count(
+            extra_tokens=estimate_tokens(f.result()) if not f.cancelled() and f.exception() is None else 0
+        ))
+        loser.cancel()
+        return winner.result()
+
+    async def agenerate(self, prompt: str, max_tokens: int = None) -> str:
+        max_tokens = max_tokens or default_max_tokens(self.generator)
+        kind = str(max_tokens)
+        threshold = self._threshold(kind)
+        self._count(calls=1)
+
+        started = time.time()
+        primary = asyncio.ensure_future(self.generator.agenerate(prompt, max_tokens))
+        if threshold is None:
+            result = await primary
+            self._observe(kind, time.time() - started)
+            return result
+
+        done, _ = await asyncio.wait([primary], timeout=threshold)
+        if done:
+            self._observe(kind, time.time() - started)
+            return primary.result()
+
+        self._count(hedged=1, extra_tokens=estimate_tokens(self.system_prompt + prompt))
+        hedge = asyncio.ensure_future(self.alternate.agenerate(prompt, max_tokens))
+        try:
+            done, _ = await asyncio.wait([primary, hedge], return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            primary.cancel()
+            hedge.cancel()
+            raise
+
+        winner = primary if primary in done else hedge
+        loser = hedge if winner is primary else primary
+        loser.cancel()
+
+        # A cancelled primary's latency is at least what it had run for
+        self._observe(kind, time.time() - started)
+        if winner is hedge:
+            self._count(hedge_wins=1)
+        return winner.result()
+
+    def get_stats(self) -> Dict:
+        """Get hedging counters."""
+        with self.lock:
+            return dict(self.stats)
+
+    def print_summary(self):
+        """Print hedging statistics."""
+        stats = self.get_stats()
+        print(f"\n🏁 Hedged Requests:")
+        print(f"   Calls: {stats['calls']:,} | Hedged: {stats['hedged']:,} | Hedge won: {stats['hedge_wins']:,}")
+        print(f"   Tail latency saved: {stats['saved_seconds']:.1f}s (measured on abandoned calls)")
+        print(f"   Extra tokens spent: ~{stats['extra_tokens']:,}")
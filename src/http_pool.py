@@ -0,0 +1,144 @@
+"""
+HTTP Pool - Shared keep-alive sessions for every LLM and search provider
+
+Pools are sized to the most calls a provider can have in flight (its
+adaptive limiter's maximum, capped by MAX_IN_FLIGHT), so no call ever waits
+for or discards a connection. Sessions are closed at interpreter exit.
+"""
+import asyncio
+import atexit
+import threading
+from typing import Dict, Tuple
+
+_sessions: Dict[str, object] = {}
+_async_clients: Dict[Tuple[str, int], object] = {}
+_lock = threading.Lock()
+
+def default_pool_size(provider: str) -> int:
+    """
+    Connections needed for the most calls an LLM provider can have in flight.
+
+    Creates the provider's adaptive limiter, so callers for non-LLM providers
+    (search APIs) pass an explicit pool_size instead.
+    """
+    from src.adaptive_limiter import get_limiter
+    try:
+        from src.config import Config
+    except ImportError:
+        Config = None
+
+    size = get_limiter(provider).max_limit
+    max_in_flight = getattr(Config, 'MAX_IN_FLIGHT', None)
+    return max(1, min(size, max_in_flight) if max_in_flight else size)
+
+def get_session(provider: str, pool_size: int = None):
+    """
+    Get the shared requests.Session for a provider.
+
+    One session is created per provider and reused by every generator,
+    so TCP/TLS connections stay open between calls instead of being
+    re-established for each subsection.
+
+    Args:
+        provider: Provider key (e.g. 'deepseek', 'gemini', 'semantic_scholar')
+        pool_size: Maximum number of pooled connections to the provider
+                   (default: default_pool_size(provider); required for non-LLM providers)
+
+    Returns:
+        requests.Session with a connection pool mounted for https
+    """
+    with _lock:
+        session = _sessions.get(provider)
+        if session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size or default_pool_size(provider),
+                                  pool_block=False)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            if not _sessions:
+                atexit.register(close_all)
+            _sessions[provider] = session
+        return session
+
+def get_async_client(provider: str, pool_size: int = None):
+    """
+    Get the shared httpx.AsyncClient for a provider on the running event loop.
+
+    Clients are bound to the loop that created them, so one client is kept
+    per (provider, loop). HTTP/2 is used when the optional 'h2' package is
+    installed, letting many concurrent requests share a single connection.
+
+    Args:
+        provider: Provider key (e.g. 'deepseek', 'gemini')
+        pool_size: Maximum number of connections to the provider
+                   (default: default_pool_size(provider))
+
+    Returns:
+        httpx.AsyncClient
+    """
+    loop = asyncio.get_running_loop()
+    key = (provider, id(loop))
+    with _lock:
+        client = _async_clients.get(key)
+        if client is None or client.is_closed:
+            import httpx
+
+            try:
+                import h2  # noqa: F401
+                http2 = True
+            except ImportError:
+                http2 = False
+
+            pool_size = pool_size or default_pool_size(provider)
+            client = httpx.AsyncClient(
+                http2=http2,
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+                timeout=httpx.Timeout(300.0, connect=10.0),
+            )
+            _async_clients[key] = client
+        return client
+
+async def aclose_all():
+    """Close the async clients owned by the running event loop."""
+    loop_id = id(asyncio.get_running_loop())
+    with _lock:
+        keys = [key for key in _async_clients if key[1] == loop_id]
+        clients = [_async_clients.pop(key) for key in keys]
+    for client in clients:
+        await client.aclose()
+
+def prewarm(provider: str, url: str, connections: int = 1):
+    """
+    Open connections to a provider ahead of the first real call.
+
+    Any HTTP response (even 404/405) means the TLS handshake is done and
+    the socket is back in the pool, so errors are deliberately ignored.
+
+    Args:
+        provider: Provider key used with get_session
+        url: Any URL on the provider's host
+        connections: Number of connections to open in parallel
+    """
+    session = get_session(provider)
+
+    def _touch():
+        try:
+            session.head(url, timeout=10)
+        except Exception:
+            pass
+
+    threads = [threading.Thread(target=_touch, daemon=True) for _ in range(max(1, connections))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+def close_all():
+    """Close every pooled session (call on shutdown)."""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
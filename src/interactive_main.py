@@ -6,20 +6,31 @@ import sys
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from src.config import Config
-from src.generator import get_generator
-from src.syllabus_parser import parse_syllabus
+from src.generator import get_generator, find_wrapper
+from src.syllabus_parser import load_syllabus
 from src.master_command_generator import generate_master_command
-from src.textbook_planner import expand_section_to_topics, expand_topic_to_subsections
+from src.textbook_planner import expand_section_to_topics, expand_topic_to_subsections, plan_section_structured
 from src.textbook_writer import write_section_introduction, write_subsection, write_section_summary
 from src.outline_input import interactive_outline_input
 from src.quality_control import check_quality, print_quality_report
 from src.cost_tracker import cost_tracker
 from src.export_manager import auto_export_all
-from src.resume_manager import resume_manager
+from src.resume_manager import get_resume_manager
+from src.plan_store import get_plan_store
+from src.content_store import get_content_store
+from src.manifest import get_manifest, section_filename
 from src.parallel_generator import ParallelGenerator
 from src.model_switcher import switch_model, get_current_model, compare_costs
 from src.auto_notifier import AutoNotifier, load_notification_config
 from src.progress_tracker import progress_tracker
+from src.response_cache import CachedGenerator
+from src.hedging import HedgedGenerator
+from src.scheduler import get_scheduler
+from src.adaptive_limiter import limiter_for, feeder_workers
+from src.task_graph import TaskGraph, get_pool
+from src.ordered_writer import OrderedWriter
+from src.durable_io import commit_file
+from src.export_service import get_export_service
 
 def clear_screen():
     os.system('clear' if os.name != 'nt' else 'cls')
@@ -38,8 +49,7 @@ def show_menu(sections, config):
         section_title = section_info['section_title']
         
         # Check if already generated
-        filename = f"output/Section_{section_num}_{section_title.replace(' ', '_')}.md"
-        status = "✅ DONE" if os.path.exists(filename) else "⏳ PENDING"
+        status = "✅ DONE" if get_manifest().is_complete(section_num, section_title) else "⏳ PENDING"
         
         print(f"  [{idx}] Section {section_num}: {section_title}")
         print(f"      Status: {status}")
@@ -64,46 +74,91 @@ def show_menu(sections, config):
     print("  [q]     Quit")
     print("\n" + "=" * 70)
 
-def generate_section(generator, section_info, section_idx, total_sections):
+def generate_section(generator, section_info, section_idx, total_sections, stream=True, output_dir="output",
+                     resume_policy=None, export_docx=True, cancel=None):
+    """
+    Generate one section into output_dir.
+    
+    Args:
+        resume_policy: What to do with partial progress or an existing file:
+                       "resume" (keep finished work, skip complete sections), "restart"
+                       (discard it) or "skip" (leave the section alone).
+                       None asks on stdin (interactive menus only).
+        export_docx: Convert the finished markdown to DOCX
+        cancel: threading.Event; when set, the section stops after the pieces in
+                flight (finished text is kept, so it resumes later)
+    
+    Returns:
+        Dict with section, status ('completed', 'skipped' or 'cancelled'), filename, words, seconds
+    """
+    interactive = resume_policy is None
+    started = time.time()
     chapter = section_info['chapter']
     section_num = section_info['section_number']
     section_title = section_info['section_title']
     
+    # Each output root (e.g. one batch outline) has its own file, resume state, plans and text
+    resume_manager = get_resume_manager(output_dir)
+    plan_store = get_plan_store(output_dir)
+    content_store = get_content_store(output_dir)
+    manifest = get_manifest(output_dir)
+    
     print(f"\n{'='*70}")
     print(f"📝 Generating Section {section_idx}/{total_sections}: {section_title}")
     print(f"{'='*70}\n")
     
+    os.makedirs(output_dir, exist_ok=True)
+    filename = section_filename(output_dir, section_num, section_title)
+    
+    def result(status, words=0):
+        return {'section': section_num, 'status': status, 'filename': filename,
+                'words': words, 'seconds': round(time.time() - started, 1)}
+    
+    if cancel is not None and cancel.is_set():
+        return result('cancelled')
+    
     # Check if section can be resumed
     resume_point = resume_manager.get_resume_point(section_num)
     if resume_point:
         print(f"⚠️  Found partial progress for this section!")
         print(f"   Completed: {len(resume_point['completed_subsections'])} subsections")
-        response = input("\n[r] Resume from where you left off\n[s] Start fresh (delete progress)\n[c] Cancel\n\nYour choice: ").strip().lower()
+        if interactive:
+            response = input("\n[r] Resume from where you left off\n[s] Start fresh (delete progress)\n[c] Cancel\n\nYour choice: ").strip().lower()
+        else:
+            response = {'restart': 's', 'skip': 'c'}.get(resume_policy, 'r')
         
         if response == 'c':
             print("❌ Cancelled.")
-            return
+            return result('cancelled' if interactive else 'skipped')
         elif response == 's':
             resume_manager.clear_section(section_num)
+            plan_store.invalidate(section_num)
+            content_store.clear(section_num)
             resume_point = None
             print("✅ Progress cleared. Starting fresh...")
         else:
             print("✅ Resuming from last checkpoint...")
     
-    # Create output file
-    filename = f"output/Section_{section_num}_{section_title.replace(' ', '_')}.md"
-    
     # Check if file exists and no resume point
     if os.path.exists(filename) and not resume_point:
         print(f"⚠️  Section already exists: {filename}")
-        response = input("\nOverwrite? (y/n): ").strip().lower()
+        if interactive:
+            response = input("\nOverwrite? (y/n): ").strip().lower()
+        else:
+            response = 'y' if resume_policy == 'restart' else 'n'
         if response != 'y':
-            print("❌ Cancelled.")
-            return
+            print("❌ Cancelled." if interactive else "⏭️  Skipped (already complete).")
+            return result('cancelled' if interactive else 'skipped')
+        # Overwriting means new content, so stored text, plan and index entry are dropped too
+        plan_store.invalidate(section_num)
+        content_store.clear(section_num)
+        manifest.remove(section_num)
     
-    # Open file for real-time writing
-    with open(filename, 'w', encoding='utf-8') as f:
-        print(f"  📄 Created file: {filename}")
+    # Open file for real-time writing (API usage is attributed to this section). It is
+    # written as .partial and renamed when complete, so a section file is never truncated
+    partial = filename + ".partial"
+    with open(partial, 'w', encoding='utf-8') as f, cost_tracker.scope(section=section_num):
+        print(f"  📄 Created file: {partial}")
         print(f"  ⏱️  You can open this file now to watch progress!\n")
         
         # Write header
@@ -114,163 +169,210 @@ def generate_section(generator, section_info, section_idx, total_sections):
         f.flush()
         
         
+        # The whole section is one task graph on the shared worker pool:
+        #   topics -> intro, summary, subsections:<topic> -> write:<topic>.<subsection>
+        # A slow subsection only holds up its own place in the file, never the workers
+        pool = get_pool("llm", limiter_for(generator).max_limit)
+        graph = TaskGraph(pool)
+        section_start_time = time.time()
+        totals = {'words': 0, 'pieces': 0}
+        
+        # Meters are created when a node starts so time-to-first-token excludes queueing
+        def meter():
+            return progress_tracker.stream_meter(section_num) if stream else None
+        
+        def write_live(record):
+            def on_chunk(chunk):
+                f.write(chunk)
+                f.flush()
+                record(chunk)
+            return on_chunk
+        
+        def commit(key, value):
+            # Runs (in document order) as soon as everything before `key` is in the file,
+            # so the file and the resume state never lag behind finished work.
+            # Pieces finishing after a cancel are only kept in the content store
+            if f.closed:
+                return
+            if key == "intro":
+                intro, streamed = value
+                if not streamed:
+                    f.write(intro)
+                f.write("\n\n")
+                f.flush()
+                words = len(intro.split())
+                totals['words'] += words
+                totals['pieces'] += 1
+                progress_tracker.complete_subsection(section_num, words)
+                print(f"         ✅ Introduction complete (~{words} words)")
+            elif key == "summary":
+                f.write(f"### Summary and Reflection\n\n")
+                f.write(value + "\n\n")
+                f.flush()
+                words = len(value.split())
+                totals['words'] += words
+                progress_tracker.complete_subsection(section_num, words)
+                print(f"         ✅ Summary complete (~{words} words)")
+            elif key[0] == "topic":
+                topic_idx = key[1]
+                topic, skipped = value
+                print(f"\n      📚 Topic {topic_idx}/{len(topics)}: {topic.title}")
+                f.write(f"### {section_num}.{topic_idx} {topic.title}\n\n")
+                f.flush()
+                for _, subsection in skipped:
+                    print(f"         ⏭️  Skipped: {subsection}")
+            elif key[0] == "topic_end":
+                resume_manager.complete_topic(section_num, key[1])
+            else:
+                _, topic_idx, subsection_idx, subsection = key
+                f.write(f"#### {section_num}.{topic_idx}.{subsection_idx} {subsection}\n\n")
+                f.write(value + "\n\n")
+                f.flush()
+                
+                words = len(value.split())
+                totals['words'] += words
+                totals['pieces'] += 1
+                
+                # Mark as completed
+                resume_manager.complete_subsection(section_num, topic_idx, subsection_idx)
+                progress_tracker.update_subsection(section_num, subsection)
+                progress_tracker.complete_subsection(section_num, words)
+                
+                elapsed = time.time() - section_start_time
+                print(f"         ✅ [{totals['pieces']}] {subsection[:50]}... ({words} words) | {int(elapsed)}s elapsed")
+        
+        def add(name, fn, *args, deps=()):
+            # Any failed node aborts the section instead of leaving a hole in the file
+            future = graph.add(name, fn, *args, deps=deps)
+            future.add_done_callback(
+                lambda done: writer.fail(done.exception()) if not done.cancelled() and done.exception() else None
+            )
+            return future
+        
+        def write_intro():
+            # The introduction streams straight into the file: nothing else is committed until it's done
+            intro = content_store.get(section_num, "introduction")
+            if intro is not None:
+                writer.put("intro", (intro, False))
+                return intro
+            if stream:
+                intro = write_section_introduction(generator, section_title, topics, on_chunk=write_live(meter()))
+            else:
+                intro = write_section_introduction(generator, section_title, topics)
+            content_store.put(section_num, "introduction", intro)
+            writer.put("intro", (intro, stream))
+            return intro
+        
+        def write_one(key, topic_idx, subsection_idx, topic, subsection):
+            # Subsections finish out of order, so only their stats stream live;
+            # the text is stored as soon as it exists so a crash can't lose it
+            content = write_subsection(generator, section_title, topic.title, subsection,
+                                       target_words=1000, on_chunk=meter())
+            content_store.put(section_num, key, content)
+            writer.put(("subsection", topic_idx, subsection_idx, subsection), content)
+            return content
+        
+        def write_summary():
+            summary = content_store.get(section_num, "summary")
+            if summary is None:
+                summary = write_section_summary(generator, section_title, topics, on_chunk=meter())
+                content_store.put(section_num, "summary", summary)
+            writer.put("summary", summary)
+            return summary
+        
+        def plan_topics():
+            # A stored plan is reused so resume keys keep pointing at the same content
+            topics = plan_store.get(section_num, section_title, chapter)
+            if topics:
+                print(f"        ♻️  Reusing stored plan for section {section_num}")
+                return topics
+            # Structured mode plans topics and subsections in one call
+            if getattr(Config, 'PLANNER_MODE', "per_topic") == "structured":
+                topics = plan_section_structured(generator, section_title)[0]
+            else:
+                topics = expand_section_to_topics(generator, section_title)
+            plan_store.save(section_num, section_title, topics, chapter)
+            return topics
+        
+        def plan_topic(topic_idx, topic):
+            if not topic.subsections:
+                topic.subsections = expand_topic_to_subsections(generator, section_title, topic)
+                plan_store.save_topic(section_num, section_title, topic_idx, topic.subsections, chapter)
+            progress_tracker.add_subsections(section_num, len(topic.subsections))
+            
+            # Finished text (e.g. from an interrupted run) is assembled from the store;
+            # completed subsections with no stored text (older runs) are skipped
+            stored, pending, skipped = {}, [], []
+            for subsection_idx, subsection in enumerate(topic.subsections, 1):
+                key = content_store.subsection_key(topic_idx, subsection_idx, topic.title, subsection)
+                content = content_store.get(section_num, key)
+                if content is not None:
+                    stored[(subsection_idx, subsection)] = content
+                elif resume_manager.is_subsection_completed(section_num, topic_idx, subsection_idx):
+                    skipped.append((subsection_idx, subsection))
+                else:
+                    pending.append((key, subsection_idx, subsection))
+            
+            writer.expect(
+                [("subsection", topic_idx, subsection_idx, subsection)
+                 for subsection_idx, subsection in enumerate(topic.subsections, 1)
+                 if (subsection_idx, subsection) not in skipped]
+                + [("topic_end", topic_idx)],
+                after=("topic", topic_idx)
+            )
+            for key, subsection_idx, subsection in pending:
+                add(f"write:{topic_idx}.{subsection_idx}", write_one, key, topic_idx, subsection_idx, topic, subsection)
+            writer.put(("topic", topic_idx), (topic, skipped))
+            for (subsection_idx, subsection), content in stored.items():
+                writer.put(("subsection", topic_idx, subsection_idx, subsection), content)
+            writer.put(("topic_end", topic_idx))
+            return topic.subsections
+        
         # Step 1: Expand to topics
         print(f"  [1/4] 🔍 Planning content structure...")
         print(f"        🤖 AI is analyzing '{section_title}' and creating topics...")
         start_time = time.time()
-        topics = expand_section_to_topics(generator, section_title)
-        elapsed = time.time() - start_time
-        
-        # Mark section as started
-        resume_manager.start_section(section_num, section_title, len(topics))
-        
-        # Step 2: Expand topics to subsections
-        print(f"        🤖 AI is creating subsections for each topic...")
-        for topic in topics:
-            subsections = expand_topic_to_subsections(generator, section_title, topic)
-            topic.subsections = subsections
-        total_subsections = sum(len(t.subsections) for t in topics)
-        print(f"        ✅ Structure ready ({len(topics)} topics, {total_subsections} subsections) - took {int(elapsed)}s")
-        
-        # Initialize Progress Tracker
-        progress_tracker.start_section(section_num, section_title, total_subsections + 2)
-
-        
-        # Step 3: Write content
-        print(f"  [2/4] ✍️  Writing content...\n")
-        
-        # Calculate total work
-        total_subsections = sum(len(t.subsections) for t in topics) + 2  # +2 for intro and summary
-        completed_subsections = 0
-        section_start_time = time.time()
-        
-        # Introduction
-        print(f"      📝 [0/{total_subsections}] Writing introduction...")
-        
-        # Update Progress Tracker
-        progress_tracker.update_subsection(section_num, "Introduction")
-        
-        intro = write_section_introduction(generator, section_title, topics)
-        f.write(intro + "\n\n")
-        f.flush()
-        word_count = len(intro.split())
-        completed_subsections += 1
-        
-        # Update Progress Tracker
-        progress_tracker.complete_subsection(section_num, word_count)
-        
-        elapsed = time.time() - section_start_time
-        avg_time_per_part = elapsed / completed_subsections
-        remaining_parts = total_subsections - completed_subsections
-        est_remaining = int(avg_time_per_part * remaining_parts / 60)
-        print(f"         ✅ Introduction complete (~{len(intro.split())} words) | Progress: {int(completed_subsections/total_subsections*100)}% | Est. remaining: ~{est_remaining}min")
-        
-        # Write each topic and its subsections
-        
-        for topic_idx, topic in enumerate(topics, 1):
-            print(f"\n      📚 Topic {topic_idx}/{len(topics)}: {topic.title}")
-            f.write(f"### {section_num}.{topic_idx} {topic.title}\n\n")
-            f.flush()
+        try:
+            topics = graph.add("topics", plan_topics).result()
+            elapsed = time.time() - start_time
             
-            # Generate subsections in parallel (3 at a time for speed)
-            def generate_single_subsection(subsection_idx, subsection):
-                # Check if already completed
-                if resume_manager.is_subsection_completed(section_num, topic_idx, subsection_idx):
-                    return {
-                        'idx': subsection_idx,
-                        'title': subsection,
-                        'content': None,
-                        'skipped': True
-                    }
-                
-                # Track input tokens
-                prompt_estimate = f"{section_title} {topic.title} {subsection}"
-                cost_tracker.estimate_tokens(prompt_estimate, is_input=True)
-                
-                # Generate content
-                subsection_content = write_subsection(
-                    generator,
-                    section_title,
-                    topic.title,
-                    subsection,
-                    target_words=1000
-                )
-                
-                # Track output tokens
-                cost_tracker.estimate_tokens(subsection_content, is_input=False)
-                
-                return {
-                    'idx': subsection_idx,
-                    'title': subsection,
-                    'content': subsection_content,
-                    'skipped': False
-                }
+            # Mark section as started
+            resume_manager.start_section(section_num, section_title, len(topics))
+            progress_tracker.start_section(section_num, section_title, 2)
             
+            # Each topic's subsections are inserted after its heading once it is planned
+            writer = OrderedWriter(
+                ["intro"] + [("topic", topic_idx) for topic_idx in range(1, len(topics) + 1)] + ["summary"],
+                commit
+            )
             
-            # Generate subsections in parallel
-            # Use 10 workers for Gemini Flash (ultra-fast), 3 for others
-            from src.config import LLMProvider
-            max_workers = 10 if hasattr(generator, 'model_name') and 'flash' in generator.model_name.lower() else 3
+            print(f"        ✅ {len(topics)} topics ready - took {int(elapsed)}s")
             
-            subsection_results = []
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = {
-                    executor.submit(generate_single_subsection, idx, sub): (idx, sub)
-                    for idx, sub in enumerate(topic.subsections, 1)
-                }
-                
-                # Collect results as they complete
-                for future in as_completed(futures):
-                    idx, subsection = futures[future]
-                    try:
-                        result = future.result()
-                        subsection_results.append(result)
-                        
-                        if result['skipped']:
-                            print(f"         ⏭️  [{completed_subsections}/{total_subsections}] Skipped: {result['title']}")
-                        else:
-                            word_count += len(result['content'].split())
-                            completed_subsections += 1
-                            
-                            # Update time estimate
-                            elapsed = time.time() - section_start_time
-                            avg_time_per_part = elapsed / completed_subsections
-                            remaining_parts = total_subsections - completed_subsections
-                            est_remaining = int(avg_time_per_part * remaining_parts / 60)
-                            progress_pct = int(completed_subsections/total_subsections*100)
-                            
-                            # Update Progress Tracker
-                            progress_tracker.update_subsection(section_num, result['title'])
-                            progress_tracker.complete_subsection(section_num, len(result['content'].split()))
-                            
-                            print(f"         ✅ [{completed_subsections}/{total_subsections}] {result['title'][:50]}... ({len(result['content'].split())} words) | {progress_pct}% | ~{est_remaining}min left")
-                    
-                    except Exception as e:
-                        print(f"\n❌ Error generating subsection: {e}")
-                        raise
+            # Step 2: Expand topics to subsections (all topics at once; writing starts as each finishes)
+            print(f"        🤖 AI is creating subsections for each topic...")
+            print(f"  [2/4] ✍️  Writing content...\n")
+            print(f"      📝 Writing introduction...")
+            progress_tracker.update_subsection(section_num, "Introduction")
+            for topic_idx, topic in enumerate(topics, 1):
+                add(f"subsections:{topic_idx}", plan_topic, topic_idx, topic, deps=["topics"])
             
-            # Sort results by index and write to file in order
-            subsection_results.sort(key=lambda x: x['idx'])
-            for result in subsection_results:
-                if not result['skipped']:
-                    f.write(f"#### {section_num}.{topic_idx}.{result['idx']} {result['title']}\n\n")
-                    f.write(result['content'] + "\n\n")
-                    f.flush()
-                    
-                    # Mark as completed
-                    resume_manager.complete_subsection(section_num, topic_idx, result['idx'])
+            add("intro", write_intro, deps=["topics"])
+            add("summary", write_summary, deps=["topics"])
             
-            # Mark topic as completed
-            resume_manager.complete_topic(section_num, topic_idx)
-        
-        # Summary
-        print(f"\n      📝 Writing summary and reflection...")
-        summary = write_section_summary(generator, section_title, topics)
-        f.write(f"### Summary and Reflection\n\n")
-        f.write(summary + "\n\n")
-        f.flush()
-        word_count += len(summary.split())
-        print(f"         ✅ Summary complete (~{len(summary.split())} words)")
+            # Step 3: Workers append each piece as soon as everything before it is written
+            while not writer.wait(None if cancel is None else 0.5):
+                if cancel.is_set():
+                    graph.cancel()
+                    break
+        except Exception as e:
+            print(f"\n❌ Error generating section: {e}")
+            graph.cancel()
+            raise
+        if not writer.is_done():
+            # Cancelled: stored pieces and resume state are kept, the .partial file stays
+            print(f"\n  🛑 Section {section_num} cancelled ({totals['pieces']} pieces kept for resume)")
+            return result('cancelled', totals['words'])
+        word_count = totals['words']
         
         # Footer
         f.write("\n---\n\n")
@@ -279,23 +381,19 @@ def generate_section(generator, section_info, section_idx, total_sections):
         f.flush()
     
     # Mark section as completed
+    commit_file(partial, filename)
+    manifest.record_section(section_num, section_title, filename, word_count)
     resume_manager.complete_section(section_num)
+    progress_tracker.complete_section(section_num, word_count)
     
     print(f"\n  [4/4] ✅ Section {section_num} complete!")
     print(f"        📊 Total words: ~{word_count}")
     print(f"        📁 Saved to: {filename}\n")
     
-    # Auto-convert to DOCX
-    print(f"  [5/5] 📄 Creating professional DOCX...")
-    try:
-        from src.docx_generator import auto_convert_to_docx
-        docx_file = auto_convert_to_docx(filename)
-        if docx_file:
-            print(f"        ✅ DOCX created: {docx_file}")
-    except ImportError:
-        print(f"        ⚠️  Install python-docx: pip install python-docx")
-    except Exception as e:
-        print(f"        ⚠️  DOCX conversion failed: {e}")
+    # Auto-convert to DOCX in the background (this worker moves on to the next section)
+    if export_docx:
+        get_export_service().submit(filename, "docx", output_dir)
+        print(f"  [5/5] 📄 Professional DOCX queued for export")
     
     # Auto-notification
     notifier_config = load_notification_config()
@@ -303,11 +401,14 @@ def generate_section(generator, section_info, section_idx, total_sections):
         notifier = AutoNotifier(notifier_config)
         notifier.notify_section_complete(filename, section_num, section_title)
     
-    input("\nPress Enter to continue...")
+    if interactive:
+        input("\nPress Enter to continue...")
+    return result('completed', word_count)
 
 def main():
     config = Config()
     generator = get_generator(config)
+    generator.warm_up(getattr(config, 'PREWARM_CONNECTIONS', 0))
     
     # Create output directories
     os.makedirs("output", exist_ok=True)
@@ -322,7 +423,7 @@ def main():
     
     # Parse syllabus
     syllabus_path = "syllabus.md"
-    sections = parse_syllabus(syllabus_path)
+    sections = load_syllabus(syllabus_path)
     
     # Generate Master Commands (if not already done)
     print("🔧 Checking Master Commands...")
@@ -373,7 +474,7 @@ def main():
             print("\n📝 Entering new outline...")
             if interactive_outline_input():
                 print("\n✅ Outline updated! Reloading...")
-                sections = parse_syllabus(syllabus_path)
+                sections = load_syllabus(syllabus_path)
                 # Regenerate Master Commands
                 for section_info in sections:
                     section_num = section_info['section_number']
@@ -393,17 +494,20 @@ def main():
         
         elif choice == 'p':
             print("\n⚡ PARALLEL GENERATION")
-            print(f"\nThis will generate ALL {len(sections)} sections in parallel (2 at a time)")
-            print(f"Estimated time: ~{len(sections) * 25 // 2} minutes")
+            # Each section keeps up to 4 subsection calls in flight
+            section_workers = feeder_workers(limiter_for(generator), calls_per_task=4)
+            print(f"\nThis will generate ALL {len(sections)} sections in parallel ({section_workers} at a time)")
+            print(f"Concurrency adapts to the provider (currently {limiter_for(generator).limit} calls at once)")
             confirm = input("\nContinue? (y/n): ").strip().lower()
             if confirm == 'y':
                 from concurrent.futures import ThreadPoolExecutor, as_completed
                 
                 print("\n🚀 Starting parallel generation...\n")
                 
-                with ThreadPoolExecutor(max_workers=2) as executor:
+                with ThreadPoolExecutor(max_workers=section_workers) as executor:
                     futures = {
-                        executor.submit(generate_section, generator, section_info, idx, len(sections)): section_info
+                        executor.submit(generate_section, generator, section_info, idx, len(sections),
+                                        resume_policy="resume"): section_info
                         for idx, section_info in enumerate(sections, 1)
                     }
                     
@@ -436,17 +540,15 @@ def main():
             print("\n📊 Generation Status:")
             total = len(sections)
             done = 0
+            manifest = get_manifest()
             for section_info in sections:
                 section_num = section_info['section_number']
                 section_title = section_info['section_title']
-                filename = f"output/Section_{section_num}_{section_title.replace(' ', '_')}.md"
+                entry = manifest.get(section_num, section_title)
                 
-                if os.path.exists(filename):
+                if entry:
                     done += 1
-                    # Get word count
-                    with open(filename, 'r') as f:
-                        words = len(f.read().split())
-                    print(f"  ✅ Section {section_num}: {section_title} (~{words} words)")
+                    print(f"  ✅ Section {section_num}: {section_title} (~{entry['words']} words)")
                 else:
                     print(f"  ⏳ Section {section_num}: {section_title} (pending)")
             
@@ -461,6 +563,13 @@ def main():
         elif choice == 'c':
             print("\n")
             cost_tracker.print_summary()
+            if find_wrapper(generator, CachedGenerator):
+                generator.cache.print_summary()
+            hedged = find_wrapper(generator, HedgedGenerator)
+            if hedged:
+                hedged.print_summary()
+            get_scheduler().print_summary()
+            get_export_service().print_summary()
             input("\nPress Enter to continue...")
         
         elif choice.isdigit():
@@ -0,0 +1,201 @@
+"""
+Job Queue - Multiple generation jobs behind one server
+
+Each submitted job spec gets an ID and waits in a bounded priority queue
+(higher priority first, then submission order). A fixed number of jobs run
+at once on their own threads; their LLM calls all share the process-wide
+fair scheduler, so parallel jobs split provider throughput instead of
+exceeding it. Queued jobs can be cancelled outright; running jobs stop
+after the pieces in flight and keep their finished text for resume.
+"""
+import heapq
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+from src.config import Config
+from src.cost_tracker import cost_tracker
+from src.event_bus import event_bus
+from src.job_runner import JobSpec, run_job
+
+FINISHED = ("success", "partial", "error", "cancelled")
+
+class QueueFull(Exception):
+    """Raised when a job is submitted while the queue holds max_queued jobs."""
+
+class Job:
+    def __init__(self, spec: JobSpec, priority: int = 0):
+        self.id = uuid.uuid4().hex[:12]
+        self.spec = spec
+        self.priority = priority
+        self.status = "queued"
+        self.cancel = threading.Event()
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        job = {
+            'id': self.id,
+            'name': self.spec.name,
+            'status': self.status,
+            'priority': self.priority,
+            'spec': self.spec.to_dict(),
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'cost_usd': cost_tracker.get_breakdown('job').get(self.spec.name, {}).get('cost_usd', 0.0),
+            'error': self.error
+        }
+        if self.result:
+            job['words'] = self.result['words']
+            job['sections'] = self.result['sections']
+        return job
+
+class JobQueue:
+    def __init__(self, max_running: int = None, max_queued: int = None,
+                 runner: Callable = None, generator=None, history: int = 200):
+        """
+        Initialize the queue (workers start on the first submit).
+
+        Args:
+            max_running: Jobs generated at once (default: Config.API_MAX_RUNNING_JOBS)
+            max_queued: Jobs allowed to wait (default: Config.API_MAX_QUEUED_JOBS)
+            runner: Function(spec, generator, cancel) -> result dict (default: run_job)
+            generator: Shared generator for jobs that don't set their own provider/model/key
+            history: Finished jobs kept for status queries
+        """
+        self.max_running = max_running or getattr(Config, 'API_MAX_RUNNING_JOBS', 2)
+        self.max_queued = max_queued or getattr(Config, 'API_MAX_QUEUED_JOBS', 100)
+        self.runner = runner
+        self.generator = generator
+        self.history = history
+        self.condition = threading.Condition()
+        self.jobs: Dict[str, Job] = OrderedDict()
+        self.pending: List[tuple] = []  # heap of (-priority, seq, job_id)
+        self.sequence = itertools.count()
+        self.workers: List[threading.Thread] = []
+
+    def submit(self, spec: JobSpec, priority: int = 0) -> Job:
+        """
+        Queue a job.
+
+        Raises:
+            QueueFull: If max_queued jobs are already waiting
+        """
+        job = Job(spec, priority)
+        with self.condition:
+            if self.queued_count() >= self.max_queued:
+                raise QueueFull(f"Queue is full ({self.max_queued} jobs waiting)")
+            self.jobs[job.id] = job
+            heapq.heappush(self.pending, (-priority, next(self.sequence), job.id))
+            self._start_workers()
+            self.condition.notify()
+        print(f"📥 Job {job.id} queued: {spec.name} (priority {priority})")
+        event_bus.publish('job_queued', job=job.id, name=spec.name, priority=priority)
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+
+        Returns:
+            False if the job is unknown or already finished
+        """
+        with self.condition:
+            job = self.jobs.get(job_id)
+            if job is None or job.status in FINISHED:
+                return False
+            job.cancel.set()
+            if job.status == "queued":
+                # Its heap entry is dropped when a worker reaches it
+                job.status = "cancelled"
+                job.finished_at = time.time()
+                self._trim_history()
+        print(f"🛑 Job {job_id} cancelled")
+        event_bus.publish('job_cancelled', job=job_id)
+        return True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self.condition:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self) -> List[Dict]:
+        """Status of every known job, oldest first."""
+        with self.condition:
+            jobs = list(self.jobs.values())
+        return [job.to_dict() for job in jobs]
+
+    def queued_count(self) -> int:
+        return sum(1 for job in self.jobs.values() if job.status == "queued")
+
+    def running(self) -> List[Job]:
+        with self.condition:
+            return [job for job in self.jobs.values() if job.status == "running"]
+
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based place of a queued job in line, or None if it isn't waiting."""
+        with self.condition:
+            waiting = [entry[2] for entry in sorted(self.pending)
+                       if entry[2] in self.jobs and self.jobs[entry[2]].status == "queued"]
+        return waiting.index(job_id) + 1 if job_id in waiting else None
+
+    def get_stats(self) -> Dict:
+        with self.condition:
+            counts: Dict[str, int] = {}
+            for job in self.jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {'max_running': self.max_running, 'max_queued': self.max_queued, 'jobs': counts}
+
+    def _start_workers(self):
+        # Caller holds the lock
+        while len(self.workers) < self.max_running:
+            worker = threading.Thread(target=self._work, name=f"job-worker-{len(self.workers) + 1}", daemon=True)
+            self.workers.append(worker)
+            worker.start()
+
+    def _next_job(self) -> Job:
+        with self.condition:
+            while True:
+                while self.pending:
+                    job = self.jobs.get(heapq.heappop(self.pending)[2])
+                    if job is not None and job.status == "queued":
+                        job.status = "running"
+                        job.started_at = time.time()
+                        return job
+                self.condition.wait()
+
+    def _work(self):
+        while True:
+            job = self._next_job()
+            print(f"🚀 Job {job.id} started: {job.spec.name}")
+            event_bus.publish('job_started', job=job.id, name=job.spec.name)
+            try:
+                result = self._run(job)
+                status, error = result['status'], "; ".join(result['errors']) or None
+            except Exception as e:
+                result, status, error = None, "error", str(e)
+            with self.condition:
+                job.result = result
+                job.status = status
+                job.error = error
+                job.finished_at = time.time()
+                self._trim_history()
+            print(f"🏁 Job {job.id} {status}: {job.spec.name}")
+            event_bus.publish('job_finished', job=job.id, name=job.spec.name, status=status)
+
+    def _run(self, job: Job) -> Dict:
+        spec = job.spec
+        # Jobs with their own provider settings build their own generator
+        generator = None if (spec.provider or spec.model or spec.api_key) else self.generator
+        return (self.runner or run_job)(spec, generator, job.cancel)
+
+    def _trim_history(self):
+        # Caller holds the lock; drops the oldest finished jobs
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in FINISHED]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self.jobs[job_id]
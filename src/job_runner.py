@@ -0,0 +1,219 @@
+"""
+Job Runner - Generate an outline unattended from a declarative job spec
+
+A job spec names the outline, provider, concurrency, resume policy and
+export targets. The runner never reads stdin, so it can be driven by batch
+processing, the API or a shell loop, and it returns a structured result
+instead of printing menus.
+
+Usage:
+    python -m src.job_runner job.json
+"""
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, asdict, fields
+from typing import Dict, List
+from src.config import Config, LLMProvider
+from src.cost_tracker import cost_tracker
+
+RESUME_POLICIES = ("resume", "restart", "skip")
+EXPORT_TARGETS = ("docx", "pdf")
+PIPELINES = ("threads", "async")
+
+@dataclass
+class JobSpec:
+    outline: str
+    name: str = ""  # Job label for costs and fairness ("" = outline file name)
+    output_dir: str = ""  # "" = output/<name>
+    provider: str = ""  # LLMProvider value, e.g. "deepseek" ("" = Config.PROVIDER)
+    model: str = ""  # "" = Config.MODEL_NAME
+    api_key: str = ""  # "" = Config.API_KEY
+    concurrency: int = 0  # Sections generated at once (0 = sized from the adaptive limiter)
+    max_in_flight: int = 0  # Cap on this job's LLM calls in flight (0 = only the global limit)
+    resume: str = "resume"  # "resume", "restart" or "skip" sections with existing progress
+    sections: List[str] = field(default_factory=list)  # Section numbers to generate (empty = all)
+    export: List[str] = field(default_factory=lambda: ["docx"])  # Any of "docx", "pdf"
+    pipeline: str = "threads"  # "threads" (worker pool) or "async" (every call a task on one event loop)
+
+    def __post_init__(self):
+        self.name = self.name or os.path.splitext(os.path.basename(self.outline))[0]
+        self.output_dir = self.output_dir or os.path.join("output", self.name)
+        if self.resume not in RESUME_POLICIES:
+            raise ValueError(f"resume must be one of {RESUME_POLICIES}, got {self.resume!r}")
+        if self.pipeline not in PIPELINES:
+            raise ValueError(f"pipeline must be one of {PIPELINES}, got {self.pipeline!r}")
+        unknown = [target for target in self.export if target not in EXPORT_TARGETS]
+        if unknown:
+            raise ValueError(f"Unknown export targets: {unknown}")
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'JobSpec':
+        """Build a spec from a dict (e.g. parsed JSON); unknown keys are rejected."""
+        known = {f.name for f in fields(cls)}
+        unknown = sorted(set(data) - known)
+        if unknown:
+            raise ValueError(f"Unknown job spec fields: {unknown}")
+        return cls(**data)
+
+    def to_dict(self) -> Dict:
+        spec = asdict(self)
+        spec.pop('api_key')
+        return spec
+
+def load_job_spec(path: str) -> JobSpec:
+    """Load a job spec from a JSON file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return JobSpec.from_dict(json.load(f))
+
+def _config_for(spec: JobSpec) -> Config:
+    config = Config()
+    if spec.provider:
+        config.PROVIDER = LLMProvider(spec.provider)
+    if spec.model:
+        config.MODEL_NAME = spec.model
+    if spec.api_key:
+        config.API_KEY = spec.api_key
+    return config
+
+def run_job(spec: JobSpec, generator=None, cancel=None) -> Dict:
+    """
+    Generate every (selected) section of an outline without user input.
+
+    Args:
+        spec: Job spec
+        generator: Generator to use (default: built from the spec's provider settings)
+        cancel: threading.Event; when set, running sections stop after their
+                in-flight pieces and sections not yet started are skipped
+
+    Returns:
+        Dict with job, status ('success', 'partial', 'cancelled' or 'error'), output_dir,
+        sections (one result per section), errors, words, elapsed_seconds, cost_usd
+    """
+    # Imported here so building/validating specs doesn't need the generation stack
+    from src.generator import get_generator
+    from src.syllabus_parser import load_syllabus
+    from src.master_command_generator import generate_master_command
+    from src.interactive_main import generate_section
+    from src.adaptive_limiter import limiter_for, feeder_workers
+    from src.export_service import get_export_service
+    from src.manifest import get_manifest
+    from src.scheduler import get_scheduler
+
+    started = time.time()
+    result = {
+        'job': spec.name,
+        'spec': spec.to_dict(),
+        'status': 'error',
+        'output_dir': spec.output_dir,
+        'sections': [],
+        'errors': [],
+        'words': 0,
+        'elapsed_seconds': 0.0,
+        'cost_usd': 0.0
+    }
+
+    try:
+        sections = load_syllabus(spec.outline)
+    except OSError as e:
+        result['errors'].append(f"Cannot read outline: {e}")
+        return result
+    if spec.sections:
+        sections = [s for s in sections if s['section_number'] in spec.sections]
+    if not sections:
+        result['errors'].append("No sections found in outline")
+        return result
+
+    os.makedirs(os.path.join(spec.output_dir, "master_commands"), exist_ok=True)
+    for section_info in sections:
+        mc_filename = os.path.join(spec.output_dir, "master_commands", f"Section_{section_info['section_number']}_Master_Command.md")
+        if not os.path.exists(mc_filename):
+            with open(mc_filename, 'w', encoding='utf-8') as f:
+                f.write(generate_master_command(section_info))
+
+    generator = generator or get_generator(_config_for(spec))
+    workers = spec.concurrency or feeder_workers(limiter_for(generator), calls_per_task=4)
+
+    def export(idx, section_info, section):
+        # Exports run in the export service's process pool; sections kept from an
+        # earlier run are only converted again if their text changed since
+        if section['status'] in ('completed', 'skipped') and \
+                get_manifest(spec.output_dir).get(section_info['section_number'], section_info['section_title']):
+            exports[idx] = {kind: get_export_service().submit(section['filename'], kind, spec.output_dir)
+                            for kind in spec.export}
+
+    def run_section(idx, section_info):
+        with cost_tracker.scope(job=spec.name):
+            section = generate_section(
+                generator, section_info, idx, len(sections), stream=False,
+                output_dir=spec.output_dir, resume_policy=spec.resume,
+                export_docx=False, cancel=cancel
+            )
+        export(idx, section_info, section)
+        return section
+
+    section_results = [None] * len(sections)
+    exports = {}
+    # The job's own cap applies only to its calls; other jobs keep the global limit
+    scheduler = get_scheduler()
+    if spec.max_in_flight:
+        scheduler.set_job_limit(spec.name, spec.max_in_flight)
+    try:
+        if spec.pipeline == "async":
+            from src.async_pipeline import run_sections_async
+            with cost_tracker.scope(job=spec.name):
+                outcomes = run_sections_async(generator, sections, spec.output_dir, spec.resume, cancel)
+            for idx, section_info in enumerate(sections, 1):
+                section_num = section_info['section_number']
+                section = outcomes[section_num]
+                if 'error' in section:
+                    section = {'section': section_num, 'status': 'failed', 'error': section['error']}
+                    result['errors'].append(f"Section {section_num}: {section['error']}")
+                export(idx, section_info, section)
+                section_results[idx - 1] = section
+                result['words'] += section.get('words', 0)
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(sections)))) as executor:
+                futures = {
+                    executor.submit(run_section, idx, section_info): idx
+                    for idx, section_info in enumerate(sections, 1)
+                }
+                for future in as_completed(futures):
+                    idx = futures[future]
+                    section_num = sections[idx - 1]['section_number']
+                    try:
+                        section = future.result()
+                    except Exception as e:
+                        section = {'section': section_num, 'status': 'failed', 'error': str(e)}
+                        result['errors'].append(f"Section {section_num}: {e}")
+                    section_results[idx - 1] = section
+                    result['words'] += section.get('words', 0)
+    finally:
+        if spec.max_in_flight:
+            scheduler.set_job_limit(spec.name, None)
+
+    for idx, futures in exports.items():
+        for kind, future in futures.items():
+            section_results[idx - 1][kind] = future.result()
+    result['sections'] = section_results
+    failed = sum(1 for s in result['sections'] if s['status'] == 'failed')
+    if cancel is not None and cancel.is_set():
+        result['status'] = 'cancelled'
+    else:
+        result['status'] = 'success' if not failed else 'partial' if failed < len(sections) else 'error'
+    result['elapsed_seconds'] = round(time.time() - started, 1)
+    result['cost_usd'] = cost_tracker.get_breakdown('job').get(spec.name, {}).get('cost_usd', 0.0)
+    return result
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: python -m src.job_runner <job.json>")
+        sys.exit(2)
+    result = run_job(load_job_spec(sys.argv[1]))
+    print(json.dumps(result, indent=2))
+    sys.exit(0 if result['status'] == 'success' else 1)
+
+if __name__ == "__main__":
+    main()
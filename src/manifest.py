@@ -0,0 +1,195 @@
+"""
+Output Manifest - One index of every generated section per output root
+
+Records each finished section's file, word count and content hash, plus the
+source hash and converter each DOCX/PDF export was made with (so a stale
+export, or one from a different converter writing the same path, can be
+detected without opening anything). The writer updates it as sections
+complete; menus, the API, batch processing and export read it instead of
+rebuilding paths, stat-ing files and counting words. Exports of other
+markdown files (e.g. the complete book) are tracked the same way. The file
+is reloaded only when its mtime changes, so other processes' updates are
+picked up.
+"""
+import copy
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, Optional
+from src.durable_io import atomic_write_json, read_json
+
+EXPORT_KINDS = ("docx", "pdf")
+
+def section_filename(output_dir: str, section_num: str, section_title: str) -> str:
+    """Path of a section's markdown file in an output root."""
+    return os.path.join(output_dir, f"Section_{section_num}_{section_title.replace(' ', '_')}.md")
+
+class Manifest:
+    def __init__(self, output_dir: str = "output"):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, ".manifest.json")
+        self.lock = threading.Lock()
+        self.sections: Dict[str, Dict] = {}
+        self.documents: Dict[str, Dict] = {}  # other markdown files (e.g. the complete book) -> exports
+        self.mtime = None
+        self._reload()
+
+    def _reload(self):
+        # Caller holds the lock (or is __init__)
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self.mtime:
+            data = read_json(self.path, {}) if mtime else {}
+            self.sections = data.get('sections', {})
+            self.documents = data.get('documents', {})
+            self.mtime = mtime
+
+    def _save(self):
+        # Caller holds the lock
+        atomic_write_json(self.path, {'sections': self.sections, 'documents': self.documents})
+        self.mtime = os.stat(self.path).st_mtime_ns
+
+    def get(self, section_num: str, section_title: str = None) -> Optional[Dict]:
+        """
+        Manifest entry of a section.
+
+        A section generated before the manifest existed is indexed on first
+        lookup (given its title), so later lookups cost no file I/O.
+
+        Returns:
+            Dict with title, path, words, sha256, completed_at and exports, or None
+        """
+        with self.lock:
+            self._reload()
+            entry = self.sections.get(section_num)
+            if entry is not None and (section_title is None or entry['title'] == section_title):
+                return copy.deepcopy(entry)
+        if section_title is None:
+            return None
+        path = section_filename(self.output_dir, section_num, section_title)
+        if not os.path.exists(path):
+            return None
+        return self.record_section(section_num, section_title, path)
+
+    def is_complete(self, section_num: str, section_title: str = None) -> bool:
+        return self.get(section_num, section_title) is not None
+
+    def record_section(self, section_num: str, section_title: str, path: str, words: int = None) -> Dict:
+        """
+        Record a finished section file (replacing any earlier entry, so its
+        exports count as stale until they are recorded again).
+
+        Args:
+            words: Word count if the caller already knows it (else counted from the file)
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        entry = {
+            'title': section_title,
+            'path': path,
+            'words': words if words is not None else len(data.decode('utf-8').split()),
+            'sha256': hashlib.sha256(data).hexdigest(),
+            'completed_at': time.time(),
+            'exports': {}
+        }
+        with self.lock:
+            self._reload()
+            self.sections[section_num] = entry
+            self._save()
+        return copy.deepcopy(entry)
+
+    def export_path(self, section_num: str, kind: str, engine: str = None) -> Optional[str]:
+        """
+        Path of a section's export if it was made from the current content, else None.
+
+        Args:
+            engine: Only accept an export made by this converter (None = any)
+        """
+        entry = self.get(section_num)
+        if entry is None:
+            return None
+        export = entry['exports'].get(kind)
+        if _is_fresh(export, entry['sha256'], engine):
+            return export['path']
+        return None
+
+    def find_by_path(self, path: str) -> Optional[str]:
+        """Section number whose file is at path, or None."""
+        with self.lock:
+            self._reload()
+            return self._find(path)
+
+    def _find(self, path: str) -> Optional[str]:
+        # Caller holds the lock
+        for section_num, entry in self.sections.items():
+            if os.path.normpath(entry['path']) == os.path.normpath(path):
+                return section_num
+        return None
+
+    def _exports_of(self, md_path: str, create: bool = False) -> Optional[Dict]:
+        # Caller holds the lock; export records of a section file or other document
+        section_num = self._find(md_path)
+        if section_num is not None:
+            return self.sections[section_num]['exports']
+        key = os.path.normpath(md_path)
+        if create:
+            return self.documents.setdefault(key, {})
+        return self.documents.get(key)
+
+    def fresh_export(self, md_path: str, kind: str, source_sha256: str, engine: str = None) -> Optional[str]:
+        """
+        Path of an export of any markdown file made from exactly this content, else None.
+
+        Args:
+            engine: Only accept an export made by this converter (None = any)
+        """
+        with self.lock:
+            self._reload()
+            exports = self._exports_of(md_path) or {}
+            export = exports.get(kind)
+        if _is_fresh(export, source_sha256, engine):
+            return export['path']
+        return None
+
+    def record_export(self, md_path: str, kind: str, path: str, source_sha256: str, seconds: float = None,
+                      engine: str = None):
+        """Record an export of any markdown file, made from the content with this hash by this converter."""
+        if kind not in EXPORT_KINDS:
+            raise ValueError(f"Unknown export kind: {kind}")
+        with self.lock:
+            self._reload()
+            self._exports_of(md_path, create=True)[kind] = {
+                'path': path, 'source_sha256': source_sha256, 'seconds': seconds, 'engine': engine
+            }
+            self._save()
+
+    def remove(self, section_num: str):
+        """Forget a section (e.g. when it is regenerated from scratch)."""
+        with self.lock:
+            self._reload()
+            if self.sections.pop(section_num, None) is not None:
+                self._save()
+
+    def summary(self) -> Dict:
+        """Number of sections and total words recorded."""
+        with self.lock:
+            self._reload()
+            return {'sections': len(self.sections), 'words': sum(e['words'] for e in self.sections.values())}
+
+def _is_fresh(export: Optional[Dict], source_sha256: str, engine: str = None) -> bool:
+    # Exports recorded before engines were tracked have no engine and only match None
+    return bool(export) and export['source_sha256'] == source_sha256 and \
+        (engine is None or export.get('engine') == engine) and os.path.exists(export['path'])
+
+_manifests: Dict[str, Manifest] = {}
+_manifests_lock = threading.Lock()
+
+def get_manifest(output_dir: str = "output") -> Manifest:
+    """Get the manifest of one output root."""
+    with _manifests_lock:
+        if output_dir not in _manifests:
+            _manifests[output_dir] = Manifest(output_dir)
+        return _manifests[output_dir]
@@ -0,0 +1,54 @@
+"""
+Model Router - Send each class of call to its own provider and model
+
+Calls are classified by the cost tracker's call_site label ("planning",
+"introduction", "subsection", "summary", ...), so short structured
+planning calls can go to a fast model while long prose stays on the
+quality model. Call sites without a route use the default generator.
+"""
+from typing import Dict, Iterator
+from src.generator import LLMGenerator, GeneratorWrapper, default_max_tokens
+from src.cost_tracker import cost_tracker
+
+class RoutedGenerator(GeneratorWrapper):
+    def __init__(self, generator: LLMGenerator, routes: Dict[str, LLMGenerator]):
+        """
+        Initialize the router.
+
+        Args:
+            generator: Default generator
+            routes: call_site -> generator for that class of call
+        """
+        super().__init__(generator)
+        self.routes = routes
+
+    def route(self) -> LLMGenerator:
+        """Generator for calls made from the current context."""
+        return self.routes.get(cost_tracker.current_scope().get('call_site'), self.generator)
+
+    # Identity follows the route, so cache and single-flight keys include the routed model
+    provider = property(lambda self: self.route().provider)
+    model_name = property(lambda self: self.route().model_name)
+    system_prompt = property(lambda self: self.route().system_prompt)
+    temperature = property(lambda self: self.route().temperature)
+
+    def generate(self, prompt: str, max_tokens: int = None) -> str:
+        generator = self.route()
+        return generator.generate(prompt, max_tokens or default_max_tokens(generator))
+
+    async def agenerate(self, prompt: str, max_tokens: int = None) -> str:
+        generator = self.route()
+        return await generator.agenerate(prompt, max_tokens or default_max_tokens(generator))
+
+    def stream(self, prompt: str, max_tokens: int = None) -> Iterator[str]:
+        generator = self.route()
+        return generator.stream(prompt, max_tokens or default_max_tokens(generator))
+
+    def warm_up(self, connections: int = 1):
+        self.generator.warm_up(connections)
+        for generator in self.routes.values():
+            generator.warm_up(connections)
+
+    def describe(self) -> Dict[str, str]:
+        """call_site -> 'provider/model' for every configured route."""
+        return {site: f"{g.provider}/{g.model_name}" for site, g in self.routes.items()}
@@ -61,8 +61,14 @@ def switch_model(provider: str) -> Config:
     return config
 
 def get_current_model(config: Config) -> str:
-    """Get current model name."""
-    return f"{config.PROVIDER.value} ({config.MODEL_NAME})"
+    """Get current model name (plus any per-call-site routes)."""
+    current = f"{config.PROVIDER.value} ({config.MODEL_NAME})"
+    routes = getattr(config, 'ROUTES', None)
+    if routes:
+        current += " | " + ", ".join(
+            f"{call_site} → {spec.get('model', config.MODEL_NAME)}" for call_site, spec in routes.items()
+        )
+    return current
 
 def compare_costs():
     """Show cost comparison."""
@@ -7,7 +7,8 @@ from src.config import Config
 from src.generator import get_generator
 from src.syllabus_parser import parse_syllabus
 from src.master_command_generator import generate_master_command
-from src.textbook_planner import expand_section_to_topics, expand_topic_to_subsections
+from src.textbook_planner import format_planning_time
+from src.plan_store import plan_store
 from src.textbook_writer import write_section_introduction, write_subsection, write_section_summary
 
 def generate_textbook_multistep():
@@ -91,15 +92,10 @@ def generate_textbook_multistep():
             f.write("---\n\n")
             f.flush()
             
-            # Step 1: Expand to topics
+            # Steps 1-2: Expand to topics, then all topics to subsections concurrently
             print(f"  [1/4] 🔍 Planning content structure...")
-            topics = expand_section_to_topics(generator, section_title)
-            
-            # Step 2: Expand topics to subsections
-            for topic in topics:
-                subsections = expand_topic_to_subsections(generator, section_title, topic)
-                topic.subsections = subsections
-            print(f"        ✅ Structure ready ({len(topics)} topics, {sum(len(t.subsections) for t in topics)} subsections)")
+            topics, timings = plan_store.plan(generator, section_num, section_title, chapter)
+            print(f"        ✅ Structure ready ({len(topics)} topics, {sum(len(t.subsections) for t in topics)} subsections) - {format_planning_time(timings)}")
             
             # Step 3: Write content
             print(f"  [3/4] ✍️  Writing content (this will take time)...\n")
@@ -0,0 +1,82 @@
+"""
+Ordered Writer - Commit out-of-order results in document order
+
+Results arrive from the worker pool in any order. Each one is committed
+(written, flushed, checkpointed) the moment every result before it in the
+document is present, by whichever thread completed that prefix. Keys can be
+inserted while the document is being written, e.g. a topic's subsections
+once the topic is planned, as long as their anchor hasn't been committed.
+"""
+import threading
+from typing import Callable, Dict, Hashable, Iterable, List
+
+class OrderedWriter:
+    def __init__(self, keys: Iterable[Hashable], commit: Callable[[Hashable, object], None]):
+        """
+        Initialize the writer.
+
+        Args:
+            keys: Keys known up front, in document order
+            commit: Called as commit(key, value) in document order, one at a time
+        """
+        self.commit = commit
+        self.order: List[Hashable] = list(keys)
+        self.ready: Dict[Hashable, object] = {}
+        self.committed = 0
+        self.error = None
+        self.condition = threading.Condition()
+
+    def expect(self, keys: Iterable[Hashable], after: Hashable):
+        """
+        Insert keys into the document right after an uncommitted key.
+
+        Args:
+            keys: New keys, in document order
+            after: Key the new keys follow (must not be committed yet)
+        """
+        with self.condition:
+            position = self.order.index(after)
+            if position < self.committed:
+                raise ValueError(f"Cannot insert after committed key: {after}")
+            self.order[position + 1:position + 1] = list(keys)
+
+    def put(self, key: Hashable, value=None):
+        """Deliver the result for a key and commit the ready prefix."""
+        with self.condition:
+            if key not in self.order[self.committed:]:
+                raise KeyError(f"Unexpected or already committed key: {key}")
+            self.ready[key] = value
+            # Commits run under the lock so they never interleave
+            try:
+                while self.committed < len(self.order) and self.order[self.committed] in self.ready:
+                    next_key = self.order[self.committed]
+                    self.commit(next_key, self.ready.pop(next_key))
+                    self.committed += 1
+            except BaseException as e:
+                self.error = self.error or e
+                raise
+            finally:
+                self.condition.notify_all()
+
+    def fail(self, error: BaseException):
+        """Abort the document; wait() raises the first error reported."""
+        with self.condition:
+            self.error = self.error or error
+            self.condition.notify_all()
+
+    def is_done(self) -> bool:
+        with self.condition:
+            return self.committed == len(self.order)
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Block until every key is committed.
+
+        Returns:
+            True when done, False on timeout (raises if a result failed)
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.error is not None or self.committed == len(self.order), timeout)
+            if self.error is not None:
+                raise self.error
+            return self.committed == len(self.order)
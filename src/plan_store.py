@@ -0,0 +1,115 @@
+"""
+Plan Store - Durable topic/subsection plans per section
+
+Planning is non-deterministic: re-planning a section on resume gives a
+different topic list, so the resume manager's "topic.subsection" keys would
+point at different content (and the planning calls are paid twice). Plans
+are stored next to the resume state, keyed by section number and a hash of
+the outline entry, and reused until explicitly invalidated.
+"""
+import hashlib
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+from src.durable_io import atomic_write_json, read_json
+from src.generator import LLMGenerator
+from src.textbook_planner import Topic, plan_section
+
+def outline_hash(section_title: str, chapter: str = "") -> str:
+    """Short hash of a section's outline entry (changes when the outline does)."""
+    return hashlib.sha256(f"{chapter}\n{section_title}".encode('utf-8')).hexdigest()[:16]
+
+class PlanStore:
+    def __init__(self, plan_file: str = "output/.section_plans.json"):
+        self.plan_file = plan_file
+        self.lock = threading.Lock()
+        self.plans = self.load_plans()
+
+    def load_plans(self) -> Dict:
+        """Load saved plans from file."""
+        return read_json(self.plan_file, {})
+
+    def save_plans(self):
+        """Save all plans to file atomically (caller holds the lock)."""
+        atomic_write_json(self.plan_file, self.plans)
+
+    @staticmethod
+    def _key(section_num: str, section_title: str, chapter: str = "") -> str:
+        return f"{section_num}:{outline_hash(section_title, chapter)}"
+
+    def get(self, section_num: str, section_title: str, chapter: str = "") -> Optional[List[Topic]]:
+        """
+        Get the stored plan for a section.
+
+        Returns:
+            Topics (subsection lists may be empty if planning was interrupted),
+            or None if the section has no plan for this outline entry
+        """
+        with self.lock:
+            plan = self.plans.get(self._key(section_num, section_title, chapter))
+        if plan is None:
+            return None
+        return [Topic(topic['title'], list(topic['subsections'])) for topic in plan['topics']]
+
+    def is_complete(self, section_num: str, section_title: str, chapter: str = "") -> bool:
+        """True if a plan is stored and every topic has its subsections."""
+        topics = self.get(section_num, section_title, chapter)
+        return bool(topics) and all(topic.subsections for topic in topics)
+
+    def save(self, section_num: str, section_title: str, topics: List[Topic], chapter: str = ""):
+        """Store (or replace) the plan for a section."""
+        with self.lock:
+            self.plans[self._key(section_num, section_title, chapter)] = {
+                'section_title': section_title,
+                'topics': [{'title': topic.title, 'subsections': list(topic.subsections)} for topic in topics]
+            }
+            self.save_plans()
+
+    def save_topic(self, section_num: str, section_title: str, topic_idx: int, subsections: List[str], chapter: str = ""):
+        """Store the subsections of one topic (1-based) of an already stored plan."""
+        with self.lock:
+            plan = self.plans.get(self._key(section_num, section_title, chapter))
+            if plan is None:
+                return
+            plan['topics'][topic_idx - 1]['subsections'] = list(subsections)
+            self.save_plans()
+
+    def invalidate(self, section_num: str):
+        """Forget every stored plan for a section so it is planned again."""
+        with self.lock:
+            stale = [key for key in self.plans if key.split(":", 1)[0] == section_num]
+            for key in stale:
+                del self.plans[key]
+            if stale:
+                self.save_plans()
+
+    def plan(self, generator: LLMGenerator, section_num: str, section_title: str,
+             chapter: str = "", **kwargs) -> Tuple[List[Topic], Dict]:
+        """
+        Reuse the stored plan for a section, or plan it and store the result.
+
+        Args:
+            kwargs: Passed on to plan_section (num_topics, num_subsections, mode)
+
+        Returns:
+            (topics, timings) like plan_section; timings has reused=True for a stored plan
+        """
+        if self.is_complete(section_num, section_title, chapter):
+            topics = self.get(section_num, section_title, chapter)
+            return topics, {'topics_seconds': 0.0, 'subsections_seconds': 0.0, 'total_seconds': 0.0, 'reused': True}
+        topics, timings = plan_section(generator, section_title, **kwargs)
+        self.save(section_num, section_title, topics, chapter)
+        return topics, timings
+
+_stores: Dict[str, PlanStore] = {}
+_stores_lock = threading.Lock()
+
+def get_plan_store(output_dir: str = "output") -> PlanStore:
+    """Get the plan store of one output root (kept next to its resume state)."""
+    with _stores_lock:
+        if output_dir not in _stores:
+            _stores[output_dir] = PlanStore(os.path.join(output_dir, ".section_plans.json"))
+        return _stores[output_dir]
+
+# Global instance
+plan_store = get_plan_store()
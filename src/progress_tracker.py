@@ -1,16 +1,39 @@
 """
 Real-time Progress Tracker - Show live progress during generation
+
+Every change is also published to the event bus (section started,
+subsection done with an ETA, streaming words/sec, section done), so the web
+UI is pushed updates instead of polling.
 """
+import copy
 import threading
 import time
 from datetime import datetime
+from src.event_bus import EventBus, event_bus
+
+# Streaming stats are published at most this often per section
+STREAM_EVENT_INTERVAL = 1.0
 
 class ProgressTracker:
-    def __init__(self):
+    def __init__(self, bus: EventBus = None):
         self.lock = threading.Lock()
         self.sections = {}
         self.active = False
         self.display_thread = None
+        self.bus = bus or event_bus
+    
+    def snapshot(self) -> dict:
+        """Consistent copy of every section's progress."""
+        with self.lock:
+            return copy.deepcopy(self.sections)
+    
+    def _eta(self, section: dict):
+        """Seconds left for a section, extrapolated from its finished pieces."""
+        done = section['completed_subsections']
+        if not done or done >= section['total_subsections']:
+            return None
+        elapsed = time.time() - section['start_time']
+        return round(elapsed / done * (section['total_subsections'] - done), 1)
     
     def start_section(self, section_num: str, section_title: str, total_subsections: int):
         """Mark a section as started."""
@@ -22,29 +45,94 @@ class ProgressTracker:
                 'completed_subsections': 0,
                 'current_subsection': None,
                 'start_time': time.time(),
-                'words': 0
+                'words': 0,
+                'streaming_words': 0,
+                'ttft': None,
+                'words_per_sec': 0.0,
+                'last_stream_event': 0.0
             }
+        self.bus.publish('section_started', section=section_num, title=section_title,
+                         total_subsections=total_subsections)
+    
+    def add_subsections(self, section_num: str, count: int):
+        """Grow a section's total as its topics are planned."""
+        with self.lock:
+            if section_num not in self.sections:
+                return
+            self.sections[section_num]['total_subsections'] += count
+            total = self.sections[section_num]['total_subsections']
+        self.bus.publish('subsections_added', section=section_num, total_subsections=total)
     
     def update_subsection(self, section_num: str, subsection_name: str):
         """Update current subsection being written."""
         with self.lock:
-            if section_num in self.sections:
-                self.sections[section_num]['current_subsection'] = subsection_name
+            if section_num not in self.sections:
+                return
+            self.sections[section_num]['current_subsection'] = subsection_name
+        self.bus.publish('subsection_started', section=section_num, subsection=subsection_name)
     
     def complete_subsection(self, section_num: str, words: int = 0):
         """Mark a subsection as completed."""
         with self.lock:
-            if section_num in self.sections:
-                self.sections[section_num]['completed_subsections'] += 1
-                self.sections[section_num]['words'] += words
+            section = self.sections.get(section_num)
+            if section is None:
+                return
+            section['completed_subsections'] += 1
+            section['words'] += words
+            event = {'completed_subsections': section['completed_subsections'],
+                     'total_subsections': section['total_subsections'],
+                     'words': section['words'], 'eta_seconds': self._eta(section)}
+        self.bus.publish('subsection_done', section=section_num, **event)
+    
+    def stream_meter(self, section_num: str):
+        """
+        Create an on_chunk callback that records live streaming stats.
+        
+        Tracks time-to-first-token for the call and a rolling words/sec
+        figure for the section while text is still arriving.
+        """
+        started = time.time()
+        state = {'first': None, 'words': 0}
+        
+        def on_chunk(chunk: str):
+            now = time.time()
+            words = len(chunk.split())
+            event = None
+            with self.lock:
+                first_chunk = state['first'] is None
+                if first_chunk:
+                    state['first'] = now
+                state['words'] += words
+                section = self.sections.get(section_num)
+                if section is None:
+                    return
+                if first_chunk:
+                    section['ttft'] = now - started
+                section['streaming_words'] += words
+                elapsed = now - state['first']
+                if elapsed > 0:
+                    section['words_per_sec'] = state['words'] / elapsed
+                if now - section['last_stream_event'] >= STREAM_EVENT_INTERVAL:
+                    section['last_stream_event'] = now
+                    event = {'words_per_sec': round(section['words_per_sec'], 1),
+                             'ttft': round(section['ttft'], 2) if section['ttft'] is not None else None,
+                             'streaming_words': section['streaming_words']}
+            if event:
+                self.bus.publish('stream', section=section_num, **event)
+        
+        return on_chunk
     
     def complete_section(self, section_num: str, total_words: int):
         """Mark a section as completed."""
         with self.lock:
-            if section_num in self.sections:
-                self.sections[section_num]['status'] = 'complete'
-                self.sections[section_num]['words'] = total_words
-                self.sections[section_num]['end_time'] = time.time()
+            section = self.sections.get(section_num)
+            if section is None:
+                return
+            section['status'] = 'complete'
+            section['words'] = total_words
+            section['end_time'] = time.time()
+            seconds = round(section['end_time'] - section['start_time'], 1)
+        self.bus.publish('section_done', section=section_num, words=total_words, seconds=seconds)
     
     def start_display(self):
         """Start the real-time display thread."""
@@ -69,6 +157,12 @@ class ProgressTracker:
         except Exception:
             pass  # Ignore other errors during shutdown
     
+    def _queue_line(self) -> str:
+        """In-flight and queued LLM calls from the scheduler."""
+        from src.scheduler import get_scheduler
+        stats = get_scheduler().get_stats()
+        return f"🚦 LLM calls: {stats['in_flight']}/{stats['limit']} in flight | {stats['queue_depth']} queued"
+    
     def _print_progress(self):
         """Print current progress."""
         with self.lock:
@@ -88,7 +182,8 @@ class ProgressTracker:
             total_words = sum(s['words'] for s in self.sections.values())
             
             print(f"📚 Sections: {completed_sections}/{total_sections} complete")
-            print(f"📝 Total words generated: {total_words:,}\n")
+            print(f"📝 Total words generated: {total_words:,}")
+            print(self._queue_line() + "\n")
             print("-" * 80)
             
             # Show each section
@@ -119,6 +214,8 @@ class ProgressTracker:
                 print(f"   Progress: [{bar}] {section['completed_subsections']}/{section['total_subsections']} subsections")
                 print(f"   Words: {section['words']:,}")
                 print(f"   Time: {elapsed_str}")
+                if section.get('ttft') is not None and section['status'] != 'complete':
+                    print(f"   Streaming: {section['words_per_sec']:.1f} words/s | first token {section['ttft']:.1f}s")
                 
                 if section['current_subsection'] and section['status'] != 'complete':
                     print(f"   Current: {section['current_subsection'][:60]}...")
@@ -0,0 +1,209 @@
+"""
+Response Cache - Content-addressed on-disk cache for LLM responses
+
+Identical requests (same provider, model, system prompt, prompt, max_tokens
+and temperature) are answered from a single-file SQLite database instead of
+the API. Entries expire after a TTL and the least recently used ones are
+evicted once the cache grows past its size cap.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, Optional
+from src.generator import LLMGenerator, GeneratorWrapper, default_max_tokens
+
+class ResponseCache:
+    def __init__(self, db_file: str = "output/.llm_cache.sqlite3", max_mb: int = 200, ttl_days: float = 30):
+        """
+        Initialize the response cache.
+
+        Args:
+            db_file: Path to the SQLite database file
+            max_mb: Size cap for stored responses (LRU eviction above it)
+            ttl_days: Entries older than this are treated as misses (0 = never expire)
+        """
+        self.db_file = db_file
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.ttl_seconds = ttl_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_file)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_file, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(provider: str, model: str, system_prompt: str, prompt: str, max_tokens: int, temperature) -> str:
+        """Build the content address for a request."""
+        payload = json.dumps(
+            [provider, model, system_prompt, prompt, max_tokens, temperature],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss."""
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT response, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or (self.ttl_seconds and now - row[1] > self.ttl_seconds):
+                self.misses += 1
+                return None
+
+            self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, response: str):
+        """Store a response and evict least recently used entries above the cap."""
+        # Never cache failed calls
+        if not response or response.startswith("Error:"):
+            return
+
+        now = time.time()
+        size = len(response.encode('utf-8'))
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now)
+            )
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        """Drop expired entries, then LRU entries until under max_bytes."""
+        if self.ttl_seconds:
+            self.conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_seconds,))
+
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        """Remove every cached response."""
+        with self.lock:
+            self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
+
+    def get_stats(self) -> Dict:
+        """Get hit/miss counters and storage usage."""
+        with self.lock:
+            entries, total = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'size_mb': total / (1024 * 1024)
+        }
+
+    def print_summary(self):
+        """Print cache statistics."""
+        stats = self.get_stats()
+        print(f"\n💾 Response Cache:")
+        print(f"   Hits: {stats['hits']:,} | Misses: {stats['misses']:,} | Hit rate: {stats['hit_rate']:.0%}")
+        print(f"   Entries: {stats['entries']:,} ({stats['size_mb']:.1f} MB)")
+
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+def get_response_cache(db_file: str = "output/.llm_cache.sqlite3", max_mb: int = 200, ttl_days: float = 30) -> ResponseCache:
+    """Get the shared ResponseCache for a database file."""
+    with _caches_lock:
+        if db_file not in _caches:
+            _caches[db_file] = ResponseCache(db_file, max_mb, ttl_days)
+        return _caches[db_file]
+
+class CachedGenerator(GeneratorWrapper):
+    """Wrap any LLMGenerator so identical calls are served from a ResponseCache."""
+
+    def __init__(self, generator: LLMGenerator, cache: ResponseCache):
+        super().__init__(generator)
+        self.cache = cache
+
+    def _key(self, prompt: str, max_tokens: int) -> str:
+        return self.cache.make_key(
+            self.provider,
+            self.model_name,
+            self.system_prompt,
+            prompt,
+            max_tokens,
+            self.temperature
+        )
+
+    def generate(self, prompt: str, max_tokens: int = None) -> str:
+        max_tokens = max_tokens or default_max_tokens(self.generator)
+        key = self._key(prompt, max_tokens)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = self.generator.generate(prompt, max_tokens)
+        self.cache.set(key, response)
+        return response
+
+    async def agenerate(self, prompt: str, max_tokens: int = None) -> str:
+        max_tokens = max_tokens or default_max_tokens(self.generator)
+        key = self._key(prompt, max_tokens)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = await self.generator.agenerate(prompt, max_tokens)
+        self.cache.set(key, response)
+        return response
+
+    def stream(self, prompt: str, max_tokens: int = None) -> Iterator[str]:
+        max_tokens = max_tokens or default_max_tokens(self.generator)
+        key = self._key(prompt, max_tokens)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        # Streams return False when cut short (None when complete); only complete
+        # text is cached, and the result is passed on to the caller
+        chunks = []
+        completed = yield from _tee(self.generator.stream(prompt, max_tokens), chunks)
+        if completed is not False:
+            self.cache.set(key, "".join(chunks))
+        return completed
+
+def _tee(stream: Iterator[str], chunks: list):
+    """Re-yield a stream while collecting its chunks; returns the stream's return value."""
+    while True:
+        try:
+            chunk = next(stream)
+        except StopIteration as stop:
+            return stop.value
+        chunks.append(chunk)
+        yield chunk
@@ -1,66 +1,82 @@
 """
 Resume Manager - Save and resume generation progress
 """
-import json
+import copy
 import os
+import threading
 from typing import Dict, Optional
+from src.durable_io import GroupCommit, read_json
 
 class ResumeManager:
-    def __init__(self, state_file: str = "output/.generation_state.json"):
+    def __init__(self, state_file: str = "output/.generation_state.json", commit_delay: float = 0.5):
         self.state_file = state_file
+        self.lock = threading.RLock()
         self.state = self.load_state()
+        # Many small updates (one per subsection) are written together
+        self.committer = GroupCommit(state_file, self._snapshot, commit_delay)
     
     def load_state(self) -> Dict:
         """Load saved state from file."""
-        if os.path.exists(self.state_file):
-            try:
-                with open(self.state_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
+        return read_json(self.state_file, {})
+    
+    def _snapshot(self) -> Dict:
+        with self.lock:
+            return copy.deepcopy(self.state)
     
     def save_state(self):
-        """Save current state to file."""
-        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
-        with open(self.state_file, 'w') as f:
-            json.dump(self.state, f, indent=2)
+        """Save current state to file (atomically, batched with other updates)."""
+        self.committer.request()
+    
+    def flush(self):
+        """Write pending updates now."""
+        self.committer.flush()
     
     def start_section(self, section_num: str, section_title: str, total_topics: int):
-        """Mark section as started."""
-        self.state[section_num] = {
-            'section_title': section_title,
-            'status': 'in_progress',
-            'total_topics': total_topics,
-            'completed_topics': [],
-            'current_topic': None
-        }
+        """Mark section as started (progress of an interrupted run is kept for resume)."""
+        with self.lock:
+            previous = self.state.get(section_num, {})
+            if previous.get('status') != 'in_progress':
+                previous = {}
+            self.state[section_num] = {
+                'section_title': section_title,
+                'status': 'in_progress',
+                'total_topics': total_topics,
+                'completed_topics': previous.get('completed_topics', []),
+                'completed_subsections': previous.get('completed_subsections', []),
+                'current_topic': None
+            }
         self.save_state()
     
     def complete_subsection(self, section_num: str, topic_idx: int, subsection_idx: int):
         """Mark a subsection as completed."""
-        if section_num in self.state:
+        with self.lock:
+            if section_num not in self.state:
+                return
             key = f"{topic_idx}.{subsection_idx}"
             if 'completed_subsections' not in self.state[section_num]:
                 self.state[section_num]['completed_subsections'] = []
             
             if key not in self.state[section_num]['completed_subsections']:
                 self.state[section_num]['completed_subsections'].append(key)
-            
-            self.save_state()
+        self.save_state()
     
     def complete_topic(self, section_num: str, topic_idx: int):
         """Mark a topic as completed."""
-        if section_num in self.state:
+        with self.lock:
+            if section_num not in self.state:
+                return
             if topic_idx not in self.state[section_num]['completed_topics']:
                 self.state[section_num]['completed_topics'].append(topic_idx)
-            self.save_state()
+        self.save_state()
     
     def complete_section(self, section_num: str):
-        """Mark section as completed."""
-        if section_num in self.state:
+        """Mark section as completed (written immediately)."""
+        with self.lock:
+            if section_num not in self.state:
+                return
             self.state[section_num]['status'] = 'completed'
-            self.save_state()
+        self.save_state()
+        self.flush()
     
     def is_section_started(self, section_num: str) -> bool:
         """Check if section has been started."""
@@ -96,20 +112,24 @@ class ResumeManager:
     
     def clear_section(self, section_num: str):
         """Clear state for a section (for restart)."""
-        if section_num in self.state:
+        with self.lock:
+            if section_num not in self.state:
+                return
             del self.state[section_num]
-            self.save_state()
+        self.save_state()
+        self.flush()
     
     def get_summary(self) -> Dict:
         """Get summary of all sections."""
+        sections = self._snapshot()
         summary = {
-            'total_sections': len(self.state),
+            'total_sections': len(sections),
             'completed_sections': 0,
             'in_progress_sections': 0,
             'sections': {}
         }
         
-        for section_num, data in self.state.items():
+        for section_num, data in sections.items():
             status = data.get('status', 'unknown')
             if status == 'completed':
                 summary['completed_sections'] += 1
@@ -124,5 +144,15 @@ class ResumeManager:
         
         return summary
 
+_managers: Dict[str, ResumeManager] = {}
+_managers_lock = threading.Lock()
+
+def get_resume_manager(output_dir: str = "output") -> ResumeManager:
+    """Get the resume state of one output root (each batch job has its own)."""
+    with _managers_lock:
+        if output_dir not in _managers:
+            _managers[output_dir] = ResumeManager(os.path.join(output_dir, ".generation_state.json"))
+        return _managers[output_dir]
+
 # Global instance
-resume_manager = ResumeManager()
+resume_manager = get_resume_manager()
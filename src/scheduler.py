@@ -0,0 +1,249 @@
+"""
+Scheduler - One process-wide, fair admission queue for LLM calls
+
+Outlines, sections and subsections all run on their own threads, but every
+LLM call they make waits here for one of a global number of in-flight
+slots. Waiting calls are queued per job (the `job` cost label, e.g. the
+outline being generated) and slots are handed out round-robin across jobs,
+so one large outline can't starve the others. The limit follows the
+adaptive limiters of the providers in use (the tightest of them), capped by
+Config.MAX_IN_FLIGHT; a job can also be capped on its own.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Dict, Iterator, Optional, Union
+from src.config import Config
+from src.generator import LLMGenerator, GeneratorWrapper, default_max_tokens
+from src.cost_tracker import cost_tracker
+
+DEFAULT_LIMIT = 20  # Until a provider's limiter is registered
+
+class _Waiter:
+    """A queued call; grant() is called (under the scheduler lock) when it gets a slot."""
+    def __init__(self, job: str, loop: asyncio.AbstractEventLoop = None):
+        self.job = job
+        self.loop = loop
+        self.event = None if loop else threading.Event()
+        self.future = loop.create_future() if loop else None
+        self.queued_at = time.time()
+
+    def grant(self):
+        if self.loop:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+        else:
+            self.event.set()
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(True)
+
+class FairScheduler:
+    def __init__(self, limit: Union[int, Callable[[], int]] = None, max_in_flight: int = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            limit: Global in-flight limit, or a callable returning the current limit
+                   (default: the lowest limit of the registered adaptive limiters)
+            max_in_flight: Cap on the global limit (None = no cap)
+        """
+        self.lock = threading.Lock()
+        self.limit = limit
+        self.max_in_flight = max_in_flight
+        self.limiters = {}  # provider name -> AdaptiveLimiter
+        self.job_limits: Dict[str, int] = {}
+        self.in_flight = 0
+        self.queues: Dict[str, deque] = OrderedDict()  # job -> waiting calls, in rotation order
+        self.running: Dict[str, int] = {}
+        self.stats = {'calls': 0, 'queued_calls': 0, 'wait_seconds': 0.0, 'max_queue_depth': 0, 'max_in_flight': 0}
+
+    def configure(self, limit: Union[int, Callable[[], int]]):
+        """Change the global in-flight limit (None = follow the registered limiters)."""
+        with self.lock:
+            self.limit = limit
+            self._dispatch()
+
+    def add_limiter(self, limiter):
+        """Follow a provider's adaptive limiter (registering the same one again is a no-op)."""
+        with self.lock:
+            self.limiters[limiter.name] = limiter
+            self._dispatch()
+
+    def set_job_limit(self, job: str, limit: Optional[int]):
+        """Cap one job's in-flight calls (None or 0 removes the cap)."""
+        with self.lock:
+            if limit:
+                self.job_limits[job] = limit
+            else:
+                self.job_limits.pop(job, None)
+            self._dispatch()
+
+    def current_limit(self) -> int:
+        if self.limit is not None:
+            limit = self.limit() if callable(self.limit) else self.limit
+        elif self.limiters:
+            limit = min(limiter.limit for limiter in self.limiters.values())
+        else:
+            limit = DEFAULT_LIMIT
+        if self.max_in_flight:
+            limit = min(limit, self.max_in_flight)
+        return max(1, int(limit))
+
+    def _has_room(self, job: str) -> bool:
+        # Caller holds the lock
+        return self.running.get(job, 0) < self.job_limits.get(job, float('inf'))
+
+    def _enqueue(self, waiter: _Waiter) -> bool:
+        """Queue a call; returns True if it was admitted immediately."""
+        with self.lock:
+            self.stats['calls'] += 1
+            if not self.queues and self.in_flight < self.current_limit() and self._has_room(waiter.job):
+                self._start(waiter.job)
+                return True
+            self.queues.setdefault(waiter.job, deque()).append(waiter)
+            self.stats['queued_calls'] += 1
+            depth = sum(len(queue) for queue in self.queues.values())
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], depth)
+            self._dispatch()
+            return False
+
+    def _start(self, job: str):
+        self.in_flight += 1
+        self.running[job] = self.running.get(job, 0) + 1
+        self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self.in_flight)
+
+    def _dispatch(self):
+        """Hand free slots to queued calls, one job at a time (caller holds the lock)."""
+        limit = self.current_limit()
+        while self.queues and self.in_flight < limit:
+            # Jobs at their own cap keep their place in the rotation
+            job = next((job for job in self.queues if self._has_room(job)), None)
+            if job is None:
+                break
+            queue = self.queues[job]
+            waiter = queue.popleft()
+            # Round-robin: the job goes to the back of the rotation (or leaves it)
+            del self.queues[job]
+            if queue:
+                self.queues[job] = queue
+            self._start(job)
+            self.stats['wait_seconds'] += time.time() - waiter.queued_at
+            waiter.grant()
+
+    def _withdraw(self, waiter: _Waiter) -> bool:
+        """Remove a call that gave up waiting; returns False if it was already admitted."""
+        with self.lock:
+            queue = self.queues.get(waiter.job)
+            if queue is None or waiter not in queue:
+                return False
+            queue.remove(waiter)
+            if not queue:
+                del self.queues[waiter.job]
+            return True
+
+    def release(self, job: str):
+        """Free a slot and admit the next queued call."""
+        with self.lock:
+            self.in_flight -= 1
+            self.running[job] -= 1
+            if not self.running[job]:
+                del self.running[job]
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, job: str = None):
+        """
+        Hold one in-flight slot for the duration of the block.
+
+        Args:
+            job: Fairness key (defaults to the current `job` cost label)
+        """
+        job = job or _current_job()
+        waiter = _Waiter(job)
+        if not self._enqueue(waiter):
+            waiter.event.wait()
+        try:
+            yield
+        finally:
+            self.release(job)
+
+    @asynccontextmanager
+    async def aslot(self, job: str = None):
+        """Async counterpart of slot()."""
+        job = job or _current_job()
+        waiter = _Waiter(job, asyncio.get_running_loop())
+        if not self._enqueue(waiter):
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                # Give the slot back if it was granted while we were being cancelled
+                if not self._withdraw(waiter):
+                    self.release(job)
+                raise
+        try:
+            yield
+        finally:
+            self.release(job)
+
+    def get_stats(self) -> Dict:
+        """Counters plus current in-flight and queue depth per job."""
+        with self.lock:
+            return {
+                **self.stats,
+                'limit': self.current_limit(),
+                'in_flight': self.in_flight,
+                'queue_depth': sum(len(queue) for queue in self.queues.values()),
+                'jobs': {
+                    job: {'in_flight': self.running.get(job, 0), 'queued': len(self.queues.get(job, ()))}
+                    for job in sorted(set(self.running) | set(self.queues))
+                }
+            }
+
+    def print_summary(self):
+        """Print scheduler statistics."""
+        stats = self.get_stats()
+        avg_wait = stats['wait_seconds'] / stats['queued_calls'] if stats['queued_calls'] else 0.0
+        print(f"\n🚦 Scheduler:")
+        print(f"   Limit: {stats['limit']} | In flight: {stats['in_flight']} (peak {stats['max_in_flight']}) | "
+              f"Queued: {stats['queue_depth']} (peak {stats['max_queue_depth']})")
+        print(f"   Calls: {stats['calls']:,} | Had to wait: {stats['queued_calls']:,} | Avg wait: {avg_wait:.1f}s")
+        for job, counts in stats['jobs'].items():
+            print(f"     {job}: {counts['in_flight']} in flight, {counts['queued']} queued")
+
+def _current_job() -> str:
+    return str(cost_tracker.current_scope().get('job', "default"))
+
+class ScheduledGenerator(GeneratorWrapper):
+    """Wrap any LLMGenerator so every call takes a slot from the scheduler."""
+
+    def __init__(self, generator: LLMGenerator, scheduler: FairScheduler = None):
+        super().__init__(generator)
+        self.scheduler = scheduler or get_scheduler()
+
+    def generate(self, prompt: str, max_tokens: int = None) -> str:
+        with self.scheduler.slot():
+            return self.generator.generate(prompt, max_tokens or default_max_tokens(self.generator))
+
+    async def agenerate(self, prompt: str, max_tokens: int = None) -> str:
+        async with self.scheduler.aslot():
+            return await self.generator.agenerate(prompt, max_tokens or default_max_tokens(self.generator))
+
+    def stream(self, prompt: str, max_tokens: int = None) -> Iterator[str]:
+        # The slot is held until the stream is exhausted or closed; the inner
+        # stream's return value (False if cut short) is passed on
+        with self.scheduler.slot():
+            return (yield from self.generator.stream(prompt, max_tokens or default_max_tokens(self.generator)))
+
+_scheduler: Optional[FairScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler() -> FairScheduler:
+    """Get the process-wide scheduler (created on first use)."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = FairScheduler(max_in_flight=getattr(Config, 'MAX_IN_FLIGHT', None))
+        return _scheduler
@@ -0,0 +1,126 @@
+"""
+Single Flight - Coalesce identical requests that are in flight at the same time
+
+The first caller for a key runs the request; anyone asking for the same key
+before it finishes waits on the same future instead of spending another
+rate-limit slot and API quota. Works across threads and event loops. If the
+first caller is cancelled (or interrupted), the callers waiting on it retry
+and one of them takes over; a cancelled follower only stops waiting.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable
+from src.generator import LLMGenerator, GeneratorWrapper, default_max_tokens
+
+class _LeaderCancelled(Exception):
+    """Set on a shared call whose leader was cancelled; followers retry it."""
+
+class SingleFlight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls: Dict[Hashable, Future] = {}
+        self.stats = {'calls': 0, 'shared': 0}
+
+    def _join(self, key: Hashable):
+        """Return (future, is_leader) for key."""
+        with self.lock:
+            self.stats['calls'] += 1
+            future = self.calls.get(key)
+            if future is not None:
+                self.stats['shared'] += 1
+                return future, False
+            future = Future()
+            # A running future can't be cancelled, so a cancelled async
+            # follower (wrap_future) can't cancel it for everyone else
+            future.set_running_or_notify_cancel()
+            self.calls[key] = future
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future, result=None, error: BaseException = None):
+        # The key is released first, so retrying followers start a new call
+        with self.lock:
+            self.calls.pop(key, None)
+        if error is None:
+            future.set_result(result)
+        else:
+            # Errors are shared; a cancelled or interrupted leader makes followers retry
+            future.set_exception(error if isinstance(error, Exception) else _LeaderCancelled())
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) unless an identical call is already running.
+
+        Args:
+            key: Identity of the request
+            fn: Function performing the request
+
+        Returns:
+            The (possibly shared) result of fn
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            try:
+                return future.result()
+            except _LeaderCancelled:
+                continue
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    async def ado(self, key: Hashable, coro_fn: Callable, *args, **kwargs):
+        """Async version of do; coro_fn(*args, **kwargs) must return an awaitable."""
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            try:
+                return await asyncio.wrap_future(future)
+            except _LeaderCancelled:
+                continue
+
+        try:
+            result = await coro_fn(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    def get_stats(self) -> Dict:
+        """Get the number of calls and how many shared another call's result."""
+        with self.lock:
+            return dict(self.stats, in_flight=len(self.calls))
+
+def make_key(*parts) -> str:
+    """Build a request key from JSON-serialisable parts."""
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+class SingleFlightGenerator(GeneratorWrapper):
+    """Wrap any LLMGenerator so concurrent identical prompts make one API call."""
+
+    def __init__(self, generator: LLMGenerator, flight: SingleFlight = None):
+        super().__init__(generator)
+        self.flight = flight or SingleFlight()
+
+    def _key(self, prompt: str, max_tokens: int) -> str:
+        return make_key(self.provider, self.model_name, self.system_prompt, prompt, max_tokens, self.temperature)
+
+    def generate(self, prompt: str, max_tokens: int = None) -> str:
+        max_tokens = max_tokens or default_max_tokens(self.generator)
+        return self.flight.do(self._key(prompt, max_tokens), self.generator.generate, prompt, max_tokens)
+
+    async def agenerate(self, prompt: str, max_tokens: int = None) -> str:
+        max_tokens = max_tokens or default_max_tokens(self.generator)
+        return await self.flight.ado(self._key(prompt, max_tokens), self.generator.agenerate, prompt, max_tokens)
+
+    # stream() is inherited unchanged: a stream is consumed by one caller, so it is never shared
@@ -7,9 +7,41 @@ let isGenerating = false;
 // Init
 document.addEventListener('DOMContentLoaded', () => {
     refreshData();
-    setInterval(refreshData, 3000); // Poll every 3s
+    subscribeEvents();
 });
 
+// Progress is pushed by the server (Server-Sent Events); full state is only
+// re-fetched when something structural changes or after a reconnect gap
+function subscribeEvents() {
+    const events = new EventSource(`${API_URL}/events`);
+    const refreshOn = ['resync', 'section_started', 'section_done', 'job_queued', 'job_started', 'job_finished', 'job_cancelled'];
+
+    refreshOn.forEach(type => events.addEventListener(type, () => {
+        refreshData();
+        if (currentView === 'sections') loadSections();
+    }));
+
+    events.addEventListener('subsection_started', e => {
+        const data = JSON.parse(e.data);
+        document.getElementById('current-subsection').textContent = data.subsection;
+    });
+
+    events.addEventListener('subsection_done', e => {
+        const data = JSON.parse(e.data);
+        const pct = (data.completed_subsections / data.total_subsections) * 100;
+        document.getElementById('current-progress-bar').style.width = `${pct}%`;
+        if (data.eta_seconds !== null) {
+            const eta = `~${Math.ceil(data.eta_seconds / 60)} min left`;
+            document.getElementById('current-subsection').textContent += ` (${eta})`;
+        }
+    });
+
+    events.addEventListener('stream', e => {
+        const data = JSON.parse(e.data);
+        document.getElementById('system-text').textContent = `Generating... ${data.words_per_sec} words/s`;
+    });
+}
+
 function showView(viewName) {
     document.querySelectorAll('.view').forEach(el => el.classList.remove('active'));
     document.querySelectorAll('.nav-btn').forEach(el => el.classList.remove('active'));
@@ -120,7 +152,8 @@ async function startGeneration(sectionNum) {
         try {
             const res = await fetch(`${API_URL}/generate/${sectionNum}`, { method: 'POST' });
             if (res.ok) {
-                alert('Generation started!');
+                const job = await res.json();
+                alert(job.status === 'complete' ? 'This section is already generated.' : 'Generation started!');
                 refreshData();
             } else {
                 const err = await res.json();
@@ -1,8 +1,32 @@
 """
 Syllabus Parser - Reads the input syllabus and extracts sections
 """
-from typing import List, Dict
+from typing import List, Dict, Tuple
+import os
 import re
+import threading
+
+_cache: Dict[str, Tuple[Tuple[int, int], List[Dict[str, str]]]] = {}
+_cache_lock = threading.Lock()
+
+def load_syllabus(filepath: str) -> List[Dict[str, str]]:
+    """
+    parse_syllabus with a cache validated by the file's mtime and size, so
+    repeated lookups (menus, API requests) don't re-read an unchanged outline.
+    
+    Returns:
+        A fresh list of section dicts (safe to modify)
+    """
+    stat = os.stat(filepath)
+    key = os.path.abspath(filepath)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, parse_syllabus(filepath))
+        with _cache_lock:
+            _cache[key] = cached
+    return [dict(section) for section in cached[1]]
 
 def parse_syllabus(filepath: str) -> List[Dict[str, str]]:
     """
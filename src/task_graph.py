@@ -0,0 +1,138 @@
+"""
+Task Graph - Dependency-driven scheduling on one long-lived worker pool
+
+Work is added as named nodes with explicit dependencies. A node is
+submitted the moment its last dependency finishes, so a slow node only
+delays the nodes that actually need its result. Nodes may add further
+nodes while running (e.g. planning a topic adds its subsection nodes).
+"""
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List
+
+class TaskGraph:
+    def __init__(self, executor: ThreadPoolExecutor):
+        """
+        Initialize an empty graph.
+
+        Args:
+            executor: Pool the nodes run on (shared across graphs)
+        """
+        self.executor = executor
+        self.lock = threading.Lock()
+        self.futures: Dict[str, Future] = {}
+        self.waiting: Dict[str, int] = {}
+        self.dependents: Dict[str, List[str]] = {}
+        self.calls: Dict[str, tuple] = {}
+        self.cancelled = False
+
+    def add(self, name: str, fn: Callable, *args, deps: Iterable[str] = ()) -> Future:
+        """
+        Add a node that runs fn(*args) once every node in deps has succeeded.
+
+        The node runs in a copy of the caller's context (so cost labels carry
+        over). If a dependency fails, the node fails with the same exception.
+
+        Returns:
+            Future for the node's result
+        """
+        deps = list(deps)
+        context = contextvars.copy_context()
+        with self.lock:
+            if name in self.futures:
+                raise ValueError(f"Duplicate task: {name}")
+            future = Future()
+            self.futures[name] = future
+            self.calls[name] = (context, fn, args)
+
+            pending = 0
+            failed = None
+            for dep in deps:
+                dep_future = self.futures[dep]
+                if not dep_future.done():
+                    pending += 1
+                    self.dependents.setdefault(dep, []).append(name)
+                elif dep_future.exception() is not None:
+                    failed = dep_future.exception()
+            self.waiting[name] = pending
+
+        if failed is not None:
+            self._fail(name, failed)
+        elif pending == 0:
+            self._submit(name)
+        return future
+
+    def future(self, name: str) -> Future:
+        """Future of an existing node."""
+        with self.lock:
+            return self.futures[name]
+
+    def result(self, name: str, timeout: float = None):
+        """Block until a node finishes and return its result."""
+        return self.future(name).result(timeout)
+
+    def cancel(self):
+        """Stop scheduling nodes that haven't started yet."""
+        with self.lock:
+            self.cancelled = True
+            futures = list(self.futures.values())
+        for future in futures:
+            if not future.done():
+                future.cancel()
+
+    def _submit(self, name: str):
+        with self.lock:
+            context, fn, args = self.calls.pop(name)
+            future = self.futures[name]
+            if self.cancelled or not future.set_running_or_notify_cancel():
+                return
+        self.executor.submit(context.run, self._run, name, fn, args)
+
+    def _run(self, name: str, fn: Callable, args: tuple):
+        future = self.futures[name]
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            future.set_exception(e)
+            self._release(name, e)
+        else:
+            future.set_result(result)
+            self._release(name, None)
+
+    def _fail(self, name: str, error: BaseException):
+        with self.lock:
+            self.calls.pop(name, None)
+            future = self.futures[name]
+        if future.set_running_or_notify_cancel():
+            future.set_exception(error)
+        self._release(name, error)
+
+    def _release(self, name: str, error):
+        """Unblock (or fail) the dependents of a finished node."""
+        ready, failed = [], []
+        with self.lock:
+            for dependent in self.dependents.pop(name, []):
+                if error is not None:
+                    if self.waiting[dependent] > 0:
+                        self.waiting[dependent] = -1
+                        failed.append(dependent)
+                    continue
+                if self.waiting[dependent] > 0:
+                    self.waiting[dependent] -= 1
+                    if self.waiting[dependent] == 0:
+                        ready.append(dependent)
+        for dependent in failed:
+            self._fail(dependent, error)
+        for dependent in ready:
+            self._submit(dependent)
+
+_pools: Dict[str, ThreadPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+def get_pool(name: str = "llm", max_workers: int = 20) -> ThreadPoolExecutor:
+    """Get a long-lived worker pool shared by every graph (created on first use)."""
+    with _pools_lock:
+        if name not in _pools:
+            _pools[name] = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-graph")
+        return _pools[name]
@@ -1,27 +1,37 @@
 """
 Textbook Planner - Hierarchical expansion for textbook sections
 """
-from typing import List
+import asyncio
+import contextvars
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+from src.config import Config
 from src.generator import LLMGenerator
+from src.cost_tracker import cost_tracker
+from src.adaptive_limiter import limiter_for
+from src.task_graph import get_pool
 
 class Topic:
     def __init__(self, title: str, subsections: List[str] = None):
         self.title = title
         self.subsections = subsections or []
 
-def expand_section_to_topics(generator: LLMGenerator, section_title: str, num_topics: int = 15) -> List[Topic]:
-    """
-    Expand a section into multiple topics.
-    
-    Args:
-        generator: LLM generator
-        section_title: The section title (e.g., "Digital and Online Research Methods")
-        num_topics: Number of topics to generate
-    
-    Returns:
-        List of Topic objects
-    """
-    prompt = f"""You are creating a detailed university textbook chapter section.
+def _parse_numbered_list(response: str) -> List[str]:
+    """Extract the items of a numbered or dashed list from an LLM response."""
+    items = []
+    lines = response.split('\n')
+    for line in lines:
+        line = line.strip()
+        if line and (line[0].isdigit() or line.startswith('-')):
+            # Remove numbering
+            item_text = line.split('.', 1)[-1].strip()
+            if item_text:
+                items.append(item_text)
+    return items
+
+def _topics_prompt(section_title: str, num_topics: int) -> str:
+    return f"""You are creating a detailed university textbook chapter section.
 
 Section Title: {section_title}
 
@@ -39,18 +49,9 @@ REQUIREMENTS:
 
 Generate {num_topics} topics now:"""
 
-    response = generator.generate(prompt, max_tokens=2000)
-    
+def _topics_from_response(response: str, section_title: str, num_topics: int) -> List[Topic]:
     # Parse the response
-    topics = []
-    lines = response.split('\n')
-    for line in lines:
-        line = line.strip()
-        if line and (line[0].isdigit() or line.startswith('-')):
-            # Remove numbering
-            topic_text = line.split('.', 1)[-1].strip()
-            if topic_text:
-                topics.append(Topic(title=topic_text))
+    topics = [Topic(title=title) for title in _parse_numbered_list(response)]
     
     # Fallback if parsing failed
     if not topics:
@@ -60,20 +61,30 @@ Generate {num_topics} topics now:"""
     
     return topics[:num_topics]
 
-def expand_topic_to_subsections(generator: LLMGenerator, section_title: str, topic: Topic, num_subsections: int = 4) -> List[str]:
+def expand_section_to_topics(generator: LLMGenerator, section_title: str, num_topics: int = 15) -> List[Topic]:
     """
-    Expand a topic into subsections.
+    Expand a section into multiple topics.
     
     Args:
         generator: LLM generator
-        section_title: The parent section title
-        topic: The Topic object
-        num_subsections: Number of subsections
+        section_title: The section title (e.g., "Digital and Online Research Methods")
+        num_topics: Number of topics to generate
     
     Returns:
-        List of subsection titles
+        List of Topic objects
     """
-    prompt = f"""You are creating a detailed university textbook.
+    with cost_tracker.scope(call_site="planning"):
+        response = generator.generate(_topics_prompt(section_title, num_topics), max_tokens=2000)
+    return _topics_from_response(response, section_title, num_topics)
+
+async def aexpand_section_to_topics(generator: LLMGenerator, section_title: str, num_topics: int = 15) -> List[Topic]:
+    """Async counterpart of expand_section_to_topics."""
+    with cost_tracker.scope(call_site="planning"):
+        response = await generator.agenerate(_topics_prompt(section_title, num_topics), max_tokens=2000)
+    return _topics_from_response(response, section_title, num_topics)
+
+def _subsections_prompt(section_title: str, topic: Topic, num_subsections: int) -> str:
+    return f"""You are creating a detailed university textbook.
 
 Section: {section_title}
 Topic: {topic.title}
@@ -92,17 +103,9 @@ REQUIREMENTS:
 
 Generate {num_subsections} subsections now:"""
 
-    response = generator.generate(prompt, max_tokens=1500)
-    
+def _subsections_from_response(response: str, num_subsections: int) -> List[str]:
     # Parse
-    subsections = []
-    lines = response.split('\n')
-    for line in lines:
-        line = line.strip()
-        if line and (line[0].isdigit() or line.startswith('-')):
-            subsection_text = line.split('.', 1)[-1].strip()
-            if subsection_text:
-                subsections.append(subsection_text)
+    subsections = _parse_numbered_list(response)
     
     # Fallback
     if not subsections:
@@ -110,3 +113,204 @@ Generate {num_subsections} subsections now:"""
             subsections.append(f"Subsection {i}")
     
     return subsections[:num_subsections]
+
+def expand_topic_to_subsections(generator: LLMGenerator, section_title: str, topic: Topic, num_subsections: int = 4) -> List[str]:
+    """
+    Expand a topic into subsections.
+    
+    Args:
+        generator: LLM generator
+        section_title: The parent section title
+        topic: The Topic object
+        num_subsections: Number of subsections
+    
+    Returns:
+        List of subsection titles
+    """
+    with cost_tracker.scope(call_site="planning"):
+        response = generator.generate(_subsections_prompt(section_title, topic, num_subsections), max_tokens=1500)
+    return _subsections_from_response(response, num_subsections)
+
+async def aexpand_topic_to_subsections(generator: LLMGenerator, section_title: str, topic: Topic, num_subsections: int = 4) -> List[str]:
+    """Async counterpart of expand_topic_to_subsections."""
+    with cost_tracker.scope(call_site="planning"):
+        response = await generator.agenerate(_subsections_prompt(section_title, topic, num_subsections), max_tokens=1500)
+    return _subsections_from_response(response, num_subsections)
+
+def expand_topics_to_subsections(generator: LLMGenerator, section_title: str, topics: List[Topic], num_subsections: int = 4) -> List[Topic]:
+    """
+    Expand every topic of a section into subsections concurrently.
+    
+    Calls run on a shared planning pool and still go through the provider's
+    adaptive limiter, so the whole batch takes roughly as long as one call
+    when the limit allows.
+    
+    Args:
+        generator: LLM generator
+        section_title: The parent section title
+        topics: Topics to expand (their subsections are filled in)
+        num_subsections: Number of subsections per topic
+    
+    Returns:
+        The same topics, with subsections set
+    """
+    pool = get_pool("planning", limiter_for(generator).max_limit)
+    futures = [
+        # Copy the caller's context so usage keeps its cost labels
+        pool.submit(contextvars.copy_context().run, expand_topic_to_subsections, generator, section_title, topic, num_subsections)
+        for topic in topics
+    ]
+    for topic, future in zip(topics, futures):
+        topic.subsections = future.result()
+    return topics
+
+async def aexpand_topics_to_subsections(generator: LLMGenerator, section_title: str, topics: List[Topic], num_subsections: int = 4) -> List[Topic]:
+    """Async counterpart of expand_topics_to_subsections."""
+    subsection_lists = await asyncio.gather(*[
+        aexpand_topic_to_subsections(generator, section_title, topic, num_subsections)
+        for topic in topics
+    ])
+    for topic, subsections in zip(topics, subsection_lists):
+        topic.subsections = subsections
+    return topics
+
+def _outline_prompt(section_title: str, num_topics: int, num_subsections: int) -> str:
+    return f"""You are creating a detailed university textbook chapter section.
+
+Section Title: {section_title}
+
+Your task: Plan the full structure of this section in one step.
+Break it into {num_topics} major topics, and break each topic into {num_subsections} subsections.
+
+REQUIREMENTS:
+- Each topic should be a distinct, important aspect of {section_title}
+- Topics should be comprehensive and cover the full scope
+- Each subsection should cover a specific aspect of its topic
+- Use clear, academic language
+- Return ONLY valid JSON in exactly this shape, with no other text:
+{{
+  "topics": [
+    {{"title": "Topic Title One", "subsections": ["Subsection One", "Subsection Two"]}}
+  ]
+}}
+
+Generate {num_topics} topics with {num_subsections} subsections each now:"""
+
+def _extract_json(response: str) -> Optional[dict]:
+    """Parse the JSON object in an LLM response (tolerates code fences and chatter)."""
+    start, end = response.find('{'), response.rfind('}')
+    if start == -1 or end <= start:
+        return None
+    try:
+        data = json.loads(response[start:end + 1])
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+def _is_title_list(value, minimum: int) -> bool:
+    return (
+        isinstance(value, list) and len(value) >= minimum
+        and all(isinstance(item, str) and item.strip() for item in value)
+    )
+
+def _outline_from_response(response: str, num_topics: int, num_subsections: int) -> Optional[List[Topic]]:
+    """
+    Validate a structured outline against the expected schema.
+    
+    Returns:
+        Topics (a topic whose subsections failed validation has none), or None
+        if the topic list itself is unusable
+    """
+    data = _extract_json(response)
+    entries = data.get('topics') if data else None
+    if not isinstance(entries, list):
+        return None
+    
+    topics = []
+    for entry in entries[:num_topics]:
+        if not isinstance(entry, dict) or not isinstance(entry.get('title'), str) or not entry['title'].strip():
+            continue
+        subsections = entry.get('subsections')
+        topic = Topic(title=entry['title'].strip())
+        if _is_title_list(subsections, num_subsections):
+            topic.subsections = [item.strip() for item in subsections[:num_subsections]]
+        topics.append(topic)
+    return topics or None
+
+def plan_section_structured(generator: LLMGenerator, section_title: str, num_topics: int = 15, num_subsections: int = 4) -> Tuple[List[Topic], Dict]:
+    """
+    Plan a whole section with one structured (JSON) call.
+    
+    Topics whose subsection lists fail validation are expanded individually;
+    if the topic list itself can't be used, the per-topic planner runs instead.
+    
+    Returns:
+        (topics, timings) like plan_section, plus fallback_topics
+    """
+    start = time.time()
+    with cost_tracker.scope(call_site="planning"):
+        response = generator.generate(_outline_prompt(section_title, num_topics, num_subsections), max_tokens=4000)
+    topics = _outline_from_response(response, num_topics, num_subsections)
+    outline_done = time.time()
+    
+    if topics is None:
+        print(f"Warning: Structured outline failed validation. Planning topic by topic.")
+        topics, timings = _plan_per_topic(generator, section_title, num_topics, num_subsections)
+        timings['topics_seconds'] += outline_done - start
+        timings['total_seconds'] += outline_done - start
+        timings['fallback_topics'] = len(topics)
+        return topics, timings
+    
+    # Only the branches that failed validation go back to the per-topic path
+    failed = [topic for topic in topics if not topic.subsections]
+    if failed:
+        expand_topics_to_subsections(generator, section_title, failed, num_subsections)
+    end = time.time()
+    
+    timings = {
+        'topics_seconds': outline_done - start,
+        'subsections_seconds': end - outline_done,
+        'total_seconds': end - start,
+        'fallback_topics': len(failed)
+    }
+    return topics, timings
+
+def _plan_per_topic(generator: LLMGenerator, section_title: str, num_topics: int, num_subsections: int) -> Tuple[List[Topic], Dict]:
+    start = time.time()
+    topics = expand_section_to_topics(generator, section_title, num_topics)
+    topics_done = time.time()
+    expand_topics_to_subsections(generator, section_title, topics, num_subsections)
+    end = time.time()
+    
+    timings = {
+        'topics_seconds': topics_done - start,
+        'subsections_seconds': end - topics_done,
+        'total_seconds': end - start
+    }
+    return topics, timings
+
+def plan_section(generator: LLMGenerator, section_title: str, num_topics: int = 15, num_subsections: int = 4, mode: str = None) -> Tuple[List[Topic], Dict]:
+    """
+    Plan a whole section: topics, then all subsection lists at once.
+    
+    Args:
+        mode: "structured" (one JSON call) or "per_topic" (1 + one call per topic);
+              defaults to Config.PLANNER_MODE
+    
+    Returns:
+        (topics, timings) where timings has topics_seconds, subsections_seconds and total_seconds
+    """
+    mode = mode or getattr(Config, 'PLANNER_MODE', "per_topic")
+    if mode == "structured":
+        return plan_section_structured(generator, section_title, num_topics, num_subsections)
+    return _plan_per_topic(generator, section_title, num_topics, num_subsections)
+
+def format_planning_time(timings: Dict) -> str:
+    """One-line planning latency report."""
+    if timings.get('reused'):
+        return "reused stored plan (no planning calls)"
+    report = (f"planning took {timings['total_seconds']:.1f}s "
+              f"(topics {timings['topics_seconds']:.1f}s + subsections {timings['subsections_seconds']:.1f}s)")
+    if timings.get('fallback_topics'):
+        report += f", {timings['fallback_topics']} topics re-planned individually"
+    return report
@@ -1,29 +1,40 @@
 """
 Textbook Writer - Generates academic content following Master Command style
 """
+from typing import Callable, Optional
 from src.generator import LLMGenerator
+from src.cost_tracker import cost_tracker
 
-def write_subsection(
-    generator: LLMGenerator,
-    section_title: str,
-    topic_title: str,
-    subsection_title: str,
-    target_words: int = 1000
-) -> str:
+class StreamInterrupted(Exception):
+    """Raised when a streamed response stalls or is cut short (its partial text is discarded)."""
+
+def _generate(generator: LLMGenerator, prompt: str, max_tokens: int, on_chunk: Optional[Callable[[str], None]], call_site: str) -> str:
     """
-    Write a subsection of the textbook.
-    
-    Args:
-        generator: LLM generator
-        section_title: Parent section
-        topic_title: Parent topic
-        subsection_title: Current subsection
-        target_words: Target word count
+    Generate text, streaming chunks to on_chunk as they arrive when given.
     
-    Returns:
-        Generated content
+    Raises:
+        StreamInterrupted: If the stream ended early, so partial text is never stored
     """
-    prompt = f"""You are writing a university-level textbook for postgraduate social science students, with a focus on African and South Sudan contexts.
+    with cost_tracker.scope(call_site=call_site):
+        if on_chunk is None:
+            return generator.generate(prompt, max_tokens=max_tokens)
+        
+        chunks = []
+        stream = generator.stream(prompt, max_tokens=max_tokens)
+        while True:
+            try:
+                chunk = next(stream)
+            except StopIteration as stop:
+                completed = stop.value
+                break
+            chunks.append(chunk)
+            on_chunk(chunk)
+        if completed is False:
+            raise StreamInterrupted(f"{call_site}: stream ended after {len(chunks)} chunks")
+        return "".join(chunks)
+
+def _subsection_prompt(section_title: str, topic_title: str, subsection_title: str, target_words: int) -> str:
+    return f"""You are writing a university-level textbook for postgraduate social science students, with a focus on African and South Sudan contexts.
 
 SECTION: {section_title}
 TOPIC: {topic_title}
@@ -118,28 +129,48 @@ Include at least 2 figures and 1 table with detailed explanations.
 
 Begin writing now:"""
 
-    response = generator.generate(prompt, max_tokens=4000)
-    return response
-
-def write_section_introduction(
+def write_subsection(
     generator: LLMGenerator,
     section_title: str,
-    topics: list
+    topic_title: str,
+    subsection_title: str,
+    target_words: int = 1000,
+    on_chunk: Optional[Callable[[str], None]] = None
 ) -> str:
     """
-    Write an introduction for the entire section.
+    Write a subsection of the textbook.
     
     Args:
         generator: LLM generator
-        section_title: Section title
-        topics: List of Topic objects
+        section_title: Parent section
+        topic_title: Parent topic
+        subsection_title: Current subsection
+        target_words: Target word count
+        on_chunk: Optional callback receiving streamed text as it arrives
     
     Returns:
-        Introduction text
+        Generated content
     """
+    prompt = _subsection_prompt(section_title, topic_title, subsection_title, target_words)
+    response = _generate(generator, prompt, 4000, on_chunk, "subsection")
+    return response
+
+async def awrite_subsection(
+    generator: LLMGenerator,
+    section_title: str,
+    topic_title: str,
+    subsection_title: str,
+    target_words: int = 1000
+) -> str:
+    """Async counterpart of write_subsection."""
+    prompt = _subsection_prompt(section_title, topic_title, subsection_title, target_words)
+    with cost_tracker.scope(call_site="subsection"):
+        return await generator.agenerate(prompt, max_tokens=4000)
+
+def _introduction_prompt(section_title: str, topics: list) -> str:
     topics_list = ", ".join([t.title for t in topics])
     
-    prompt = f"""You are writing a university-level textbook introduction.
+    return f"""You are writing a university-level textbook introduction.
 
 SECTION: {section_title}
 
@@ -163,28 +194,41 @@ Use English ONLY. No non-English characters.
 
 Write the introduction now in flowing paragraphs:"""
 
-    response = generator.generate(prompt, max_tokens=2000)
-    return response
-
-def write_section_summary(
+def write_section_introduction(
     generator: LLMGenerator,
     section_title: str,
-    topics: list
+    topics: list,
+    on_chunk: Optional[Callable[[str], None]] = None
 ) -> str:
     """
-    Write a summary and reflection for the section.
+    Write an introduction for the entire section.
     
     Args:
         generator: LLM generator
         section_title: Section title
         topics: List of Topic objects
+        on_chunk: Optional callback receiving streamed text as it arrives
     
     Returns:
-        Summary text
+        Introduction text
     """
+    prompt = _introduction_prompt(section_title, topics)
+    response = _generate(generator, prompt, 2000, on_chunk, "introduction")
+    return response
+
+async def awrite_section_introduction(
+    generator: LLMGenerator,
+    section_title: str,
+    topics: list
+) -> str:
+    """Async counterpart of write_section_introduction."""
+    with cost_tracker.scope(call_site="introduction"):
+        return await generator.agenerate(_introduction_prompt(section_title, topics), max_tokens=2000)
+
+def _summary_prompt(section_title: str, topics: list) -> str:
     topics_list = ", ".join([t.title for t in topics])
     
-    prompt = f"""You are writing a university-level textbook section summary.
+    return f"""You are writing a university-level textbook section summary.
 
 SECTION: {section_title}
 
@@ -211,5 +255,33 @@ Use English ONLY. No non-English characters.
 
 Write the summary now in flowing paragraphs:"""
 
-    response = generator.generate(prompt, max_tokens=2500)
+def write_section_summary(
+    generator: LLMGenerator,
+    section_title: str,
+    topics: list,
+    on_chunk: Optional[Callable[[str], None]] = None
+) -> str:
+    """
+    Write a summary and reflection for the section.
+    
+    Args:
+        generator: LLM generator
+        section_title: Section title
+        topics: List of Topic objects
+        on_chunk: Optional callback receiving streamed text as it arrives
+    
+    Returns:
+        Summary text
+    """
+    prompt = _summary_prompt(section_title, topics)
+    response = _generate(generator, prompt, 2500, on_chunk, "summary")
     return response
+
+async def awrite_section_summary(
+    generator: LLMGenerator,
+    section_title: str,
+    topics: list
+) -> str:
+    """Async counterpart of write_section_summary."""
+    with cost_tracker.scope(call_site="summary"):
+        return await generator.agenerate(_summary_prompt(section_title, topics), max_tokens=2500)
@@ -0,0 +1,151 @@
+"""
+Token Bucket - Rate limits shared by every process on the machine
+
+Each named resource (e.g. "semantic_scholar", "deepseek_requests",
+"deepseek_tokens") is a token bucket whose state lives in a 16-byte
+memory-mapped file. A caller takes the file lock only long enough to
+refill the bucket and reserve its tokens, then sleeps *outside* the lock
+for however long the reservation put the bucket into debt, so waiting
+callers never block each other.
+
+Limits come from a RATE_LIMITS config dict:
+    {"semantic_scholar": {"per_minute": 60, "burst": 1}, ...}
+Resources without an entry are not limited.
+"""
+import asyncio
+import fcntl
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+DEFAULT_STATE_DIR = os.path.join(tempfile.gettempdir(), "book_rate_limits")
+
+# tokens available, time of last refill
+_STATE = struct.Struct("<dd")
+
+class TokenBucket:
+    def __init__(self, name: str, per_minute: float, burst: float = None, state_dir: str = DEFAULT_STATE_DIR):
+        """
+        Initialize a bucket.
+
+        Args:
+            name: Resource name (also the state file name)
+            per_minute: Refill rate in tokens per minute
+            burst: Bucket capacity (defaults to one second of refill, at least 1)
+            state_dir: Directory holding the shared state files
+        """
+        self.name = name
+        self.rate = per_minute / 60.0
+        self.burst = float(burst) if burst else max(1.0, self.rate)
+        self.lock = threading.Lock()
+
+        os.makedirs(state_dir, exist_ok=True)
+        self.state_file = os.path.join(state_dir, f"{name}.bucket")
+        self.fd = os.open(self.state_file, os.O_RDWR | os.O_CREAT, 0o666)
+        with self._locked(init=True):
+            pass
+
+    @contextmanager
+    def _locked(self, init: bool = False):
+        # Threads share this process's file description, so flock alone won't exclude them
+        with self.lock:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                if init:
+                    if os.fstat(self.fd).st_size < _STATE.size:
+                        os.ftruncate(self.fd, _STATE.size)
+                        os.pwrite(self.fd, _STATE.pack(self.burst, time.time()), 0)
+                    self.mm = mmap.mmap(self.fd, _STATE.size)
+                yield
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    def reserve(self, cost: float = 1) -> float:
+        """
+        Take cost tokens (the bucket may go into debt).
+
+        Returns:
+            Seconds the caller must wait before using the reservation
+        """
+        with self._locked():
+            tokens, last = _STATE.unpack_from(self.mm)
+            now = time.time()
+            tokens = min(self.burst, tokens + max(0.0, now - last) * self.rate)
+            tokens -= cost
+            _STATE.pack_into(self.mm, 0, tokens, now)
+        return max(0.0, -tokens / self.rate) if self.rate > 0 else 0.0
+
+    def available(self) -> float:
+        """Tokens currently in the bucket (negative while in debt)."""
+        with self._locked():
+            tokens, last = _STATE.unpack_from(self.mm)
+        return min(self.burst, tokens + max(0.0, time.time() - last) * self.rate)
+
+_specs: Dict[str, Dict] = {}
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+_state_dir = DEFAULT_STATE_DIR
+
+def configure(limits: Dict[str, Dict], state_dir: str = None):
+    """
+    Set (or change) the limits for named resources.
+
+    Args:
+        limits: Resource name -> {"per_minute": ..., "burst": ...}
+        state_dir: Directory for the shared state files
+    """
+    global _state_dir
+    with _buckets_lock:
+        if state_dir and state_dir != _state_dir:
+            _state_dir = state_dir
+            _buckets.clear()
+        for name, spec in (limits or {}).items():
+            if _specs.get(name) != spec:
+                _specs[name] = dict(spec)
+                _buckets.pop(name, None)
+
+def get_bucket(name: str) -> Optional[TokenBucket]:
+    """Get the bucket for a resource, or None if it has no limit."""
+    with _buckets_lock:
+        if name not in _buckets:
+            spec = _specs.get(name)
+            if not spec or not spec.get('per_minute'):
+                return None
+            _buckets[name] = TokenBucket(name, spec['per_minute'], spec.get('burst'), _state_dir)
+        return _buckets[name]
+
+def reserve(costs: Dict[str, float]) -> float:
+    """Reserve tokens on several resources; returns the longest wait needed."""
+    wait = 0.0
+    for name, cost in costs.items():
+        bucket = get_bucket(name)
+        if bucket and cost:
+            wait = max(wait, bucket.reserve(cost))
+    return wait
+
+def acquire(costs: Dict[str, float]) -> float:
+    """Reserve tokens and sleep until they are available. Returns the time waited."""
+    wait = reserve(costs)
+    if wait > 0:
+        time.sleep(wait)
+    return wait
+
+async def aacquire(costs: Dict[str, float]) -> float:
+    """Async version of acquire (sleeps without blocking the event loop)."""
+    wait = reserve(costs)
+    if wait > 0:
+        await asyncio.sleep(wait)
+    return wait
+
+def charge(resource: str, cost: float):
+    """Record usage known only after a call (e.g. output tokens) without waiting."""
+    reserve({resource: cost})
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token)."""
+    return len(text) // 4 + 1
@@ -0,0 +1,83 @@
+import sys
+import os
+import asyncio
+import threading
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.adaptive_limiter import AdaptiveLimiter, feeder_workers
+
+def test_additive_increase_and_backoff():
+    limiter = AdaptiveLimiter("test", initial=2, max_limit=5)
+
+    # Flat latency grows the limit by about one slot per round of calls
+    for _ in range(20):
+        limiter.on_success(1.0, "prose")
+    assert limiter.limit == 5, limiter.get_stats()
+
+    # A burst of 429s only halves the limit once per round trip
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.limit == 2, limiter.get_stats()
+    print("✅ AIMD verification passed!")
+
+def test_slot_settles_status():
+    limiter = AdaptiveLimiter("test", initial=4)
+    with limiter.slot("plan") as call:
+        assert limiter.in_flight == 1
+        call.observe(429)
+    assert limiter.in_flight == 0
+    assert limiter.stats['throttled'] == 1 and limiter.limit == 2
+
+    assert feeder_workers(limiter, calls_per_task=4) == 5
+    print("✅ Slot verification passed!")
+
+def test_dropped_connections_count_as_timeouts():
+    limiter = AdaptiveLimiter("test", initial=4)
+    for error in (ConnectionResetError("stream stalled"), asyncio.TimeoutError()):
+        try:
+            with limiter.slot("prose"):
+                raise error
+        except type(error):
+            pass
+    assert limiter.stats['timeouts'] == 2 and limiter.limit == 2, limiter.get_stats()
+
+    # Other errors (e.g. a bad request body) don't shrink the limit
+    try:
+        with limiter.slot("prose"):
+            raise ValueError("bad payload")
+    except ValueError:
+        pass
+    assert limiter.stats['timeouts'] == 2 and limiter.limit == 2
+    print("✅ Timeout classification verification passed!")
+
+def test_async_slot_wakes_on_release():
+    limiter = AdaptiveLimiter("test", initial=1)
+    limiter.acquire()
+
+    async def main():
+        # A cancelled waiter gives up without taking the slot
+        cancelled = asyncio.ensure_future(limiter.aslot().__aenter__())
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+
+        async def call():
+            async with limiter.aslot():
+                return limiter.in_flight
+
+        waiting = asyncio.ensure_future(call())
+        await asyncio.sleep(0.01)
+        assert not waiting.done() and len(limiter.async_waiters) == 1
+        threading.Timer(0.05, limiter.release).start()
+        return await asyncio.wait_for(waiting, 1)
+
+    assert asyncio.run(main()) == 1
+    assert limiter.in_flight == 0 and not limiter.async_waiters
+    print("✅ Async slot wakeup verification passed!")
+
+if __name__ == "__main__":
+    test_additive_increase_and_backoff()
+    test_slot_settles_status()
+    test_dropped_connections_count_as_timeouts()
+    test_async_slot_wakes_on_release()
@@ -0,0 +1,97 @@
+import sys
+import os
+import asyncio
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.generator import LLMGenerator
+from src.scheduler import FairScheduler, ScheduledGenerator
+from src.async_pipeline import run_sections_async
+from src.content_store import get_content_store
+from src.manifest import get_manifest
+from src.job_runner import JobSpec, run_job
+
+SECTIONS = [
+    {'chapter': "Chapter 1: Basics", 'section_number': "1", 'section_title': "Cells"},
+    {'chapter': "Chapter 1: Basics", 'section_number': "2", 'section_title': "Tissues"},
+]
+
+class AsyncMockGenerator(LLMGenerator):
+    provider = "mock"
+
+    def __init__(self, fail_after: int = None):
+        self.calls = 0
+        self.fail_after = fail_after
+        self.in_flight = 0
+        self.peak = 0
+
+    def generate(self, prompt, max_tokens=2000):
+        return "Topic One\nTopic Two"
+
+    async def agenerate(self, prompt, max_tokens=2000):
+        self.calls += 1
+        if self.fail_after is not None and self.calls > self.fail_after:
+            return ""  # What provider generators return when a call fails
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        return "Topic One\nTopic Two"
+
+def test_calls_are_admitted_by_the_scheduler():
+    output_dir = tempfile.mkdtemp()
+    scheduler = FairScheduler(limit=3)
+    inner = AsyncMockGenerator()
+    results = run_sections_async(ScheduledGenerator(inner, scheduler), SECTIONS, output_dir)
+
+    assert [results[s['section_number']]['status'] for s in SECTIONS] == ["completed", "completed"], results
+    assert 1 < inner.peak <= 3, inner.peak
+    assert scheduler.get_stats()['calls'] == inner.calls
+    assert get_manifest(output_dir).is_complete("1", "Cells")
+    print("✅ Async scheduler admission verification passed!")
+
+def test_interrupted_run_resumes_from_stored_pieces():
+    output_dir = tempfile.mkdtemp()
+    failing = AsyncMockGenerator(fail_after=20)
+    results = run_sections_async(failing, SECTIONS[:1], output_dir)
+    assert 'error' in results["1"], results
+    assert not get_manifest(output_dir).is_complete("1", "Cells")
+    assert os.listdir(os.path.join(output_dir, ".content", "1"))
+
+    # Only the missing pieces are generated again, then the section is skipped
+    retry = AsyncMockGenerator()
+    assert run_sections_async(retry, SECTIONS[:1], output_dir)["1"]['status'] == "completed"
+    assert 0 < retry.calls < failing.calls, (retry.calls, failing.calls)
+    again = AsyncMockGenerator()
+    assert run_sections_async(again, SECTIONS[:1], output_dir)["1"]['status'] == "skipped"
+    assert again.calls == 0
+
+    # Restart discards stored text
+    assert run_sections_async(AsyncMockGenerator(), SECTIONS[:1], output_dir, "restart")["1"]['status'] == "completed"
+    assert get_content_store(output_dir).get("1", "introduction")
+    print("✅ Async resume verification passed!")
+
+def test_job_runner_async_pipeline():
+    root = tempfile.mkdtemp()
+    outline = os.path.join(root, "outline.md")
+    with open(outline, 'w', encoding='utf-8') as f:
+        f.write("Chapter 1: Basics\n    1. Cells\n    2. Tissues\n")
+    spec = JobSpec(outline=outline, output_dir=os.path.join(root, "out"), export=[], pipeline="async")
+    result = run_job(spec, AsyncMockGenerator())
+    assert result['status'] == "success", result
+    assert [s['status'] for s in result['sections']] == ["completed", "completed"]
+    assert result['words'] > 0
+
+    try:
+        JobSpec(outline=outline, pipeline="processes")
+        assert False, "unknown pipelines should be rejected"
+    except ValueError:
+        pass
+    print("✅ Async job runner verification passed!")
+
+if __name__ == "__main__":
+    test_calls_are_admitted_by_the_scheduler()
+    test_interrupted_run_resumes_from_stored_pieces()
+    test_job_runner_async_pipeline()
@@ -0,0 +1,46 @@
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.content_store import ContentStore
+
+def test_stored_text_survives_and_matches_plan():
+    root = tempfile.mkdtemp()
+    store = ContentStore(root)
+    key = store.subsection_key(1, 2, "Heat", "Conduction")
+    assert store.get("2.1", key) is None
+
+    store.put("2.1", key, "Heat flows from hot to cold.")
+    store.put("2.1", "introduction", "Energy is conserved.")
+
+    # A new store (e.g. after a crash) sees the same text
+    store = ContentStore(root)
+    assert store.get("2.1", key) == "Heat flows from hot to cold."
+    assert store.has("2.1", "introduction")
+
+    # The same position under a different plan is a different key
+    assert store.subsection_key(1, 2, "Heat", "Radiation") != key
+
+    store.clear("2.1")
+    assert store.get("2.1", key) is None
+    assert not store.has("2.1", "introduction")
+    print("✅ Content store verification passed!")
+
+def test_failed_calls_are_not_stored():
+    store = ContentStore(tempfile.mkdtemp())
+    for text in ("", "  \n", "Error: API call failed with status 429"):
+        try:
+            store.put("1", "introduction", text)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"Stored failed output {text!r}")
+    assert not store.has("1", "introduction")
+    print("✅ Failed output not stored!")
+
+if __name__ == "__main__":
+    test_stored_text_survives_and_matches_plan()
+    test_failed_calls_are_not_stored()
@@ -0,0 +1,34 @@
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.cost_tracker import CostTracker, load_runs
+
+def test_usage_priced_per_scope_and_persisted():
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = os.path.join(tmp, "costs.jsonl")
+        tracker = CostTracker(log_file)
+
+        with tracker.scope(job="book", section="1.1"):
+            with tracker.scope(call_site="planning"):
+                tracker.record("deepseek", "deepseek-chat", 1_000_000, 0, cached_tokens=500_000, seconds=2.0)
+            with tracker.scope(call_site="subsection"):
+                tracker.record("deepseek", "deepseek-chat", 0, 1_000_000, seconds=10.0, words=750_000)
+
+        # 500k uncached at $0.14 + 500k cached at $0.014 + 1M output at $0.28
+        summary = tracker.get_summary()
+        assert abs(summary['cost_usd'] - (0.07 + 0.007 + 0.28)) < 1e-9, summary
+        assert tracker.get_breakdown('call_site')['planning']['cached_tokens'] == 500_000
+        assert tracker.get_breakdown('section')['1.1']['calls'] == 2
+        assert tracker.get_breakdown('call_site')['subsection']['tokens_per_sec'] == 100_000
+
+        runs = load_runs(log_file)
+        assert runs[tracker.run_id]['calls'] == 2
+        assert abs(runs[tracker.run_id]['cost_usd'] - summary['cost_usd']) < 1e-9
+        print("✅ Cost tracker verification passed!")
+
+if __name__ == "__main__":
+    test_usage_priced_per_scope_and_persisted()
@@ -0,0 +1,63 @@
+import sys
+import os
+import tempfile
+import zipfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.docx_merger import merge_docx, DOCUMENT_PART
+
+ROOT = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">')
+
+def paragraph(text, style=None):
+    props = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ''
+    return f'<w:p>{props}<w:r><w:t>{text}</w:t></w:r></w:p>'
+
+def make_docx(directory, name, body):
+    path = os.path.join(directory, name)
+    with zipfile.ZipFile(path, 'w') as package:
+        package.writestr("[Content_Types].xml", "<Types/>")
+        package.writestr("word/styles.xml", f"<styles>{name}</styles>")
+        package.writestr(DOCUMENT_PART, f'{ROOT}<w:body>{body}<w:sectPr><w:pgSz w:w="11906"/></w:sectPr></w:body></w:document>')
+    return path
+
+def test_sections_are_merged_in_order():
+    directory = tempfile.mkdtemp()
+    first = make_docx(directory, "s1.docx", paragraph("Chapter", "Heading1") + paragraph("Cells text"))
+    second = make_docx(directory, "s2.docx", paragraph("Chapter", "Heading1") + paragraph("Tissues text"))
+    output = merge_docx([first, second], os.path.join(directory, "book.docx"), title="Biology & Life")
+
+    with zipfile.ZipFile(output) as package:
+        xml = package.read(DOCUMENT_PART).decode('utf-8')
+        # Other parts come from the first section
+        assert package.read("word/styles.xml") == b"<styles>s1.docx</styles>"
+    assert xml.startswith(ROOT) and xml.endswith("</w:body></w:document>")
+    assert xml.count("<w:sectPr>") == 1
+    assert "Biology &amp; Life" in xml
+    assert xml.index("Cells text") < xml.index("Tissues text")
+    # Repeated chapter headings are dropped; each section starts on a new page
+    assert "<w:t>Chapter</w:t>" not in xml
+    assert xml.count('w:type="page"') == 2
+    assert not [name for name in os.listdir(directory) if name.endswith(".tmp")]
+    print("✅ DOCX merge verification passed!")
+
+def test_sections_with_package_references_are_rejected():
+    directory = tempfile.mkdtemp()
+    first = make_docx(directory, "s1.docx", paragraph("Text"))
+    linked = make_docx(directory, "s2.docx", '<w:p><w:hyperlink r:id="rId9"><w:r><w:t>x</w:t></w:r></w:hyperlink></w:p>')
+    output = os.path.join(directory, "book.docx")
+    try:
+        merge_docx([first, linked], output)
+        assert False, "sections with relationships should be rejected"
+    except ValueError:
+        pass
+    assert not os.path.exists(output)
+    assert sorted(os.listdir(directory)) == ["s1.docx", "s2.docx"]
+    print("✅ DOCX merge rejection passed!")
+
+if __name__ == "__main__":
+    test_sections_are_merged_in_order()
+    test_sections_with_package_references_are_rejected()
@@ -0,0 +1,72 @@
+import sys
+import os
+import asyncio
+import threading
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.event_bus import EventBus
+from src.progress_tracker import ProgressTracker
+
+def test_subscribers_replay_and_resync():
+    bus = EventBus(history=10, buffer=3)
+    subscription = bus.subscribe()
+    first = bus.publish('section_started', section="1.1")
+    assert subscription.get(timeout=1) == first
+    assert subscription.get(timeout=0.01) is None
+
+    # A slow subscriber is told to resync instead of buffering forever
+    for i in range(5):
+        bus.publish('subsection_done', section="1.1", completed_subsections=i)
+    assert subscription.get(timeout=1)['type'] == 'resync'
+    # Events after the overflow still arrive, after the resync
+    assert subscription.get(timeout=1)['data']['completed_subsections'] == 4
+    assert subscription.get(timeout=0.01) is None
+
+    # Reconnecting with Last-Event-ID replays what was missed
+    replay = bus.subscribe(since=first['id'] + 3)
+    assert [event['data']['completed_subsections'] for event in (replay.get(0), replay.get(0))] == [3, 4]
+    assert bus.subscribe(since=999).get(0)['type'] == 'resync'
+
+    subscription.close()
+    replay.close()
+    print("✅ Event bus verification passed!")
+
+def test_async_subscriber_wakes_on_publish():
+    bus = EventBus()
+
+    async def listen():
+        subscription = bus.subscribe(loop=asyncio.get_running_loop())
+        threading.Timer(0.05, bus.publish, args=('section_done',), kwargs={'section': "2.1"}).start()
+        event = await subscription.aget(timeout=2)
+        assert await subscription.aget(timeout=0.01) is None
+        subscription.close()
+        return event
+
+    assert asyncio.run(listen())['type'] == 'section_done'
+    assert bus.subscriber_count() == 0
+    print("✅ Async event delivery passed!")
+
+def test_progress_tracker_publishes_events():
+    bus = EventBus()
+    subscription = bus.subscribe()
+    tracker = ProgressTracker(bus)
+    tracker.start_section("1.1", "Cells", 2)
+    tracker.update_subsection("1.1", "Introduction")
+    tracker.complete_subsection("1.1", 120)
+    tracker.complete_section("1.1", 240)
+
+    events = []
+    while (event := subscription.get(0)) is not None:
+        events.append(event)
+    assert [event['type'] for event in events] == ['section_started', 'subsection_started', 'subsection_done', 'section_done']
+    done = events[2]['data']
+    assert done['completed_subsections'] == 1 and done['total_subsections'] == 2 and done['eta_seconds'] is not None
+    assert tracker.snapshot()["1.1"]['status'] == 'complete'
+    print("✅ Progress event verification passed!")
+
+if __name__ == "__main__":
+    test_subscribers_replay_and_resync()
+    test_async_subscriber_wakes_on_publish()
+    test_progress_tracker_publishes_events()
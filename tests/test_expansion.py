@@ -1,10 +1,11 @@
 import sys
 import os
+import time
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.textbook_planner import expand_section_to_topics, expand_topic_to_subsections, Topic
+from src.textbook_planner import expand_section_to_topics, expand_topic_to_subsections, plan_section, plan_section_structured, Topic
 
 class MockGenerator:
     def generate(self, prompt, max_tokens=2000):
@@ -27,5 +28,45 @@ def test_defaults():
     
     print("✅ Defaults verification passed!")
 
+class SlowMockGenerator(MockGenerator):
+    def generate(self, prompt, max_tokens=2000):
+        time.sleep(0.1)
+        return super().generate(prompt, max_tokens)
+
+def test_plan_section_expands_topics_concurrently():
+    topics, timings = plan_section(SlowMockGenerator(), "Test Section")
+    assert len(topics) == 15 and all(len(t.subsections) == 4 for t in topics)
+    
+    # 15 sequential subsection calls would take 1.5s
+    assert timings['subsections_seconds'] < 0.75, timings
+    print("✅ Concurrent planning verification passed!")
+
+class OutlineGenerator(MockGenerator):
+    def __init__(self):
+        self.calls = 0
+    
+    def generate(self, prompt, max_tokens=2000):
+        self.calls += 1
+        if "JSON" in prompt:
+            # Topic B's subsections are malformed, so only it is re-planned
+            return """```json
+{"topics": [
+  {"title": "Topic A", "subsections": ["A1", "A2", "A3", "A4"]},
+  {"title": "Topic B", "subsections": "oops"}
+]}
+```"""
+        return super().generate(prompt, max_tokens)
+
+def test_structured_plan_falls_back_per_branch():
+    generator = OutlineGenerator()
+    topics, timings = plan_section_structured(generator, "Test Section")
+    assert [t.title for t in topics] == ["Topic A", "Topic B"]
+    assert topics[0].subsections == ["A1", "A2", "A3", "A4"]
+    assert topics[1].subsections == ["Item 1", "Item 2", "Item 3", "Item 4"]
+    assert generator.calls == 2 and timings['fallback_topics'] == 1
+    print("✅ Structured planning verification passed!")
+
 if __name__ == "__main__":
     test_defaults()
+    test_plan_section_expands_topics_concurrently()
+    test_structured_plan_falls_back_per_branch()
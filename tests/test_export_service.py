@@ -0,0 +1,39 @@
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.export_service import ExportService, _sha256
+from src.manifest import get_manifest
+
+def test_unchanged_content_is_not_converted_again():
+    output_dir = tempfile.mkdtemp()
+    md_file = os.path.join(output_dir, "Complete_Textbook.md")
+    with open(md_file, 'w', encoding='utf-8') as f:
+        f.write("# Book\n\nText")
+    docx_file = md_file.replace('.md', '.docx')
+    with open(docx_file, 'w') as f:
+        f.write("docx")
+    get_manifest(output_dir).record_export(md_file, "docx", docx_file, _sha256(md_file), engine="professional")
+
+    service = ExportService(max_workers=1)
+    assert service.submit(md_file, "docx", output_dir).result(timeout=5) == docx_file
+    assert service.get_stats()['skipped'] == 1 and service.get_stats()['queued'] == 0
+
+    # The other engine writes the same path, so its export of the same text isn't reused
+    service.submit(md_file, "docx", output_dir, engine="pandoc")
+    # Changed text is converted again, in the pool (the outcome depends on
+    # which converters are installed here, but it is always accounted for)
+    with open(md_file, 'a', encoding='utf-8') as f:
+        f.write("\n\nMore text")
+    service.submit(md_file, "docx", output_dir)
+    assert service.wait(timeout=60)
+    stats = service.get_stats()
+    assert stats['queued'] == 2 and stats['converted'] + stats['failed'] == 2 and stats['in_progress'] == 0
+    service.shutdown()
+    print("✅ Export service verification passed!")
+
+if __name__ == "__main__":
+    test_unchanged_content_is_not_converted_again()
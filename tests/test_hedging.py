@@ -0,0 +1,46 @@
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.hedging import HedgedGenerator
+from src.generator import LLMGenerator
+
+class SlowFirstCallGenerator(LLMGenerator):
+    provider = "mock"
+
+    def __init__(self, delays):
+        self.delays = list(delays)
+
+    def generate(self, prompt, max_tokens=2000):
+        time.sleep(self.delays.pop(0) if self.delays else 0.01)
+        return "answer"
+
+def test_slow_call_is_hedged():
+    # Five fast calls to learn the latency, then one stuck call
+    inner = SlowFirstCallGenerator([0.01] * 5 + [1.0])
+    generator = HedgedGenerator(inner, min_samples=5)
+    for _ in range(5):
+        generator.generate("plan")
+
+    started = time.time()
+    assert generator.generate("plan") == "answer"
+    assert time.time() - started < 0.5
+
+    stats = generator.get_stats()
+    assert stats['hedged'] == 1 and stats['hedge_wins'] == 1, stats
+    assert stats['extra_tokens'] > 0
+    print("✅ Hedging verification passed!")
+
+def test_wrappers_share_one_executor():
+    # Per-job generators must not each start their own thread pool
+    first = HedgedGenerator(SlowFirstCallGenerator([]))
+    second = HedgedGenerator(SlowFirstCallGenerator([]))
+    assert first.executor is second.executor
+    print("✅ Shared hedge executor verification passed!")
+
+if __name__ == "__main__":
+    test_slow_call_is_hedged()
+    test_wrappers_share_one_executor()
@@ -0,0 +1,68 @@
+import sys
+import os
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.job_runner import JobSpec
+from src.job_queue import JobQueue, QueueFull
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.01)
+
+def test_priority_order_and_bounded_queue():
+    gate = threading.Event()
+    order = []
+
+    def runner(spec, generator, cancel):
+        gate.wait()
+        order.append(spec.name)
+        return {'status': 'success', 'errors': [], 'words': 0, 'sections': []}
+
+    queue = JobQueue(max_running=1, max_queued=3, runner=runner)
+    blocker = queue.submit(JobSpec(outline="a.md", name="blocker"))
+    wait_for(lambda: blocker.status == "running")
+
+    queue.submit(JobSpec(outline="a.md", name="low"))
+    high = queue.submit(JobSpec(outline="a.md", name="high"), priority=5)
+    queue.submit(JobSpec(outline="a.md", name="low2"))
+    assert queue.position(high.id) == 1
+    try:
+        queue.submit(JobSpec(outline="a.md", name="overflow"))
+        assert False, "a full queue should reject jobs"
+    except QueueFull:
+        pass
+
+    gate.set()
+    wait_for(lambda: len(order) == 4)
+    assert order == ["blocker", "high", "low", "low2"]
+    print("✅ Job priority verification passed!")
+
+def test_cancel_queued_and_running_jobs():
+    started = threading.Event()
+
+    def runner(spec, generator, cancel):
+        started.set()
+        cancel.wait()
+        return {'status': 'cancelled', 'errors': [], 'words': 0, 'sections': []}
+
+    queue = JobQueue(max_running=1, runner=runner)
+    running = queue.submit(JobSpec(outline="a.md", name="running"))
+    waiting = queue.submit(JobSpec(outline="a.md", name="waiting"))
+    started.wait(5)
+
+    assert queue.cancel(waiting.id) and waiting.status == "cancelled"
+    assert queue.cancel(running.id)
+    wait_for(lambda: running.status == "cancelled")
+    assert not queue.cancel(running.id)
+    assert queue.get_stats()['jobs'] == {'cancelled': 2}
+    print("✅ Job cancellation verification passed!")
+
+if __name__ == "__main__":
+    test_priority_order_and_bounded_queue()
+    test_cancel_queued_and_running_jobs()
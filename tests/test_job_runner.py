@@ -0,0 +1,46 @@
+import sys
+import os
+import json
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.job_runner import JobSpec, load_job_spec
+
+def test_job_spec_defaults_and_validation():
+    spec = JobSpec(outline="outlines/biology_outline.md")
+    assert spec.name == "biology_outline"
+    assert spec.output_dir == os.path.join("output", "biology_outline")
+    assert spec.resume == "resume" and spec.export == ["docx"]
+
+    for bad in ({'resume': "ask"}, {'export': ["epub"]}):
+        try:
+            JobSpec(outline="a.md", **bad)
+            assert False, f"{bad} should be rejected"
+        except ValueError:
+            pass
+    print("✅ Job spec validation passed!")
+
+def test_job_spec_from_json_file():
+    path = os.path.join(tempfile.mkdtemp(), "job.json")
+    with open(path, 'w') as f:
+        json.dump({"outline": "syllabus.md", "provider": "mock", "concurrency": 4,
+                   "resume": "restart", "sections": ["1.1"], "api_key": "secret"}, f)
+    spec = load_job_spec(path)
+    assert spec.concurrency == 4 and spec.sections == ["1.1"]
+    # Results echo the spec without the key
+    assert 'api_key' not in spec.to_dict()
+
+    with open(path, 'w') as f:
+        json.dump({"outline": "syllabus.md", "workers": 4}, f)
+    try:
+        load_job_spec(path)
+        assert False, "unknown fields should be rejected"
+    except ValueError:
+        pass
+    print("✅ Job spec loading passed!")
+
+if __name__ == "__main__":
+    test_job_spec_defaults_and_validation()
+    test_job_spec_from_json_file()
@@ -0,0 +1,71 @@
+import sys
+import os
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.manifest import Manifest, section_filename
+from src.syllabus_parser import load_syllabus
+
+def write(path, text):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+def test_manifest_records_sections_and_export_freshness():
+    output_dir = tempfile.mkdtemp()
+    manifest = Manifest(output_dir)
+    path = section_filename(output_dir, "1", "Cell Biology")
+    assert manifest.get("1", "Cell Biology") is None
+
+    write(path, "# Chapter\n\nSome generated text")
+    entry = manifest.record_section("1", "Cell Biology", path, words=3)
+    manifest.record_export(path, "docx", path.replace('.md', '.docx'), entry['sha256'], engine="pandoc")
+    write(path.replace('.md', '.docx'), "docx")
+    assert manifest.export_path("1", "docx") == path.replace('.md', '.docx')
+    # Another converter's output at the same path doesn't count
+    assert manifest.export_path("1", "docx", engine="professional") is None
+    assert manifest.fresh_export(path, "docx", entry['sha256'], "professional") is None
+
+    # Another process (a second Manifest on the same root) sees the entry
+    assert Manifest(output_dir).get("1")['words'] == 3
+
+    # Regenerated text makes the old export stale
+    write(path, "# Chapter\n\nDifferent text")
+    manifest.record_section("1", "Cell Biology", path)
+    assert manifest.export_path("1", "docx") is None
+    assert manifest.find_by_path(path) == "1"
+    print("✅ Manifest verification passed!")
+
+def test_manifest_indexes_existing_files_once():
+    output_dir = tempfile.mkdtemp()
+    path = section_filename(output_dir, "2", "Tissues")
+    write(path, "one two three four")
+    manifest = Manifest(output_dir)
+    assert manifest.get("2", "Tissues")['words'] == 4
+
+    # Later lookups come from the index, not the file
+    os.remove(path)
+    assert manifest.is_complete("2", "Tissues")
+    manifest.remove("2")
+    assert not manifest.is_complete("2", "Tissues")
+    print("✅ Manifest backfill verification passed!")
+
+def test_syllabus_cache_follows_file_changes():
+    path = os.path.join(tempfile.mkdtemp(), "syllabus.md")
+    write(path, "Chapter 1: Basics\n    1. Cells\n")
+    first = load_syllabus(path)
+    assert [s['section_title'] for s in first] == ["Cells"]
+    first[0]['section_title'] = "changed by caller"
+    assert load_syllabus(path)[0]['section_title'] == "Cells"
+
+    time.sleep(0.01)
+    write(path, "Chapter 1: Basics\n    1. Cells\n    2. Tissues\n")
+    assert len(load_syllabus(path)) == 2
+    print("✅ Syllabus cache verification passed!")
+
+if __name__ == "__main__":
+    test_manifest_records_sections_and_export_freshness()
+    test_manifest_indexes_existing_files_once()
+    test_syllabus_cache_follows_file_changes()
@@ -0,0 +1,32 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model_router import RoutedGenerator
+from src.cost_tracker import cost_tracker
+from src.generator import LLMGenerator
+
+class NamedGenerator(LLMGenerator):
+    provider = "mock"
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def generate(self, prompt, max_tokens=2000):
+        return self.model_name
+
+def test_calls_routed_by_call_site():
+    generator = RoutedGenerator(NamedGenerator("quality"), {"planning": NamedGenerator("fast")})
+
+    with cost_tracker.scope(call_site="planning"):
+        assert generator.generate("topics") == "fast"
+        assert generator.model_name == "fast"
+    with cost_tracker.scope(call_site="subsection"):
+        assert generator.generate("prose") == "quality"
+    assert generator.model_name == "quality"
+    print("✅ Routing verification passed!")
+
+if __name__ == "__main__":
+    test_calls_routed_by_call_site()
@@ -0,0 +1,44 @@
+import sys
+import os
+import threading
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ordered_writer import OrderedWriter
+
+def test_results_commit_as_soon_as_prefix_is_complete():
+    committed = []
+    writer = OrderedWriter(["intro", "topic:1", "summary"], lambda key, value: committed.append(key))
+
+    # Subsections are inserted once the topic is planned, then arrive out of order
+    writer.expect(["1.1", "1.2", "1.3"], after="topic:1")
+    writer.put("1.3")
+    writer.put("1.1")
+    assert committed == []
+
+    writer.put("intro")
+    writer.put("topic:1")
+    assert committed == ["intro", "topic:1", "1.1"]
+
+    writer.put("1.2")
+    assert committed == ["intro", "topic:1", "1.1", "1.2", "1.3"]
+    assert not writer.is_done()
+
+    writer.put("summary")
+    assert writer.wait(timeout=1)
+    print("✅ Ordered writer verification passed!")
+
+def test_failure_wakes_waiter():
+    writer = OrderedWriter(["a", "b"], lambda key, value: None)
+    threading.Timer(0.05, writer.fail, args=(RuntimeError("boom"),)).start()
+    try:
+        writer.wait(timeout=2)
+        assert False, "wait() should raise"
+    except RuntimeError:
+        pass
+    print("✅ Ordered writer failure verification passed!")
+
+if __name__ == "__main__":
+    test_results_commit_as_soon_as_prefix_is_complete()
+    test_failure_wakes_waiter()
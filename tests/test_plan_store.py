@@ -0,0 +1,70 @@
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.plan_store import PlanStore, get_plan_store
+from src.resume_manager import get_resume_manager
+from src.textbook_planner import Topic
+
+class CountingGenerator:
+    """Mock generator that counts planning calls."""
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt, max_tokens=2000):
+        self.calls += 1
+        return "1. Alpha\n2. Beta"
+
+def test_plan_is_reused_until_invalidated():
+    plan_file = os.path.join(tempfile.mkdtemp(), ".section_plans.json")
+    generator = CountingGenerator()
+
+    store = PlanStore(plan_file)
+    topics, timings = store.plan(generator, "1.1", "Cells", "Biology", mode="per_topic")
+    calls = generator.calls
+    assert calls > 0 and not timings.get('reused')
+
+    # A new store (e.g. after a restart) reads the same plan back without planning
+    store = PlanStore(plan_file)
+    reused, timings = store.plan(generator, "1.1", "Cells", "Biology")
+    assert timings['reused'] and generator.calls == calls
+    assert [(t.title, t.subsections) for t in reused] == [(t.title, t.subsections) for t in topics]
+
+    # A changed outline entry doesn't match the stored plan
+    assert store.get("1.1", "Cell Biology", "Biology") is None
+
+    store.invalidate("1.1")
+    assert store.get("1.1", "Cells", "Biology") is None
+    print("✅ Plan store reuse verification passed!")
+
+def test_partial_plan_is_completed_per_topic():
+    store = PlanStore(os.path.join(tempfile.mkdtemp(), ".section_plans.json"))
+    store.save("2.1", "Energy", [Topic("Heat"), Topic("Work")])
+    assert not store.is_complete("2.1", "Energy")
+
+    store.save_topic("2.1", "Energy", 1, ["Conduction"])
+    store.save_topic("2.1", "Energy", 2, ["Force"])
+    assert store.is_complete("2.1", "Energy")
+    assert store.get("2.1", "Energy")[1].subsections == ["Force"]
+    print("✅ Partial plan verification passed!")
+
+def test_each_output_root_has_its_own_state():
+    first, second = tempfile.mkdtemp(), tempfile.mkdtemp()
+    get_plan_store(first).save("1", "Introduction", [Topic("Scope", ["Aims"])])
+    assert get_plan_store(second).get("1", "Introduction") is None
+    assert get_plan_store(first) is get_plan_store(first)
+
+    get_resume_manager(first).start_section("1", "Introduction", 1)
+    get_resume_manager(first).complete_subsection("1", 1, 1)
+    assert not get_resume_manager(second).is_subsection_completed("1", 1, 1)
+    get_resume_manager(first).flush()
+    assert os.path.exists(os.path.join(first, ".generation_state.json"))
+    print("✅ Per-output-root state verification passed!")
+
+if __name__ == "__main__":
+    test_plan_is_reused_until_invalidated()
+    test_partial_plan_is_completed_per_topic()
+    test_each_output_root_has_its_own_state()
@@ -0,0 +1,90 @@
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.response_cache import ResponseCache, CachedGenerator
+from src.generator import LLMGenerator
+from src.scheduler import FairScheduler, ScheduledGenerator
+from src.single_flight import SingleFlightGenerator
+
+class CountingGenerator(LLMGenerator):
+    provider = "mock"
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt, max_tokens=2000):
+        self.calls += 1
+        return f"Response to {prompt}"
+
+def test_identical_calls_hit_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(os.path.join(tmp, "cache.sqlite3"))
+        inner = CountingGenerator()
+        generator = CachedGenerator(inner, cache)
+
+        assert generator.generate("plan topics") == "Response to plan topics"
+        assert generator.generate("plan topics") == "Response to plan topics"
+        assert generator.generate("plan topics", max_tokens=100) == "Response to plan topics"
+        assert inner.calls == 2, f"Expected 2 API calls, got {inner.calls}"
+
+        stats = cache.get_stats()
+        assert stats['hits'] == 1 and stats['misses'] == 2, stats
+        print("✅ Cache hit verification passed!")
+
+def test_lru_eviction_and_ttl():
+    with tempfile.TemporaryDirectory() as tmp:
+        # Cap of ~1.5 KB holds only one 1 KB entry
+        cache = ResponseCache(os.path.join(tmp, "cache.sqlite3"), max_mb=1.5 / 1024)
+        cache.set("a", "x" * 1024)
+        cache.set("b", "y" * 1024)
+        assert cache.get("a") is None
+        assert cache.get("b") == "y" * 1024
+
+        expired = ResponseCache(os.path.join(tmp, "ttl.sqlite3"), ttl_days=-1)
+        expired.set("c", "z")
+        assert expired.get("c") is None
+        print("✅ Eviction verification passed!")
+
+def test_errors_not_cached():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(os.path.join(tmp, "cache.sqlite3"))
+        cache.set("k", "")
+        cache.set("e", "Error: API call failed with status 429")
+        assert cache.get("k") is None and cache.get("e") is None
+        print("✅ Error responses skipped!")
+
+class TruncatedStreamGenerator(LLMGenerator):
+    provider = "mock"
+
+    def generate(self, prompt, max_tokens=2000):
+        return "a b"
+
+    def stream(self, prompt, max_tokens=2000):
+        yield "a "
+        return False
+
+def test_truncated_stream_not_cached():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(os.path.join(tmp, "cache.sqlite3"))
+        # Same wrapper order as get_generator builds
+        generator = CachedGenerator(
+            SingleFlightGenerator(ScheduledGenerator(TruncatedStreamGenerator(), FairScheduler(limit=2))), cache
+        )
+        stream = generator.stream("prompt")
+        assert next(stream) == "a "
+        try:
+            next(stream)
+        except StopIteration as stop:
+            assert stop.value is False, stop.value
+        assert cache.get_stats()['entries'] == 0
+        print("✅ Truncated stream not cached!")
+
+if __name__ == "__main__":
+    test_identical_calls_hit_cache()
+    test_lru_eviction_and_ttl()
+    test_errors_not_cached()
+    test_truncated_stream_not_cached()
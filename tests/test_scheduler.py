@@ -0,0 +1,168 @@
+import sys
+import os
+import asyncio
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scheduler import FairScheduler
+from src.adaptive_limiter import AdaptiveLimiter
+from src.config import Config, LLMProvider
+from src.generator import LLMGenerator
+from src.scheduler import get_scheduler
+import src.generator as generator_module
+
+def test_global_limit_and_round_robin_across_jobs():
+    scheduler = FairScheduler(limit=1)
+    order = []
+    blocker = threading.Event()
+
+    def hold():
+        with scheduler.slot("big"):
+            blocker.wait()
+
+    def call(job, name):
+        with scheduler.slot(job):
+            order.append(name)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    time.sleep(0.05)
+
+    # A large job queues many calls before a small job queues one
+    threads = [threading.Thread(target=call, args=("big", f"big{i}")) for i in range(3)]
+    threads.append(threading.Thread(target=call, args=("small", "small0")))
+    for thread in threads:
+        thread.start()
+        time.sleep(0.02)
+
+    stats = scheduler.get_stats()
+    assert stats['in_flight'] == 1 and stats['queue_depth'] == 4
+    assert stats['jobs']['small'] == {'in_flight': 0, 'queued': 1}
+
+    blocker.set()
+    for thread in threads + [holder]:
+        thread.join()
+
+    # The small job is served after one big call, not behind all of them
+    assert order.index("small0") == 1
+    assert scheduler.get_stats()['max_in_flight'] == 1
+    print("✅ Scheduler fairness verification passed!")
+
+def test_async_slots_share_the_limit():
+    scheduler = FairScheduler(limit=2)
+    peak = {'now': 0, 'max': 0}
+
+    async def call():
+        async with scheduler.aslot("job"):
+            peak['now'] += 1
+            peak['max'] = max(peak['max'], peak['now'])
+            await asyncio.sleep(0.01)
+            peak['now'] -= 1
+
+    async def main():
+        await asyncio.gather(*[call() for _ in range(8)])
+
+    asyncio.run(main())
+    assert peak['max'] == 2
+    assert scheduler.get_stats()['in_flight'] == 0
+    print("✅ Async scheduler verification passed!")
+
+def test_limit_follows_registered_limiters_and_job_caps():
+    scheduler = FairScheduler(max_in_flight=6)
+    scheduler.add_limiter(AdaptiveLimiter("fast", initial=10))
+    assert scheduler.current_limit() == 6
+    # Another job's generator registers its provider without replacing the first
+    scheduler.add_limiter(AdaptiveLimiter("slow", initial=4))
+    scheduler.add_limiter(AdaptiveLimiter("fast", initial=10))
+    assert scheduler.current_limit() == 4
+
+    scheduler.set_job_limit("capped", 1)
+    blocker = threading.Event()
+
+    def hold(job):
+        with scheduler.slot(job):
+            blocker.wait()
+
+    threads = [threading.Thread(target=hold, args=(job,)) for job in ("capped", "capped", "other", "other")]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    stats = scheduler.get_stats()
+    assert stats['jobs']['capped'] == {'in_flight': 1, 'queued': 1}, stats
+    assert stats['jobs']['other'] == {'in_flight': 2, 'queued': 0}, stats
+
+    blocker.set()
+    for thread in threads:
+        thread.join()
+    assert scheduler.get_stats()['in_flight'] == 0
+    print("✅ Scheduler limit verification passed!")
+
+class TruncatedStreamGenerator(LLMGenerator):
+    provider = "mock"
+
+    def generate(self, prompt, max_tokens=2000):
+        return "a b"
+
+    def stream(self, prompt, max_tokens=2000):
+        yield "a "
+        return False
+
+def stream_result(stream):
+    chunks = []
+    while True:
+        try:
+            chunks.append(next(stream))
+        except StopIteration as stop:
+            return chunks, stop.value
+
+def test_stream_return_value_survives_wrapper_stack():
+    config = Config()
+    config.PROVIDER = LLMProvider.MOCK
+    config.ROUTES = {"summary": {}}
+    config.HEDGING = True
+    config.RESPONSE_CACHE = False
+    create = generator_module._create_generator
+    generator_module._create_generator = lambda *args: TruncatedStreamGenerator()
+    try:
+        generator = generator_module.get_generator(config)
+    finally:
+        generator_module._create_generator = create
+
+    chunks, completed = stream_result(generator.stream("prompt"))
+    assert chunks == ["a "] and completed is False, (chunks, completed)
+    print("✅ Wrapped stream return value verification passed!")
+
+def test_routed_and_hedge_providers_are_registered():
+    config = Config()
+    config.PROVIDER = LLMProvider.MOCK
+    config.ROUTES = {"planning": {"provider": LLMProvider.GEMINI_FLASH}}
+    config.HEDGING = True
+    config.HEDGE_PROVIDER = LLMProvider.GEMINI
+    config.RESPONSE_CACHE = False
+
+    def create(provider, api_key, model_name):
+        generator = TruncatedStreamGenerator()
+        generator.limiter = AdaptiveLimiter(f"test-{provider.value}")
+        return generator
+
+    original = generator_module._create_generator
+    generator_module._create_generator = create
+    try:
+        generator_module.get_generator(config)
+    finally:
+        generator_module._create_generator = original
+    registered = set(get_scheduler().limiters)
+    for name in ("test-mock", "test-gemini-flash", "test-gemini"):
+        get_scheduler().limiters.pop(name, None)
+    assert {"test-mock", "test-gemini-flash", "test-gemini"} <= registered, registered
+    print("✅ Provider limiter registration verification passed!")
+
+if __name__ == "__main__":
+    test_global_limit_and_round_robin_across_jobs()
+    test_async_slots_share_the_limit()
+    test_limit_follows_registered_limiters_and_job_caps()
+    test_stream_return_value_survives_wrapper_stack()
+    test_routed_and_hedge_providers_are_registered()
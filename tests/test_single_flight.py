@@ -0,0 +1,64 @@
+import sys
+import os
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.single_flight import SingleFlight
+
+def test_concurrent_identical_calls_share_one_request():
+    flight = SingleFlight()
+    calls = []
+    lock = threading.Lock()
+
+    def search(query):
+        with lock:
+            calls.append(query)
+        time.sleep(0.2)
+        return [f"paper about {query}"]
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(lambda _: flight.do("q", search, "ai"), range(5)))
+
+    assert calls == ["ai"], calls
+    assert all(r == ["paper about ai"] for r in results)
+    assert flight.get_stats()['shared'] == 4
+
+    # Once finished, the next call runs again
+    flight.do("q", search, "ai")
+    assert len(calls) == 2
+    print("✅ Single-flight verification passed!")
+
+def test_cancelled_leader_or_follower_does_not_cancel_others():
+    flight = SingleFlight()
+    calls = []
+
+    async def search(query):
+        calls.append(query)
+        await asyncio.sleep(0.05)
+        return f"paper about {query}"
+
+    async def main():
+        leader = asyncio.ensure_future(flight.ado("q", search, "ai"))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(flight.ado("q", search, "ai"))
+        quitter = asyncio.ensure_future(flight.ado("q", search, "ai"))
+        await asyncio.sleep(0.01)
+        quitter.cancel()
+        leader.cancel()
+        # The follower takes over the request instead of being cancelled with the leader
+        assert await asyncio.wait_for(follower, 1) == "paper about ai"
+        assert leader.cancelled() and quitter.cancelled()
+
+    asyncio.run(main())
+    assert calls == ["ai", "ai"], calls
+    assert flight.get_stats()['in_flight'] == 0
+    print("✅ Single-flight cancellation verification passed!")
+
+if __name__ == "__main__":
+    test_concurrent_identical_calls_share_one_request()
+    test_cancelled_leader_or_follower_does_not_cancel_others()
@@ -0,0 +1,48 @@
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.task_graph import TaskGraph
+
+def test_ready_nodes_run_while_slow_node_blocks():
+    graph = TaskGraph(ThreadPoolExecutor(max_workers=2))
+    order = []
+
+    def work(name, delay):
+        time.sleep(delay)
+        order.append(name)
+        return name
+
+    graph.add("plan", work, "plan", 0)
+    graph.add("slow", work, "slow", 0.3, deps=["plan"])
+    graph.add("fast", work, "fast", 0.01, deps=["plan"])
+    graph.add("after_fast", work, "after_fast", 0.01, deps=["fast"])
+
+    # The node behind "fast" finishes while "slow" is still running
+    assert graph.result("after_fast") == "after_fast"
+    assert "slow" not in order
+    assert graph.result("slow") == "slow"
+    print("✅ Task graph scheduling verification passed!")
+
+def test_failure_propagates_to_dependents():
+    graph = TaskGraph(ThreadPoolExecutor(max_workers=2))
+
+    def boom():
+        raise RuntimeError("API down")
+
+    graph.add("plan", boom)
+    graph.add("write", lambda: "text", deps=["plan"])
+    try:
+        graph.result("write", timeout=2)
+        assert False, "Expected the dependency's error"
+    except RuntimeError as e:
+        assert "API down" in str(e)
+    print("✅ Task graph failure verification passed!")
+
+if __name__ == "__main__":
+    test_ready_nodes_run_while_slow_node_blocks()
+    test_failure_propagates_to_dependents()
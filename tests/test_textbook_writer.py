@@ -0,0 +1,65 @@
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.generator import LLMGenerator
+from src.textbook_writer import StreamInterrupted, write_section_summary
+from src.textbook_planner import Topic
+from src.scheduler import FairScheduler, ScheduledGenerator
+from src.single_flight import SingleFlightGenerator
+from src.response_cache import ResponseCache, CachedGenerator
+
+class StreamingGenerator(LLMGenerator):
+    provider = "mock"
+
+    def __init__(self, complete: bool):
+        self.complete = complete
+
+    def generate(self, prompt, max_tokens=2000):
+        return "a b"
+
+    def stream(self, prompt, max_tokens=2000):
+        yield "a "
+        yield "b"
+        if not self.complete:
+            return False
+
+def test_complete_stream_returns_text():
+    chunks = []
+    text = write_section_summary(StreamingGenerator(True), "Section", [Topic("Topic")], on_chunk=chunks.append)
+    assert text == "a b" and chunks == ["a ", "b"], (text, chunks)
+    print("✅ Complete stream verification passed!")
+
+def test_truncated_stream_raises():
+    chunks = []
+    try:
+        write_section_summary(StreamingGenerator(False), "Section", [Topic("Topic")], on_chunk=chunks.append)
+    except StreamInterrupted:
+        pass
+    else:
+        raise AssertionError("Truncated stream returned partial text")
+    assert chunks == ["a ", "b"], chunks
+    print("✅ Truncated stream verification passed!")
+
+def test_truncated_stream_raises_through_wrappers():
+    # Same wrapper order as get_generator builds
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(os.path.join(tmp, "cache.sqlite3"))
+        generator = CachedGenerator(
+            SingleFlightGenerator(ScheduledGenerator(StreamingGenerator(False), FairScheduler(limit=2))), cache
+        )
+        try:
+            write_section_summary(generator, "Section", [Topic("Topic")], on_chunk=lambda chunk: None)
+        except StreamInterrupted:
+            pass
+        else:
+            raise AssertionError("Truncated stream returned partial text through the wrappers")
+    print("✅ Wrapped truncated stream verification passed!")
+
+if __name__ == "__main__":
+    test_complete_stream_returns_text()
+    test_truncated_stream_raises()
+    test_truncated_stream_raises_through_wrappers()
@@ -0,0 +1,33 @@
+import sys
+import os
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.token_bucket import TokenBucket
+
+def test_burst_then_refill_rate():
+    with tempfile.TemporaryDirectory() as tmp:
+        bucket = TokenBucket("api", per_minute=600, burst=3, state_dir=tmp)
+
+        # The burst is free, then each call waits one refill interval (0.1s)
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+        wait = bucket.reserve()
+        assert 0.05 < wait <= 0.1, wait
+        assert 0.15 < bucket.reserve() <= 0.2
+        print("✅ Token bucket verification passed!")
+
+def test_state_shared_between_instances():
+    with tempfile.TemporaryDirectory() as tmp:
+        # A second instance (as in another process) sees the same bucket
+        first = TokenBucket("api", per_minute=60, burst=2, state_dir=tmp)
+        second = TokenBucket("api", per_minute=60, burst=2, state_dir=tmp)
+        first.reserve(2)
+        assert second.reserve() > 0.9
+        print("✅ Shared state verification passed!")
+
+if __name__ == "__main__":
+    test_burst_then_refill_rate()
+    test_state_shared_between_instances()
@@ -92,7 +92,8 @@ Return ONLY valid JSON.
         response = self.llm.generate(
             prompt,
             system_prompt="You are a research methodology expert planning data analysis.",
-            max_tokens=3000
+            max_tokens=3000,
+            task="planning"
         )
         
         # Parse JSON response
@@ -1,27 +1,68 @@
-import requests
 import json
+import time
+from src.http_pool import get_session, get_async_client
+from src.response_cache import ResponseCache, get_response_cache
+from src.adaptive_limiter import get_limiter
+from src.token_bucket import estimate_tokens
+from src.single_flight import SingleFlight
+from src.cost_tracker import cost_tracker
 from .config import Config
+from .rate_limiter import GlobalRateLimiter
+
+# Concurrent identical prompts (from any LLMClient) share one API call
+_flight = SingleFlight()
 
 class LLMClient:
     def __init__(self):
         self.api_key = Config.DEEPSEEK_API_KEY
         self.model = Config.MODEL_NAME
+        # Task class ("planning", "review", ...) -> DeepSeek model; other tasks use MODEL_NAME
+        self.model_routes = getattr(Config, 'MODEL_ROUTES', None) or {}
         self.api_url = "https://api.deepseek.com/v1/chat/completions"
+        self.session = get_session("deepseek")
+        self.limiter = get_limiter("deepseek")
+        self.rate_limiter = GlobalRateLimiter()
+        self.cache = None
+        if getattr(Config, 'RESPONSE_CACHE', False):
+            self.cache = get_response_cache(
+                getattr(Config, 'RESPONSE_CACHE_FILE', "thesis/.llm_cache.sqlite3"),
+                getattr(Config, 'RESPONSE_CACHE_MAX_MB', 200),
+                getattr(Config, 'RESPONSE_CACHE_TTL_DAYS', 30)
+            )
 
-    def generate(self, prompt, system_prompt="You are a helpful academic assistant.", max_tokens=4096):
-        """
-        Generate text using DeepSeek API.
-        """
-        if not self.api_key:
-            return "Error: No DeepSeek API key configured."
+    def model_for(self, task):
+        """Model used for a task class."""
+        return self.model_routes.get(task, self.model)
+
+    def _cache_key(self, prompt, system_prompt, max_tokens, model):
+        return ResponseCache.make_key("deepseek", model, system_prompt, prompt, max_tokens, 0.7)
+
+    def _rate_costs(self, prompt, system_prompt):
+        return {"deepseek_requests": 1, "deepseek_tokens": estimate_tokens(system_prompt + prompt)}
 
+    def _record_usage(self, prompt, system_prompt, model, result, started):
+        # Real usage (including prefix-cache hits) is only known once the response arrives
+        text = result['choices'][0]['message']['content']
+        usage = result.get('usage') or {}
+        output_tokens = usage.get('completion_tokens', estimate_tokens(text))
+        self.rate_limiter.charge("deepseek_tokens", output_tokens)
+        cost_tracker.record(
+            "deepseek", model,
+            usage.get('prompt_tokens', estimate_tokens(system_prompt + prompt)),
+            output_tokens,
+            usage.get('prompt_cache_hit_tokens', 0),
+            time.time() - started,
+            len(text.split())
+        )
+
+    def _build_request(self, prompt, system_prompt, max_tokens, model):
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
 
         data = {
-            "model": self.model,
+            "model": model,
             "messages": [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": prompt}
@@ -29,11 +70,82 @@ class LLMClient:
             "max_tokens": max_tokens,
             "temperature": 0.7
         }
+        return headers, data
+
+    def generate(self, prompt, system_prompt="You are a helpful academic assistant.", max_tokens=4096, task=None):
+        """
+        Generate text using DeepSeek API.
+        task selects the model from Config.MODEL_ROUTES and labels the call's cost.
+        """
+        if not self.api_key:
+            return "Error: No DeepSeek API key configured."
+
+        model = self.model_for(task)
+        key = self._cache_key(prompt, system_prompt, max_tokens, model)
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        with cost_tracker.scope(call_site=task):
+            result = _flight.do(key, self._post, prompt, system_prompt, max_tokens, model)
+        if self.cache:
+            self.cache.set(key, result)
+        return result
+
+    def _post(self, prompt, system_prompt, max_tokens, model):
+        headers, data = self._build_request(prompt, system_prompt, max_tokens, model)
+
+        try:
+            self.rate_limiter.wait_for(self._rate_costs(prompt, system_prompt))
+            started = time.time()
+            with self.limiter.slot(str(max_tokens)) as call:
+                response = self.session.post(self.api_url, headers=headers, json=data)
+                call.observe(response.status_code)
+            if response.status_code == 200:
+                result = response.json()
+                self._record_usage(prompt, system_prompt, model, result, started)
+                return result['choices'][0]['message']['content']
+            else:
+                print(f"Error calling DeepSeek API: {response.status_code} - {response.text}")
+                return f"Error: API call failed with status {response.status_code}"
+        except Exception as e:
+            print(f"Exception calling LLM: {e}")
+            return f"Error: {str(e)}"
+
+    async def agenerate(self, prompt, system_prompt="You are a helpful academic assistant.", max_tokens=4096, task=None):
+        """
+        Async counterpart of generate, sharing one HTTP/2 client per event loop.
+        """
+        if not self.api_key:
+            return "Error: No DeepSeek API key configured."
+
+        model = self.model_for(task)
+        key = self._cache_key(prompt, system_prompt, max_tokens, model)
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        with cost_tracker.scope(call_site=task):
+            result = await _flight.ado(key, self._apost, prompt, system_prompt, max_tokens, model)
+        if self.cache:
+            self.cache.set(key, result)
+        return result
+
+    async def _apost(self, prompt, system_prompt, max_tokens, model):
+        headers, data = self._build_request(prompt, system_prompt, max_tokens, model)
 
         try:
-            response = requests.post(self.api_url, headers=headers, json=data)
+            client = get_async_client("deepseek")
+            await self.rate_limiter.await_for(self._rate_costs(prompt, system_prompt))
+            started = time.time()
+            async with self.limiter.aslot(str(max_tokens)) as call:
+                response = await client.post(self.api_url, headers=headers, json=data)
+                call.observe(response.status_code)
             if response.status_code == 200:
                 result = response.json()
+                self._record_usage(prompt, system_prompt, model, result, started)
                 return result['choices'][0]['message']['content']
             else:
                 print(f"Error calling DeepSeek API: {response.status_code} - {response.text}")
@@ -86,7 +86,7 @@ class ChapterPlanner:
         """
         
         try:
-            response = self.llm.generate(prompt, system_prompt="You are an expert thesis advisor. Return only valid JSON.", max_tokens=2048)
+            response = self.llm.generate(prompt, system_prompt="You are an expert thesis advisor. Return only valid JSON.", max_tokens=2048, task="planning")
             # Try to parse JSON
             outline = json.loads(response.strip())
             return outline
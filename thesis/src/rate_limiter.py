@@ -1,51 +1,47 @@
 """
-Global Rate Limiter for Semantic Scholar API
-Ensures 1 request per second across ALL users/processes
+Global Rate Limiter for the thesis APIs
+Token buckets shared across ALL users/processes (Semantic Scholar, Tavily, LLM)
 """
+import asyncio
 import time
-import os
-import fcntl
-import json
+from src import token_bucket
+from .config import Config
+
+# Semantic Scholar allows 1 request per second; Config.RATE_LIMITS overrides these
+DEFAULT_RATE_LIMITS = {
+    "semantic_scholar": {"per_minute": 60, "burst": 1},
+}
 
 class GlobalRateLimiter:
-    def __init__(self, lock_file="thesis/api_rate_limit.lock"):
-        self.lock_file = lock_file
-        os.makedirs(os.path.dirname(lock_file), exist_ok=True)
-        
-    def wait_for_slot(self):
+    def __init__(self, state_dir=None):
+        limits = {**DEFAULT_RATE_LIMITS, **(getattr(Config, 'RATE_LIMITS', None) or {})}
+        token_bucket.configure(limits, state_dir)
+
+    def wait_for_slot(self, resource="semantic_scholar"):
+        """
+        Wait until it's safe to make one API call to resource.
+        Only the reservation is taken under the shared lock; the wait happens outside it.
+        """
+        self.wait_for({resource: 1})
+
+    def wait_for(self, costs):
         """
-        Wait until it's safe to make an API call.
-        Uses file locking to coordinate across multiple processes.
+        Wait until tokens for several resources are available.
+
+        Args:
+            costs: Resource name -> tokens needed (e.g. {"deepseek_requests": 1, "deepseek_tokens": 900})
         """
-        # Create lock file if it doesn't exist
-        if not os.path.exists(self.lock_file):
-            with open(self.lock_file, 'w') as f:
-                json.dump({"last_call": 0}, f)
-        
-        # Acquire exclusive lock
-        with open(self.lock_file, 'r+') as f:
-            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-            
-            try:
-                # Read last call time
-                f.seek(0)
-                data = json.load(f)
-                last_call = data.get("last_call", 0)
-                
-                # Calculate wait time
-                current_time = time.time()
-                time_since_last = current_time - last_call
-                
-                if time_since_last < 1.0:
-                    wait_time = 1.0 - time_since_last
-                    print(f"    ⏳ Global rate limit: waiting {wait_time:.2f}s...")
-                    time.sleep(wait_time)
-                
-                # Update last call time
-                f.seek(0)
-                f.truncate()
-                json.dump({"last_call": time.time()}, f)
-                
-            finally:
-                # Release lock
-                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        wait = token_bucket.reserve(costs)
+        if wait > 0:
+            print(f"    ⏳ Global rate limit: waiting {wait:.2f}s...")
+            time.sleep(wait)
+
+    async def await_for(self, costs):
+        """Async version of wait_for."""
+        wait = token_bucket.reserve(costs)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def charge(self, resource, cost):
+        """Record usage known only after the call (e.g. output tokens)."""
+        token_bucket.charge(resource, cost)
@@ -1,7 +1,6 @@
-import json
-import os
 import hashlib
 from datetime import datetime
+from src.durable_io import atomic_write_json, read_json
 
 class ReferenceManager:
     def __init__(self, topic=""):
@@ -15,22 +14,13 @@ class ReferenceManager:
         self.references = self._load_references()
 
     def _load_references(self):
-        """Load references from JSON file."""
-        if os.path.exists(self.ref_file):
-            try:
-                with open(self.ref_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error loading references: {e}")
-                return {"references": []}
-        return {"references": []}
+        """Load references from JSON file (an unreadable file is moved aside, not overwritten)."""
+        return read_json(self.ref_file, {"references": []})
 
     def _save_references(self):
         """Save references to JSON file."""
         try:
-            os.makedirs(os.path.dirname(self.ref_file), exist_ok=True)
-            with open(self.ref_file, 'w', encoding='utf-8') as f:
-                json.dump(self.references, f, indent=2, ensure_ascii=False)
+            atomic_write_json(self.ref_file, self.references)
         except Exception as e:
             print(f"Error saving references: {e}")
 
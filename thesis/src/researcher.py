@@ -1,9 +1,17 @@
-import requests
 import time
+from src.http_pool import get_session
+from src.single_flight import SingleFlight
 from .config import Config
 from .rate_limiter import GlobalRateLimiter
 from .paper_cache import PaperCache
 
+# Shared by every Researcher so concurrent identical searches make one API call
+_searches = SingleFlight()
+
+def _search_pool_size(provider):
+    """Connections for a search API: the calls its token bucket lets start at once."""
+    return max(1, getattr(Config, 'RATE_LIMITS', {}).get(provider, {}).get("burst", 1))
+
 class Researcher:
     def __init__(self, reference_manager=None):
         self.api_key = Config.SEMANTIC_SCHOLAR_API_KEY
@@ -32,6 +40,17 @@ class Researcher:
                     self.reference_manager.add_reference(paper, chapter, ref_type="academic")
             return cached_results
 
+        papers = _searches.do(("papers", query, limit), self._fetch_papers, query, limit)
+
+        # Save to reference manager
+        if papers and self.reference_manager and chapter:
+            for paper in papers:
+                self.reference_manager.add_reference(paper, chapter, ref_type="academic")
+
+        return papers
+
+    def _fetch_papers(self, query, limit):
+        """Call Semantic Scholar (once per concurrent identical query) and cache the results."""
         # Apply global rate limiting (coordinates across all processes)
         self.rate_limiter.wait_for_slot()
 
@@ -43,19 +62,13 @@ class Researcher:
         }
 
         try:
-            response = requests.get(self.base_url, headers=headers, params=params)
+            response = get_session("semantic_scholar", pool_size=_search_pool_size("semantic_scholar")).get(self.base_url, headers=headers, params=params)
             if response.status_code == 200:
                 data = response.json()
                 papers = data.get('data', [])
                 
                 # Cache the results
                 self.cache.set(query, limit, papers)
-                
-                # Save to reference manager
-                if self.reference_manager and chapter:
-                    for paper in papers:
-                        self.reference_manager.add_reference(paper, chapter, ref_type="academic")
-                
                 return papers
             else:
                 print(f"Error searching papers: {response.status_code} - {response.text}")
@@ -73,6 +86,17 @@ class Researcher:
             print("Warning: No Tavily API key found. Skipping web search.")
             return []
 
+        results = _searches.do(("web", query, limit), self._fetch_web, api_key, query, limit)
+
+        # Save to reference manager
+        if results and self.reference_manager and chapter:
+            for result in results:
+                self.reference_manager.add_reference(result, chapter, ref_type="web")
+
+        return results
+
+    def _fetch_web(self, api_key, query, limit):
+        """Call Tavily (once per concurrent identical query)."""
         url = "https://api.tavily.com/search"
         payload = {
             "api_key": api_key,
@@ -82,18 +106,13 @@ class Researcher:
             "max_results": limit
         }
 
+        self.rate_limiter.wait_for_slot("tavily")
+
         try:
-            response = requests.post(url, json=payload)
+            response = get_session("tavily", pool_size=_search_pool_size("tavily")).post(url, json=payload)
             if response.status_code == 200:
                 data = response.json()
-                results = data.get('results', [])
-                
-                # Save to reference manager
-                if self.reference_manager and chapter:
-                    for result in results:
-                        self.reference_manager.add_reference(result, chapter, ref_type="web")
-                
-                return results
+                return data.get('results', [])
             else:
                 print(f"Error searching web: {response.status_code} - {response.text}")
                 return []
@@ -91,7 +91,8 @@ Provide your review in the following format:
             review_text = self.llm.generate(
                 full_prompt,
                 system_prompt=f"You are {reviewer['name']}, a peer reviewer for an academic journal.",
-                max_tokens=2048
+                max_tokens=2048,
+                task="review"
             )
             
             reviews.append({
@@ -138,7 +139,8 @@ Return ONLY the improved content, no commentary.
         improved_content = self.llm.generate(
             improvement_prompt,
             system_prompt="You are a PhD candidate revising your thesis based on peer review.",
-            max_tokens=4096
+            max_tokens=4096,
+            task="revision"
         )
         
         return improved_content
@@ -1,6 +1,5 @@
-import json
-import os
 import hashlib
+from src.durable_io import atomic_write_json, read_json
 
 class ThesisStateManager:
     def __init__(self, topic="", state_file=None):
@@ -15,15 +14,8 @@ class ThesisStateManager:
         self.state = self._load_state()
 
     def _load_state(self):
-        """Load state from JSON file."""
-        if os.path.exists(self.state_file):
-            try:
-                with open(self.state_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error loading state: {e}")
-                return {}
-        return {}
+        """Load state from JSON file (an unreadable file is moved aside, not overwritten)."""
+        return read_json(self.state_file, {})
 
     def save_section(self, chapter, section, content):
         """Save content for a specific section."""
@@ -36,10 +28,8 @@ class ThesisStateManager:
     def _save_state(self):
         """Save state to JSON file."""
         try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(self.state, f, indent=2, ensure_ascii=False)
+            # Temp file + rename: a crash leaves the previous state, never half a file
+            atomic_write_json(self.state_file, self.state)
         except Exception as e:
             print(f"Error saving state: {e}")
 